@@ -11,6 +11,8 @@ from PySide6.QtWidgets import QApplication, QMainWindow, QWidget
 from PySide6.QtCore import Qt, QPointF
 from PySide6.QtGui import QPainter, QLinearGradient, QRadialGradient, QPen, QColor, QPainterPath
 
+from arc_gradient import ArcLengthGradientStroker
+
 
 # 渐变颜色定义
 GRADIENT_COLORS = {
@@ -37,6 +39,7 @@ class AdvancedCurveGradientWidget(QWidget):
         self.trapezoid_top_width = 30
         self.trapezoid_bottom_width = 500
         self.line_width = 4
+        self.arc_stroker = ArcLengthGradientStroker(width=self.line_width)
         
         # 设置窗口
         self.setFixedSize(900, 700)
@@ -186,6 +189,16 @@ class AdvancedCurveGradientWidget(QWidget):
             QPointF(end_point.x(), end_point.y() + y_offset)
         )
         
+        # 弧长参数化渐变: 按曲线上的实际位置取色，不使用画笔渐变
+        if gradient_method == "arc_length":
+            start = QPointF(start_point.x(), start_point.y() + y_offset)
+            end = QPointF(end_point.x(), end_point.y() + y_offset)
+            self.arc_stroker.stroke(painter, [[(point.x(), point.y())
+                                               for point in (start, control_point, end)]])
+            painter.setPen(QColor("#333333"))
+            painter.drawText(20, start_point.y() + y_offset - 10, label)
+            return control_point
+        
         # 根据方法创建渐变
         if gradient_method == "linear":
             gradient = self.create_linear_gradient(
@@ -247,10 +260,11 @@ class AdvancedCurveGradientWidget(QWidget):
                 ("linear", "方法1: 标准线性渐变"),
                 ("curve_adapted", "方法2: 曲线适配线性渐变"),
                 ("radial", "方法3: 径向渐变 (以控制点为中心)"),
-                ("multi_point", "方法4: 多点线性渐变")
+                ("multi_point", "方法4: 多点线性渐变"),
+                ("arc_length", "方法5: 弧长参数化渐变")
             ]
             
-            y_spacing = 80
+            y_spacing = 60
             for i, (method, label) in enumerate(methods):
                 y_offset = i * y_spacing
                 
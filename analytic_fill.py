@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+解析式填充路径
+弯曲梯形的拓扑固定 (直线上底 + 两条二次腰线 + 直线下底)，
+因此填充区域可直接构造，无需每帧执行QPainterPath的subtracted()/united()布尔运算
+"""
+
+from PySide6.QtCore import Qt, QPointF
+from PySide6.QtGui import QPainterPath
+
+from trapezoid_geometry import LEG_ENDPOINTS
+
+
+def create_fill_path(geometry, position_ratio, curve_offset):
+    """根据Widget的QPointF几何字典直接创建填充路径
+
+    与 minimal_correct_fill.create_correct_trapezoid_fill 相同的构建顺序：
+    上底 → 右腰 → 下底 → 左腰，两条腰线的控制点使用同一偏移方向。
+    路径使用奇偶填充规则，对 top_offset / curve_offset 的任意符号都给出正确区域。
+
+    Args:
+        geometry: 含 'top_left' / 'top_right' / 'bottom_left' / 'bottom_right' 的QPointF字典
+        position_ratio: 控制点位置比例
+        curve_offset: 横向偏移量 (像素)
+
+    Returns:
+        QPainterPath: 填充路径
+    """
+    controls = {}
+    for leg, (start_key, end_key) in LEG_ENDPOINTS.items():
+        start, end = geometry[start_key], geometry[end_key]
+        controls[leg] = QPointF(
+            start.x() + (end.x() - start.x()) * position_ratio + curve_offset,
+            start.y() + (end.y() - start.y()) * position_ratio)
+
+    path = QPainterPath()
+    path.moveTo(geometry['top_left'])
+    path.lineTo(geometry['top_right'])
+    path.quadTo(controls['right'], geometry['bottom_right'])
+    path.lineTo(geometry['bottom_left'])
+    path.quadTo(controls['left'], geometry['top_left'])
+    path.closeSubpath()
+    return path
+
+
+def append_fill_subpaths(path, geometry, indices=None):
+    """把NumPy几何中的梯形作为子路径追加到path
+
+    Args:
+        path: 目标QPainterPath
+        geometry: trapezoid_geometry.create_trapezoid_geometry 返回的数组字典
+        indices: 要追加的梯形下标，None表示全部
+
+    Returns:
+        QPainterPath: 追加后的path (同一对象)
+    """
+    keys = ('top_left', 'top_right', 'right_control', 'bottom_right',
+            'bottom_left', 'left_control')
+    if indices is None:
+        rows = zip(*(geometry[key].tolist() for key in keys))
+    else:
+        rows = zip(*(geometry[key][indices].tolist() for key in keys))
+
+    for top_left, top_right, right_control, bottom_right, bottom_left, left_control in rows:
+        path.moveTo(*top_left)
+        path.lineTo(*top_right)
+        path.quadTo(*right_control, *bottom_right)
+        path.lineTo(*bottom_left)
+        path.quadTo(*left_control, *top_left)
+        path.closeSubpath()
+    return path
+
+
+def create_fill_paths(geometry, indices=None):
+    """把NumPy几何中的多个梯形合并为一条QPainterPath (一次drawPath即可填充)
+
+    使用非零环绕规则，使相互重叠的梯形取并集而不是相互抵消
+    """
+    path = QPainterPath()
+    path.setFillRule(Qt.WindingFill)
+    return append_fill_subpaths(path, geometry, indices)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+固定时间步长动画引擎
+模拟以固定步长推进 (与帧率无关)，显示时在前后两个模拟状态之间按剩余时间插值；
+帧按绝对时间点调度 (不累积定时器误差)，帧间隔取自屏幕刷新率，并统计实际帧率和帧时间抖动
+"""
+
+import math
+import time
+from collections import deque
+
+from PySide6.QtCore import QObject, QTimer, Qt, Signal
+
+from input_coalescer import display_refresh_rate
+
+
+# 单帧内最多追赶的模拟步数，防止卡顿后陷入越追越慢的循环
+MAX_STEPS_PER_FRAME = 8
+
+# 计算帧率和抖动所用的最近帧数
+STATS_WINDOW = 120
+
+
+def lerp_state(previous, current, alpha):
+    """在两个模拟状态 (浮点数元组) 之间线性插值"""
+    return tuple(p + (c - p) * alpha for p, c in zip(previous, current))
+
+
+class AnimationEngine(QObject):
+    """固定时间步长 + 插值显示的动画循环
+
+    Args:
+        initial_state: 初始模拟状态 (浮点数元组)
+        step: step(state, dt) -> 新状态，以固定步长 fixed_dt 推进模拟
+        present: present(state) 显示插值后的状态 (直接写入Widget，不经过控件信号)
+        fixed_dt: 模拟步长 (秒)
+        max_rate: 最大帧率 (Hz)，None表示使用主屏幕刷新率
+        parent: Qt父对象
+
+    Signals:
+        stats_updated(dict): 每 stats_interval 秒发出一次帧统计
+    """
+
+    stats_updated = Signal(dict)
+
+    def __init__(self, initial_state, step, present, fixed_dt=1 / 120, max_rate=None,
+                 parent=None):
+        super().__init__(parent)
+        self.step = step
+        self.present = present
+        self.fixed_dt = fixed_dt
+        self.frame_interval = 1.0 / (max_rate or display_refresh_rate())
+        self.stats_interval = 1.0
+
+        self._previous = self._current = tuple(initial_state)
+        self._accumulator = 0.0
+        self._last_time = None
+        self._next_frame = None
+        self._last_stats = None
+        self._frame_times = deque(maxlen=STATS_WINDOW)
+        self.frames = 0
+        self.skipped_frames = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+
+    @property
+    def state(self):
+        """当前模拟状态 (最近一个完整步长)"""
+        return self._current
+
+    def is_running(self):
+        return self._next_frame is not None
+
+    def start(self):
+        """开始动画 (从当前状态继续)"""
+        if self.is_running():
+            return
+        now = time.perf_counter()
+        self._last_time = self._last_stats = now
+        self._next_frame = now
+        self._frame_times.clear()
+        self._tick()
+
+    def stop(self):
+        """停止动画"""
+        self._timer.stop()
+        self._next_frame = None
+
+    def advance(self, elapsed):
+        """推进 elapsed 秒并显示插值状态 (也可在测试或离屏渲染中直接驱动)"""
+        self._accumulator += elapsed
+        steps = 0
+        while self._accumulator >= self.fixed_dt:
+            if steps == MAX_STEPS_PER_FRAME:
+                # 落后太多时丢弃剩余时间，而不是让下一帧更慢
+                self._accumulator = 0.0
+                break
+            self._previous = self._current
+            self._current = tuple(self.step(self._current, self.fixed_dt))
+            self._accumulator -= self.fixed_dt
+            steps += 1
+
+        alpha = self._accumulator / self.fixed_dt
+        self.present(lerp_state(self._previous, self._current, alpha))
+
+    def _tick(self):
+        now = time.perf_counter()
+        elapsed = now - self._last_time
+        self._last_time = now
+        if self.frames and elapsed > 0:
+            self._frame_times.append(elapsed)
+        self.frames += 1
+
+        self.advance(elapsed)
+
+        # 按绝对时间点调度下一帧；错过的帧直接跳过，定时器误差不会累积
+        self._next_frame += self.frame_interval
+        now = time.perf_counter()
+        if now > self._next_frame:
+            missed = math.floor((now - self._next_frame) / self.frame_interval) + 1
+            self.skipped_frames += missed
+            self._next_frame += missed * self.frame_interval
+        self._timer.start(max(0, round((self._next_frame - now) * 1000)))
+
+        if now - self._last_stats >= self.stats_interval:
+            self._last_stats = now
+            self.stats_updated.emit(self.stats())
+
+    def stats(self):
+        """帧统计: 实际帧率、平均帧时间和帧时间抖动 (标准差，毫秒)"""
+        times = list(self._frame_times)
+        if not times:
+            return {'fps': 0.0, 'frame_time_ms': 0.0, 'jitter_ms': 0.0,
+                    'target_fps': 1.0 / self.frame_interval, 'skipped_frames': self.skipped_frames}
+
+        mean = sum(times) / len(times)
+        jitter = math.sqrt(sum((t - mean) ** 2 for t in times) / len(times))
+        return {
+            'fps': 1.0 / mean,
+            'frame_time_ms': mean * 1000,
+            'jitter_ms': jitter * 1000,
+            'target_fps': 1.0 / self.frame_interval,
+            'skipped_frames': self.skipped_frames
+        }
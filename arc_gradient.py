@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+弧长参数化的腰线渐变描边
+QLinearGradient 按起点→终点的直线投影取色，腰线弯曲较大时颜色停止点偏离曲线上的实际位置。
+这里按弧长把腰线等分为短段，按每段中点的弧长比例取色，再把颜色量化为若干档，
+同一档的所有短段 (可来自成千上万条腰线) 合并为一条路径，每档只需一次strokePath。
+细分段数按帧耗时预算自动调整
+
+短段是FlatCap的独立直线 (光栅引擎对这种直线有快速路径)，弯曲处相邻短段外侧会留下
+楔形缺口。每个短段在内部分点处沿自身方向延长斜接长度 h·tan(θ/2) (h为半线宽，
+θ为相邻短段的夹角)，两段外侧边线恰好交于斜接点，缺口被完全覆盖，重叠只有这一小段。
+腰线两端另外填充半圆端帽，与线性渐变方法的RoundCap一致
+"""
+
+import sys
+import time
+import numpy as np
+from PySide6.QtWidgets import QApplication, QWidget
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QPainter, QColor, QPen
+
+from arc_length import DEFAULT_ARC_LENGTH_CACHE
+from input_coalescer import display_refresh_rate
+from palette import get_palette, qcolor
+from path_batch import LINE_TO, MOVE_TO, path_from_elements
+
+
+# 腰线渐变停止点 (与线性渐变方法相同的主题)
+ARC_GRADIENT_STOPS = get_palette('leg_gradient').gradient_stops()
+
+# 每个短段的路径元素: moveTo → lineTo
+_PIECE_ELEMENT_TYPES = np.array([MOVE_TO, LINE_TO], dtype='>i4')
+
+# 半圆端帽按多边形填充的边数 (线宽几像素时与圆弧的偏差远小于一个像素，填充耗时约为圆弧的一半)
+CAP_SEGMENTS = 4
+
+# 端帽多边形的路径元素: 左侧端点 → 经顶点到右侧端点 → 回到左侧端点闭合
+_CAP_ELEMENT_TYPES = np.array([MOVE_TO] + [LINE_TO] * (CAP_SEGMENTS + 1), dtype='>i4')
+
+# 分点处延长量的上限 (半线宽的倍数，与QPen默认的斜接限制相同)，急弯处不再延长更多
+MITER_LIMIT = 2.0
+
+# 每条端帽路径包含的端帽数: 抗锯齿填充的耗时随单条路径的规模超线性增长，分批填充
+CAP_BATCH_SIZE = 256
+
+# 细分段数的调整范围与默认帧耗时预算 (毫秒)
+MIN_SEGMENTS = 4
+MAX_SEGMENTS = 64
+DEFAULT_FRAME_BUDGET_MS = 16.0
+
+
+def gradient_colors(stops, positions):
+    """按停止点插值直通RGBA颜色
+
+    Args:
+        stops: ((位置, RGBA), ...) 停止点 (palette.Palette.gradient_stops 的格式)
+        positions: 0.0-1.0 的位置数组
+
+    Returns:
+        np.ndarray: (len(positions), 4) 取整后的RGBA
+    """
+    stop_positions = [position for position, _ in stops]
+    channels = np.array([rgba for _, rgba in stops], dtype=np.float64)
+    return np.rint(np.stack([np.interp(positions, stop_positions, channels[:, channel])
+                             for channel in range(4)], axis=-1)).astype(int)
+
+
+class ArcLengthGradientStroker:
+    """按弧长取色的批量腰线描边
+
+    颜色量化为 color_steps 档；细分段数在 MIN_SEGMENTS 到 MAX_SEGMENTS 之间，
+    每次描边后按实际耗时与 frame_budget_ms 比较调整下一帧的段数
+    """
+
+    def __init__(self, stops=ARC_GRADIENT_STOPS, width=4.0, color_steps=32,
+                 frame_budget_ms=DEFAULT_FRAME_BUDGET_MS, segments=16,
+                 cache=DEFAULT_ARC_LENGTH_CACHE):
+        self.width = width
+        self.cache = cache
+        self.color_steps = color_steps
+        self.frame_budget_ms = frame_budget_ms
+        self.segments = segments
+        self.last_frame_ms = 0.0
+        self.set_stops(stops)
+
+    def set_stops(self, stops):
+        """设置渐变停止点，预先计算每个颜色档的画笔 (短段) 和画刷 (端帽)"""
+        self.stops = stops
+        centers = (np.arange(self.color_steps) + 0.5) / self.color_steps
+        self.pens = []
+        for rgba in gradient_colors(stops, centers).tolist():
+            pen = QPen(QColor(*rgba), self.width)
+            pen.setCapStyle(Qt.FlatCap)
+            self.pens.append(pen)
+        self.brushes = [pen.brush() for pen in self.pens]
+
+    def tessellate(self, curves, segments):
+        """按弧长把腰线等分为短段，并按短段中点的弧长比例确定颜色档
+
+        短段在内部分点处按斜接长度延长，相邻短段的外侧没有缺口
+
+        Returns:
+            tuple: (pieces, steps)
+                pieces: (N × segments, 2, 2) 每个短段 (含延长) 的起点与终点
+                steps: (N × segments,) 每个短段的颜色档
+        """
+        table = self.cache.table(curves)
+        points = table.uniform_points(segments)
+        starts, ends = points[:, :-1], points[:, 1:]
+
+        chords = ends - starts
+        length = np.hypot(chords[..., 0], chords[..., 1])[..., None]
+        directions = np.divide(chords, length, out=np.zeros_like(chords), where=length > 0)
+
+        # 相邻短段方向 a、b 的夹角 θ: tan(θ/2) = |a × b| / (1 + a · b)
+        before, after = directions[:, :-1], directions[:, 1:]
+        cross = np.abs(before[..., 0] * after[..., 1] - before[..., 1] * after[..., 0])
+        dot = np.sum(before * after, axis=-1)
+        half = self.width / 2.0
+        extension = half * np.minimum(
+            np.divide(cross, 1.0 + dot, out=np.full_like(cross, MITER_LIMIT), where=1.0 + dot > 1e-12),
+            MITER_LIMIT)[..., None]
+        starts, ends = starts.copy(), ends.copy()
+        ends[:, :-1] += before * extension
+        starts[:, 1:] -= after * extension
+        pieces = np.stack([starts, ends], axis=2).reshape(-1, 2, 2)
+
+        # 等分后第k段中点的弧长比例对所有腰线相同
+        fraction = (np.arange(segments) + 0.5) / segments
+        steps = np.minimum((fraction * self.color_steps).astype(np.intp), self.color_steps - 1)
+        return pieces, np.tile(steps, len(table))
+
+    def caps(self, curves, segments):
+        """每条腰线两端的半圆端帽，圆心为端点，朝首末短段的方向 (与短段的平端严密衔接)
+
+        Returns:
+            np.ndarray: (N, 2, CAP_SEGMENTS + 1, 2) 起点与终点端帽多边形的顶点，
+                从左侧端点经延长方向上的顶点到右侧端点
+        """
+        table = self.cache.table(curves)
+        ends = table.points_at_fraction([0.0, 1.0 / segments, 1.0 - 1.0 / segments, 1.0])
+        points = ends[:, [0, 3]]
+        chords = np.stack([ends[:, 1] - ends[:, 0], ends[:, 3] - ends[:, 2]], axis=1)
+        length = np.hypot(chords[..., 0], chords[..., 1])[..., None]
+        directions = np.divide(chords, length, out=np.zeros_like(chords), where=length > 0)
+
+        half = self.width / 2.0
+        outward = directions * half * np.array([-1.0, 1.0])[None, :, None]
+        normal = np.stack([-directions[..., 1], directions[..., 0]], axis=-1) * half
+        angles = np.linspace(0.0, np.pi, CAP_SEGMENTS + 1)[:, None]
+        return points[:, :, None] + np.cos(angles) * normal[:, :, None] + \
+            np.sin(angles) * outward[:, :, None]
+
+    def step_paths(self, curves, segments=None):
+        """每个颜色档一条由短段 (moveTo + lineTo) 组成的路径
+
+        Returns:
+            list: [(颜色档, QPainterPath)]，跳过没有短段的颜色档
+        """
+        pieces, steps = self.tessellate(curves, segments or self.segments)
+        counts = np.bincount(steps, minlength=self.color_steps)
+        pieces = pieces[np.argsort(steps, kind='stable')]
+
+        paths = []
+        start = 0
+        for step, count in enumerate(counts.tolist()):
+            if count:
+                selected = pieces[start:start + count].reshape(-1, 2)
+                types = np.tile(_PIECE_ELEMENT_TYPES, count)
+                paths.append((step, path_from_elements(selected, types)))
+            start += count
+        return paths
+
+    def cap_paths(self, curves, segments=None):
+        """起点端帽和终点端帽分别取首末短段的颜色档，每批 CAP_BATCH_SIZE 个端帽一条闭合路径
+
+        Returns:
+            list: [(颜色档, QPainterPath)]
+        """
+        segments = segments or self.segments
+        caps = self.caps(curves, segments)
+        caps = np.concatenate([caps, caps[:, :, :1]], axis=2)
+        fraction = np.array([0.5, segments - 0.5]) / segments
+        steps = np.minimum((fraction * self.color_steps).astype(np.intp), self.color_steps - 1)
+
+        paths = []
+        for end, step in enumerate(steps.tolist()):
+            for start in range(0, len(caps), CAP_BATCH_SIZE):
+                batch = caps[start:start + CAP_BATCH_SIZE, end]
+                types = np.tile(_CAP_ELEMENT_TYPES, len(batch))
+                paths.append((step, path_from_elements(batch.reshape(-1, 2), types)))
+        return paths
+
+    def stroke(self, painter, curves):
+        """描边所有腰线，并按耗时调整下一帧的细分段数
+
+        Args:
+            painter: 活动的QPainter
+            curves: (N, 3, 2) 二次贝塞尔控制点
+        """
+        started = time.perf_counter()
+        segments = self.segments
+        for step, path in self.step_paths(curves, segments):
+            painter.strokePath(path, self.pens[step])
+        for step, path in self.cap_paths(curves, segments):
+            painter.fillPath(path, self.brushes[step])
+
+        self.last_frame_ms = (time.perf_counter() - started) * 1000
+        self.adapt_segments(self.last_frame_ms)
+
+    def adapt_segments(self, elapsed_ms):
+        """超出预算时减少细分段数，明显低于预算时逐步增加"""
+        if elapsed_ms > self.frame_budget_ms:
+            scaled = int(self.segments * self.frame_budget_ms / elapsed_ms)
+            self.segments = max(MIN_SEGMENTS, min(scaled, self.segments - 1))
+        elif elapsed_ms < self.frame_budget_ms * 0.5:
+            self.segments = min(MAX_SEGMENTS, self.segments + 1)
+
+
+class ArcGradientStressWidget(QWidget):
+    """压力测试: 大量随机腰线按弧长渐变描边，显示帧耗时与当前细分段数"""
+
+    def __init__(self, count=2000, seed=0):
+        super().__init__()
+        self.setMinimumSize(900, 700)
+        self.setWindowTitle(f"弧长渐变描边 - {count}条腰线")
+        self.background_color = "#1A2A3A"
+
+        rng = np.random.default_rng(seed)
+        start = rng.uniform([0, 0], [900, 600], size=(count, 2))
+        end = start + rng.uniform([-60, 40], [60, 120], size=(count, 2))
+        control = (start + end) / 2 + rng.uniform(-80, 80, size=(count, 2))
+        self.curves = np.stack([start, control, end], axis=1)
+        self.stroker = ArcLengthGradientStroker(ARC_GRADIENT_STOPS, width=3)
+
+        # 可见期间按屏幕刷新率连续重绘
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(round(1000 / display_refresh_rate()))
+        self.timer.timeout.connect(self.update)
+
+    def showEvent(self, event):
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.fillRect(self.rect(), qcolor(self.background_color))
+        self.stroker.stroke(painter, self.curves)
+
+        painter.setPen(get_palette('ship').color('text'))
+        painter.drawText(10, 20, f"{len(self.curves)}条腰线  细分: {self.stroker.segments}段  "
+                                 f"描边: {self.stroker.last_frame_ms:.1f} ms  "
+                                 f"预算: {self.stroker.frame_budget_ms:.0f} ms")
+        painter.end()
+
+
+def main():
+    """应用程序入口点"""
+    app = QApplication(sys.argv)
+    widget = ArcGradientStressWidget(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
+    widget.show()
+    sys.exit(app.exec())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+二次腰线的弧长参数化 (不依赖Qt)
+均匀分布的渐变停止点、虚线和沿曲线移动的动画都需要 "距起点弧长为s的点"，
+而贝塞尔参数t与弧长不成正比。这里按均匀t把每条曲线分为若干区间，
+用Gauss–Legendre求积得到累计弧长表；反查时二分定位区间，线性插值后做一次牛顿修正。
+所有计算对多条曲线批量进行，查找表按量化后的控制点缓存
+"""
+
+import numpy as np
+
+from bezier_batch import evaluate_quadratic, uniform_t
+from lru_cache import LRUCache
+
+
+# 每个区间的Gauss–Legendre求积节点与权重 ([-1, 1] 上)
+GAUSS_LEGENDRE_ORDER = 8
+_NODES, _WEIGHTS = np.polynomial.legendre.leggauss(GAUSS_LEGENDRE_ORDER)
+
+# 查找表默认区间数
+DEFAULT_SAMPLES = 32
+
+
+def quadratic_derivative(curves, t):
+    """二次贝塞尔曲线的导数 B'(t) = 2[(P₁ - P₀) + (P₀ - 2P₁ + P₂)t]
+
+    Args:
+        curves: (N, 3, 2) 控制点
+        t: (N, ...) 每条曲线各自的t值
+
+    Returns:
+        np.ndarray: (N, ..., 2)
+    """
+    curves = np.asarray(curves, dtype=np.float64)
+    t = np.asarray(t, dtype=np.float64)
+    shape = (len(curves),) + (1,) * (t.ndim - 1) + (2,)
+    linear = (curves[:, 1] - curves[:, 0]).reshape(shape)
+    quadratic = (curves[:, 0] - 2.0 * curves[:, 1] + curves[:, 2]).reshape(shape)
+    return 2.0 * (linear + quadratic * t[..., None])
+
+
+def quadratic_speed(curves, t):
+    """|B'(t)|，形状与t相同"""
+    derivative = quadratic_derivative(curves, t)
+    return np.hypot(derivative[..., 0], derivative[..., 1])
+
+
+def _partial_lengths(curves, t0, t1):
+    """每条曲线从t0到t1的弧长 (Gauss–Legendre求积)，t0、t1形状为 (N, ...)"""
+    half = (t1 - t0) / 2.0
+    nodes = (t0 + t1)[..., None] / 2.0 + half[..., None] * _NODES
+    return half * (quadratic_speed(curves, nodes) @ _WEIGHTS)
+
+
+class ArcLengthTable:
+    """多条二次曲线的累计弧长表
+
+    速度 |B'(t)| 是二次多项式的平方根，闭式积分在直线或控制点共线时退化，
+    分区间求积在这些情况下同样稳定。每个区间上求积误差远小于一个像素，
+    反查时先在表中二分 (O(log n))，再在区间内线性插值并做一次牛顿修正。
+    """
+
+    def __init__(self, curves, samples=DEFAULT_SAMPLES):
+        """
+        Args:
+            curves: (N, 3, 2) 控制点
+            samples: 每条曲线的区间数
+        """
+        self.curves = np.asarray(curves, dtype=np.float64).reshape(-1, 3, 2)
+        self.samples = samples
+        self.t = uniform_t(samples)
+
+        count = len(self.curves)
+        starts = np.broadcast_to(self.t[:-1], (count, samples))
+        stops = np.broadcast_to(self.t[1:], (count, samples))
+        self.lengths = np.zeros((count, samples + 1))
+        np.cumsum(_partial_lengths(self.curves, starts, stops), axis=1,
+                  out=self.lengths[:, 1:])
+        self.total = self.lengths[:, -1].copy()
+
+        # 各曲线的归一化累计弧长加上行偏移后拼成一个单调序列，所有曲线一次二分
+        safe = np.where(self.total > 0, self.total, 1.0)[:, None]
+        fractions = np.where(self.total[:, None] > 0, self.lengths / safe, self.t)
+        self._offsets = 2.0 * np.arange(count)
+        self._search_keys = (fractions + self._offsets[:, None]).ravel()
+
+    def __len__(self):
+        return len(self.curves)
+
+    def _as_queries(self, values):
+        """把 (K,) 共用或 (N, K) 各自的查询值整理为 (N, K)"""
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim < 2:
+            values = np.broadcast_to(values.reshape(1, -1), (len(self), values.size))
+        return values
+
+    def t_at_fraction(self, fractions):
+        """弧长比例 (0.0-1.0) 对应的t值
+
+        Args:
+            fractions: (K,) 所有曲线共用，或 (N, K) 每条曲线各自的比例，超出范围时截断
+
+        Returns:
+            np.ndarray: (N, K)
+        """
+        fractions = np.clip(self._as_queries(fractions), 0.0, 1.0)
+        count, queries = fractions.shape
+        rows = np.arange(count)[:, None]
+
+        position = np.searchsorted(self._search_keys, (fractions + self._offsets[:, None]).ravel(),
+                                   side='right').reshape(count, queries) - 1
+        index = np.clip(position - rows * (self.samples + 1), 0, self.samples - 1)
+
+        target = fractions * self.total[:, None]
+        l0 = self.lengths[rows, index]
+        l1 = self.lengths[rows, index + 1]
+        t0, t1 = self.t[index], self.t[index + 1]
+        span = l1 - l0
+        ratio = np.divide(target - l0, span, out=np.zeros_like(target), where=span > 0)
+        t = t0 + ratio * (t1 - t0)
+
+        # 牛顿修正: t ← t − (L(t) − s) / |B'(t)|，结果限制在区间内
+        speed = quadratic_speed(self.curves, t)
+        error = l0 + _partial_lengths(self.curves, t0, t) - target
+        step = np.divide(error, speed, out=np.zeros_like(error), where=speed > 1e-12)
+        return np.clip(t - step, t0, t1)
+
+    def t_at_length(self, lengths):
+        """距起点弧长 (像素) 对应的t值，参数格式同 t_at_fraction"""
+        lengths = self._as_queries(lengths)
+        safe = np.where(self.total > 0, self.total, 1.0)[:, None]
+        return self.t_at_fraction(lengths / safe)
+
+    def points_at_fraction(self, fractions):
+        """弧长比例对应的曲线上的点，(N, K, 2)"""
+        return evaluate_quadratic(self.curves, self.t_at_fraction(fractions))
+
+    def points_at_length(self, lengths):
+        """距起点弧长对应的曲线上的点，(N, K, 2)"""
+        return evaluate_quadratic(self.curves, self.t_at_length(lengths))
+
+    def uniform_points(self, segments):
+        """按弧长等分每条曲线，(N, segments + 1, 2) 含两端"""
+        return self.points_at_fraction(uniform_t(segments))
+
+
+class ArcLengthCache(LRUCache):
+    """弧长表的LRU缓存
+
+    缓存键 = (区间数, 量化后的控制点)。表总是用量化后的控制点建立，
+    因此无论是否命中，相同输入得到的表完全一致。界面参数不变时曲线不变，
+    每帧只需一次字典查找。
+    """
+
+    def __init__(self, samples=DEFAULT_SAMPLES, max_size=128, quantum=1e-3):
+        """
+        Args:
+            samples: 每条曲线的区间数
+            max_size: 最多缓存的表数量 (每个表可包含多条曲线)
+            quantum: 控制点量化步长 (像素)
+        """
+        super().__init__(max_size)
+        self.samples = samples
+        self.quantum = quantum
+
+    def table(self, curves):
+        """获取一组曲线的弧长表
+
+        Args:
+            curves: (N, 3, 2) 控制点
+
+        Returns:
+            ArcLengthTable: 共享的表对象，调用方不应修改它
+        """
+        quantized = np.round(np.asarray(curves, dtype=np.float64).reshape(-1, 3, 2)
+                             / self.quantum) * self.quantum
+        key = (self.samples, quantized.shape, quantized.tobytes())
+
+        table = self._get(key)
+        if table is None:
+            table = ArcLengthTable(quantized, self.samples)
+            self._put(key, table)
+        return table
+
+
+# 所有调用方共享的默认缓存
+DEFAULT_ARC_LENGTH_CACHE = ArcLengthCache()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+离屏批量渲染
+读取JSONL/CSV格式的梯形参数流 (与simplified_trapezoid_configs.py中的配置字典同构)，
+使用CoreTrapezoidRenderer的绘制逻辑渲染到QImage，不创建任何Widget，
+编码后的帧写入目录或标准输出
+
+用法:
+    python batch_render.py params.jsonl --output-dir frames/
+    python batch_render.py params.csv --format raw --output - > frames.raw
+    cat params.jsonl | python batch_render.py - --output-dir frames/
+    python batch_render.py params.jsonl --workers 0 --output-dir frames/   # 每个CPU核心一个进程
+"""
+
+import os
+import sys
+import csv
+import json
+import argparse
+import collections
+import multiprocessing
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtGui import QGuiApplication, QImage, QPainter, QColor
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice
+
+from core_curved_trapezoid import CoreTrapezoidRenderer, DEFAULT_TRAPEZOID_HEIGHT
+from simplified_trapezoid_configs import resolve_curve_offset
+
+
+# 默认画布尺寸 (与CoreCurvedTrapezoidWidget一致)
+DEFAULT_SIZE = (700, 500)
+
+# 配置字典键名 → 渲染器属性
+DIMENSION_KEYS = {
+    'height': 'trapezoid_height',
+    'top_base': 'trapezoid_top_width',
+    'bottom_base': 'trapezoid_bottom_width',
+    'outline_width': 'line_width'
+}
+
+# 可以识别的弯曲偏移键 (任一即可)
+CURVE_OFFSET_KEYS = ('curve_offset', 'curve_amount', 'curve_pixels', 'curve_ratio',
+                     'curve_intensity')
+
+# 数值型参数键 (CSV中只转换这些列，其余列如帧名称、标签按原字符串保留)
+NUMERIC_KEYS = frozenset(('top_offset', 'left_offset', 'position_ratio',
+                          'control_point_ratio', *CURVE_OFFSET_KEYS, *DIMENSION_KEYS))
+
+
+def iter_parameters(stream, input_format):
+    """逐条读取参数字典
+
+    Args:
+        stream: 文本输入流
+        input_format: 'jsonl' 或 'csv'
+
+    Yields:
+        dict: 参数字典 (CSV中 NUMERIC_KEYS 列转换为float，其余列保留字符串)
+    """
+    if input_format == 'csv':
+        # 表头占第1行，数据从第2行开始
+        for line_number, row in enumerate(csv.DictReader(stream), 2):
+            parameters = {}
+            for key, value in row.items():
+                if key is None or value in (None, ''):
+                    continue
+                if key in NUMERIC_KEYS:
+                    try:
+                        value = float(value)
+                    except ValueError as e:
+                        raise ValueError(f"第{line_number}行的 {key} 不是数值: {value!r}") from e
+                parameters[key] = value
+            yield parameters
+        return
+
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"第{line_number}行不是有效的JSON: {e}") from e
+
+
+def config_to_parameters(config):
+    """把配置字典转换为渲染器参数
+
+    支持两种写法:
+    - 核心参数: top_offset / position_ratio / curve_offset
+    - simplified_trapezoid_configs中的配置方案: left_offset (正值向左) 加上
+      curve_amount / curve_pixels / curve_ratio / curve_intensity×control_point_ratio
+
+    Returns:
+        dict: 渲染器属性名 → 值
+    """
+    parameters = {}
+
+    if 'top_offset' in config:
+        parameters['top_offset'] = config['top_offset']
+    elif 'left_offset' in config:
+        parameters['top_offset'] = -config['left_offset']
+
+    if 'position_ratio' in config:
+        parameters['position_ratio'] = config['position_ratio']
+
+    if 'curve_offset' in config:
+        parameters['curve_offset'] = config['curve_offset']
+    elif any(key in config for key in CURVE_OFFSET_KEYS):
+        parameters['curve_offset'] = resolve_curve_offset(
+            {'height': DEFAULT_TRAPEZOID_HEIGHT, **config})
+
+    for key, attribute in DIMENSION_KEYS.items():
+        if key in config:
+            parameters[attribute] = config[key]
+
+    return parameters
+
+
+class FrameRenderer:
+    """复用同一个QImage和渲染器的单帧编码器"""
+
+    def __init__(self, size=DEFAULT_SIZE, frame_format='png', background="#BDC5D5",
+                 annotate=False):
+        self.frame_format = frame_format
+        self.image = QImage(size[0], size[1], QImage.Format_ARGB32_Premultiplied)
+        self.renderer = CoreTrapezoidRenderer(*size)
+        self.renderer.background_color = background
+        self.renderer.show_parameter_text = annotate
+        self.renderer.show_key_points = annotate
+        self._defaults = {attribute: getattr(self.renderer, attribute)
+                          for attribute in ('top_offset', 'position_ratio', 'curve_offset',
+                                            *DIMENSION_KEYS.values())}
+
+    def render(self, config):
+        """渲染一帧并返回编码后的字节"""
+        # 每帧从默认值开始，避免上一帧的参数残留
+        for attribute, value in self._defaults.items():
+            setattr(self.renderer, attribute, value)
+        for attribute, value in config_to_parameters(config).items():
+            setattr(self.renderer, attribute, value)
+
+        self.image.fill(QColor(0, 0, 0, 0))
+        painter = QPainter(self.image)
+        try:
+            self.renderer.render(painter)
+        finally:
+            painter.end()
+
+        return self.encode()
+
+    def encode(self):
+        """把当前图像编码为PNG或原始ARGB32字节"""
+        if self.frame_format == 'raw':
+            return bytes(self.image.constBits())
+
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.WriteOnly)
+        self.image.save(buffer, "PNG")
+        buffer.close()
+        return bytes(data)
+
+
+# 工作进程内的渲染器 (每个进程各自拥有QGuiApplication和可复用的QImage)
+_worker_app = None
+_worker_renderer = None
+
+
+def _init_worker(size, frame_format, background, annotate):
+    """进程池初始化: 创建本进程的QGuiApplication和FrameRenderer"""
+    global _worker_app, _worker_renderer
+    _worker_app = QGuiApplication.instance() or QGuiApplication([sys.argv[0]])
+    _worker_renderer = FrameRenderer(size, frame_format, background, annotate)
+
+
+def _render_in_worker(config):
+    """在工作进程中渲染一帧"""
+    return _worker_renderer.render(config)
+
+
+def resolve_workers(workers):
+    """实际进程数: 0表示每个CPU核心一个进程 (至少1个)"""
+    return workers or os.cpu_count() or 1
+
+
+def render_frames(configs, size=DEFAULT_SIZE, frame_format='png', background="#BDC5D5",
+                  annotate=False, workers=1, max_pending=None):
+    """渲染参数序列，按输入顺序逐帧产出编码后的字节
+
+    workers > 1 时把参数分发到进程池。同时在途的帧数不超过 max_pending，
+    超出时先等待最早的一帧完成再继续读取输入 (背压)，因此输入可以是无限流，
+    内存占用与在途帧数成正比。
+
+    Args:
+        configs: 参数字典的可迭代对象
+        size, frame_format, background, annotate: 同FrameRenderer
+        workers: 进程数，1表示在当前进程渲染 (调用方需已创建QGuiApplication)，
+                 0表示使用全部CPU核心 (见resolve_workers，单核时同样在当前进程渲染)
+        max_pending: 最大在途帧数，默认为进程数的4倍
+
+    Yields:
+        bytes: 编码后的帧
+    """
+    workers = resolve_workers(workers)
+    if workers == 1:
+        frame_renderer = FrameRenderer(size, frame_format, background, annotate)
+        for config in configs:
+            yield frame_renderer.render(config)
+        return
+
+    max_pending = max_pending or workers * 4
+    # Qt不支持fork后继续使用，工作进程一律以spawn方式启动
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(workers, initializer=_init_worker,
+                      initargs=(size, frame_format, background, annotate)) as pool:
+        pending = collections.deque()
+        for config in configs:
+            if len(pending) >= max_pending:
+                yield pending.popleft().get()
+            pending.append(pool.apply_async(_render_in_worker, (config,)))
+        while pending:
+            yield pending.popleft().get()
+
+
+class FrameWriter:
+    """把编码后的帧写入目录 (每帧一个文件) 或二进制流"""
+
+    def __init__(self, output, frame_format):
+        self.frame_format = frame_format
+        self.directory = None
+        self.stream = None
+
+        if output == '-':
+            self.stream = sys.stdout.buffer
+        else:
+            self.directory = output
+            os.makedirs(output, exist_ok=True)
+
+    def write(self, index, frame):
+        if self.stream is not None:
+            self.stream.write(frame)
+            return
+        extension = 'png' if self.frame_format == 'png' else 'raw'
+        with open(os.path.join(self.directory, f"frame_{index:06d}.{extension}"), 'wb') as f:
+            f.write(frame)
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.flush()
+
+
+def detect_input_format(path, input_format):
+    """根据参数或文件扩展名确定输入格式"""
+    if input_format:
+        return input_format
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+
+def parse_size(text):
+    """解析 '700x500' 形式的尺寸"""
+    width, height = (int(value) for value in text.lower().split('x'))
+    return width, height
+
+
+def parse_arguments(argv):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="弯曲梯形离屏批量渲染")
+    parser.add_argument('input', help="参数文件 (JSONL或CSV)，'-' 表示标准输入")
+    parser.add_argument('--input-format', choices=['jsonl', 'csv'],
+                        help="输入格式 (默认按扩展名判断，标准输入默认JSONL)")
+    parser.add_argument('--output', '--output-dir', dest='output', default='frames',
+                        help="输出目录，'-' 表示把帧依次写到标准输出")
+    parser.add_argument('--format', dest='frame_format', choices=['png', 'raw'], default='png',
+                        help="帧编码: PNG或原始ARGB32 (预乘) 字节")
+    parser.add_argument('--size', type=parse_size, default=DEFAULT_SIZE, help="画布尺寸，如 700x500")
+    parser.add_argument('--background', default="#BDC5D5",
+                        help="背景色，'transparent' 表示透明背景")
+    parser.add_argument('--annotate', action='store_true', help="绘制参数文字和关键点标记")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="渲染进程数，0表示每个CPU核心一个进程")
+    parser.add_argument('--max-pending', type=int, help="最大在途帧数 (默认为进程数的4倍)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """应用程序入口点"""
+    args = parse_arguments(sys.argv[1:] if argv is None else argv)
+    # 先确定实际进程数 (--workers 0 在单核机器上也是单进程)；多进程模式下由工作进程各自创建QGuiApplication
+    workers = resolve_workers(args.workers)
+    app = None
+    if workers == 1:
+        app = QGuiApplication.instance() or QGuiApplication(sys.argv[:1])
+
+    background = None if args.background == 'transparent' else args.background
+    writer = FrameWriter(args.output, args.frame_format)
+    input_format = detect_input_format(args.input, args.input_format)
+
+    stream = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8', newline='')
+    count = 0
+    try:
+        frames = render_frames(iter_parameters(stream, input_format), args.size,
+                               args.frame_format, background, args.annotate,
+                               workers, args.max_pending)
+        for index, frame in enumerate(frames):
+            writer.write(index, frame)
+            count += 1
+    finally:
+        writer.close()
+        if stream is not sys.stdin:
+            stream.close()
+
+    print(f"已渲染 {count} 帧", file=sys.stderr)
+    return app
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量贝塞尔曲线求值
+一次性计算多条二次/三次贝塞尔曲线在多个t值处的坐标，结果写入连续缓冲区
+"""
+
+import numpy as np
+
+
+def _as_t_values(t):
+    """把t值整理为float64数组，末尾补一维用于与伯恩斯坦基相乘"""
+    return np.asarray(t, dtype=np.float64)[..., np.newaxis]
+
+
+def quadratic_basis(t):
+    """二次伯恩斯坦基函数
+
+    Args:
+        t: (M,) 或 (N, M) t值数组
+
+    Returns:
+        np.ndarray: (..., M, 3) 基函数值 [(1-t)², 2(1-t)t, t²]
+    """
+    t = _as_t_values(t)
+    u = 1.0 - t
+    return np.concatenate([u * u, 2.0 * u * t, t * t], axis=-1)
+
+
+def cubic_basis(t):
+    """三次伯恩斯坦基函数
+
+    Args:
+        t: (M,) 或 (N, M) t值数组
+
+    Returns:
+        np.ndarray: (..., M, 4) 基函数值 [(1-t)³, 3(1-t)²t, 3(1-t)t², t³]
+    """
+    t = _as_t_values(t)
+    u = 1.0 - t
+    return np.concatenate([u * u * u, 3.0 * u * u * t, 3.0 * u * t * t, t * t * t],
+                          axis=-1)
+
+
+def _evaluate(basis, curves, out):
+    """用基函数矩阵乘以控制点，得到 (..., M, 2) 采样点"""
+    curves = np.asarray(curves, dtype=np.float64)
+    if out is None:
+        return np.ascontiguousarray(np.matmul(basis, curves))
+    return np.matmul(basis, curves, out=out)
+
+
+def evaluate_quadratic(curves, t, out=None):
+    """批量计算二次贝塞尔曲线上的点
+
+    B(t) = (1-t)²P₀ + 2(1-t)tP₁ + t²P₂
+
+    Args:
+        curves: (N, 3, 2) 控制点 [起点, 控制点, 终点]
+        t: (M,) 所有曲线共用的t值，或 (N, M) 每条曲线各自的t值
+        out: 可选的 (N, M, 2) float64输出缓冲区
+
+    Returns:
+        np.ndarray: (N, M, 2) C连续的采样点
+    """
+    return _evaluate(quadratic_basis(t), curves, out)
+
+
+def evaluate_cubic(curves, t, out=None):
+    """批量计算三次贝塞尔曲线上的点
+
+    B(t) = (1-t)³P₀ + 3(1-t)²tP₁ + 3(1-t)t²P₂ + t³P₃
+
+    Args:
+        curves: (N, 4, 2) 控制点 [起点, 控制点1, 控制点2, 终点]
+        t: (M,) 所有曲线共用的t值，或 (N, M) 每条曲线各自的t值
+        out: 可选的 (N, M, 2) float64输出缓冲区
+
+    Returns:
+        np.ndarray: (N, M, 2) C连续的采样点
+    """
+    return _evaluate(cubic_basis(t), curves, out)
+
+
+def uniform_t(num_points):
+    """返回 num_points 段均匀采样的t值 (含两端，共 num_points + 1 个)"""
+    return np.linspace(0.0, 1.0, num_points + 1)
+
+
+def quadratic_bounds(curves):
+    """二次贝塞尔曲线的精确轴对齐包围盒
+
+    各坐标分量的导数 B'(t) = 2[(P₁ - P₀) + (P₀ - 2P₁ + P₂)t] 在
+    t* = (P₀ - P₁) / (P₀ - 2P₁ + P₂) 处为零；t* 在 (0, 1) 内时该点是这一分量的极值，
+    包围盒由两个端点和各分量的极值点确定。分母为0 (该分量为直线) 时只取端点。
+
+    Args:
+        curves: (..., 3, 2) 控制点
+
+    Returns:
+        np.ndarray: (..., 4) [min_x, min_y, max_x, max_y]
+    """
+    curves = np.asarray(curves, dtype=np.float64)
+    start, control, end = curves[..., 0, :], curves[..., 1, :], curves[..., 2, :]
+    denominator = start - 2.0 * control + end
+    t = np.divide(start - control, denominator, out=np.zeros_like(denominator),
+                  where=denominator != 0)
+    t = np.clip(t, 0.0, 1.0)
+    u = 1.0 - t
+    extremum = u * u * start + 2.0 * u * t * control + t * t * end
+
+    lower = np.minimum(np.minimum(start, end), extremum)
+    upper = np.maximum(np.maximum(start, end), extremum)
+    return np.concatenate([lower, upper], axis=-1)
+
+
+def quadratic_x_at_y(legs, y):
+    """y方向单调的二次腰线在高度y处的x坐标
+
+    控制点的y位于起点与终点之间的比例 r 处，归一化高度 s 满足
+    s = (1-2r)t² + 2rt，取[0, 1]内的根 t = s / (r + √(r² + (1-2r)s))
+
+    Args:
+        legs: (..., 3, 2) [起点, 控制点, 终点]
+        y: 高度 (应在起点与终点之间)，与 legs[..., 0, 0] 按NumPy规则广播
+
+    Returns:
+        np.ndarray: 广播后形状的x坐标
+    """
+    legs = np.asarray(legs, dtype=np.float64)
+    y0, yc, y2 = legs[..., 0, 1], legs[..., 1, 1], legs[..., 2, 1]
+    height = y2 - y0
+    safe = np.where(height != 0, height, 1.0)
+    ratio = (yc - y0) / safe
+    s = np.clip((y - y0) / safe, 0.0, 1.0)
+
+    denominator = ratio + np.sqrt(np.maximum(ratio * ratio + (1 - 2 * ratio) * s, 0.0))
+    t = np.divide(s, denominator, out=np.zeros_like(s), where=denominator > 0)
+    u = 1 - t
+    return u * u * legs[..., 0, 0] + 2 * u * t * legs[..., 1, 0] + t * t * legs[..., 2, 0]
+
+
+def quadratic_segment_counts(curves, tolerance=0.25, min_segments=1, max_segments=1024):
+    """根据平直度计算每条二次曲线所需的分段数
+
+    二次曲线的二阶导数恒为 2(P₀ - 2P₁ + P₂)，按参数步长h均匀分段时，
+    弦与曲线的最大偏差不超过 |P₀ - 2P₁ + P₂|·h²/4。
+    令其不超过容差即得分段数 n = ceil(sqrt(|P₀ - 2P₁ + P₂| / (4·tolerance)))。
+
+    Args:
+        curves: (N, 3, 2) 控制点
+        tolerance: 允许的最大偏差 (像素)
+        min_segments, max_segments: 分段数上下限
+
+    Returns:
+        np.ndarray: (N,) int64分段数
+    """
+    curves = np.asarray(curves, dtype=np.float64)
+    second_difference = curves[..., 0, :] - 2.0 * curves[..., 1, :] + curves[..., 2, :]
+    deviation = np.hypot(second_difference[..., 0], second_difference[..., 1])
+    counts = np.ceil(np.sqrt(deviation / (4.0 * tolerance)))
+    return np.clip(counts, min_segments, max_segments).astype(np.int64)
+
+
+def flatten_quadratic(curves, tolerance=0.25, min_segments=1, max_segments=1024):
+    """自适应展平二次曲线，顶点数随实际弯曲程度变化
+
+    Args:
+        curves: (N, 3, 2) 控制点
+        tolerance: 允许的最大偏差 (像素)
+        min_segments, max_segments: 每条曲线的分段数上下限
+
+    Returns:
+        tuple: (points, offsets)
+            points: (总点数, 2) 所有曲线的展平点，按曲线顺序连续存放 (含两端点)
+            offsets: (N + 1,) 第i条曲线的点为 points[offsets[i]:offsets[i + 1]]
+    """
+    curves = np.asarray(curves, dtype=np.float64)
+    counts = quadratic_segment_counts(curves, tolerance, min_segments, max_segments)
+
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts + 1, out=offsets[1:])
+
+    # 为每个输出点计算所属曲线及其t值
+    curve_index = np.repeat(np.arange(len(counts)), counts + 1)
+    local_index = np.arange(offsets[-1]) - offsets[:-1][curve_index]
+    t = local_index / counts[curve_index]
+
+    points = np.einsum('pk,pkd->pd', quadratic_basis(t), curves[curve_index])
+    return points, offsets
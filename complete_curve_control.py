@@ -6,10 +6,15 @@
 """
 
 import sys
+import numpy as np
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                                QHBoxLayout, QLabel, QSlider, QPushButton, QGroupBox)
-from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QPainter, QLinearGradient, QPen, QColor, QPainterPath
+from PySide6.QtCore import Qt, QPointF, QRectF
+from PySide6.QtGui import QPainter, QPen, QColor, QPainterPath
+
+from gradient_cache import DEFAULT_GRADIENT_CACHE
+from palette import get_palette
+from trapezoid_geometry import LEG_ENDPOINTS, leg_bounds
 
 
 # 颜色定义
@@ -20,6 +25,9 @@ COLORS = {
     'outline': '#B7B286'
 }
 
+# 腰线渐变停止点 (主题只解析一次)
+LEG_GRADIENT_STOPS = get_palette('leg_gradient_soft').gradient_stops()
+
 # 基础尺寸参数
 BASE_DIMENSIONS = {
     'height': 300,
@@ -44,11 +52,39 @@ class CompleteTrapezoidWidget(QWidget):
         self.setStyleSheet("background-color: #BDC5D5;")
     
     def set_parameters(self, top_offset, curve_offset, position_ratio):
-        """设置完整参数"""
+        """设置完整参数
+        
+        只重绘新旧两个梯形外接矩形的并集，滑块拖动时的重绘量与图形大小而不是窗口大小成正比
+        """
+        previous_bounds = self._shape_bounds()
+        
         self.top_offset = top_offset
         self.curve_offset = curve_offset
         self.position_ratio = position_ratio
-        self.update()
+        
+        if getattr(self, 'show_guides', False):
+            # 参考线和偏移文字贯穿整个Widget高度，直接整体重绘
+            self.update()
+        else:
+            self.update(previous_bounds.united(self._shape_bounds()))
+    
+    def _shape_bounds(self):
+        """当前弯曲梯形在Widget中占据的整数像素矩形
+        
+        两条二次腰线的精确包围盒 (含四个顶点)，再向外扩展半个线宽 (圆形端点)
+        和1像素抗锯齿边缘即可覆盖全部绘制结果
+        """
+        geometry = self._create_trapezoid_geometry()
+        curves = []
+        for start_key, end_key in LEG_ENDPOINTS.values():
+            start, end = geometry[start_key], geometry[end_key]
+            curves.append([(point.x(), point.y())
+                           for point in (start, self._control_point(start, end), end)])
+        min_x, min_y, max_x, max_y = leg_bounds(np.array([curves]))[0].tolist()
+        
+        margin = BASE_DIMENSIONS['outline_width'] / 2 + 1
+        return QRectF(QPointF(min_x - margin, min_y - margin),
+                      QPointF(max_x + margin, max_y + margin)).toAlignedRect()
     
     def _create_trapezoid_geometry(self):
         """创建弯曲梯形的关键点坐标"""
@@ -83,35 +119,23 @@ class CompleteTrapezoidWidget(QWidget):
         path = QPainterPath()
         path.moveTo(start_point)
         
+        # 创建二次贝塞尔曲线
+        path.quadTo(self._control_point(start_point, end_point), end_point)
+        
+        return path
+    
+    def _control_point(self, start_point, end_point):
+        """计算腰线的贝塞尔控制点"""
         # 计算基础位置（根据位置比例）
         base_x = start_point.x() + (end_point.x() - start_point.x()) * self.position_ratio
         base_y = start_point.y() + (end_point.y() - start_point.y()) * self.position_ratio
         
         # 使用弯曲偏移量
-        control_point = QPointF(base_x + self.curve_offset, base_y)
-        
-        # 创建二次贝塞尔曲线
-        path.quadTo(control_point, end_point)
-        
-        return path
+        return QPointF(base_x + self.curve_offset, base_y)
     
     def _create_line_gradient(self, start_point, end_point):
         """创建渐变"""
-        gradient = QLinearGradient(start_point, end_point)
-        
-        top_color = QColor(COLORS['top'])
-        top_color.setAlpha(100)
-        gradient.setColorAt(0.0, top_color)
-        
-        middle_color = QColor(COLORS['middle'])
-        middle_color.setAlpha(200)
-        gradient.setColorAt(0.5, middle_color)
-        
-        bottom_color = QColor(COLORS['bottom'])
-        bottom_color.setAlpha(100)
-        gradient.setColorAt(1.0, bottom_color)
-        
-        return gradient
+        return DEFAULT_GRADIENT_CACHE.linear_gradient(start_point, end_point, LEG_GRADIENT_STOPS)
     
     def _draw_trapezoid_outline(self, painter, geometry):
         """绘制弯曲梯形轮廓线"""
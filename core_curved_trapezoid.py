@@ -7,8 +7,13 @@
 
 import sys
 from PySide6.QtWidgets import QApplication, QMainWindow, QWidget
-from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QPainter, QLinearGradient, QPen, QColor, QPainterPath
+from PySide6.QtCore import Qt, QPointF, QRect
+from PySide6.QtGui import QPainter, QPainterPath
+
+from gradient_cache import DEFAULT_GRADIENT_CACHE
+from layer_cache import LayerCache
+from palette import get_palette, qcolor
+from stroke_cache import DEFAULT_STROKE_CACHE
 
 
 # 渐变颜色定义 (来自原始gradient_trapezoid.py)
@@ -19,13 +24,20 @@ GRADIENT_COLORS = {
     'outline': '#B7B286'   # 轮廓颜色
 }
 
+# 腰线渐变停止点 (主题只解析一次)
+LEG_GRADIENT_STOPS = get_palette('leg_gradient').gradient_stops()
 
-class CoreCurvedTrapezoidWidget(QWidget):
-    """核心弯曲梯形Widget - 使用3个核心参数"""
+# 填充与标注颜色
+FILL_PALETTE = get_palette('fill')
+
+# 默认梯形高度 (像素)
+DEFAULT_TRAPEZOID_HEIGHT = 300
+
+
+class CoreTrapezoidRenderer:
+    """核心弯曲梯形绘制逻辑 - 不依赖QWidget，可绘制到任意QPaintDevice (Widget或离屏QImage)"""
     
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        
+    def __init__(self, width=700, height=500):
         # 核心参数1: 上底平移量 (像素) - 负值向左
         self.top_offset = -200
         
@@ -36,14 +48,31 @@ class CoreCurvedTrapezoidWidget(QWidget):
         self.curve_offset = 200
         
         # 固定的显示参数 (不影响曲线形状)
-        self.trapezoid_height = 300
+        self.trapezoid_height = DEFAULT_TRAPEZOID_HEIGHT
         self.trapezoid_top_width = 30
         self.trapezoid_bottom_width = 500
         self.line_width = 3
         
-        # 设置窗口
-        self.setFixedSize(700, 500)
-        self.setStyleSheet("background-color: #94D8F6;")
+        # 背景色 (None表示保持透明) 与可选的标注层
+        self.background_color = "#BDC5D5"
+        self.show_parameter_text = True
+        self.show_key_points = True
+        
+        self.resize(width, height)
+    
+    def resize(self, width, height):
+        """设置绘制区域尺寸"""
+        self._width = width
+        self._height = height
+    
+    def width(self):
+        return self._width
+    
+    def height(self):
+        return self._height
+    
+    def rect(self):
+        return QRect(0, 0, self._width, self._height)
     
     def create_trapezoid_geometry(self):
         """创建梯形几何 - 基于核心参数"""
@@ -71,17 +100,20 @@ class CoreCurvedTrapezoidWidget(QWidget):
             'bottom_right': QPointF(bottom_right_x, bottom_y)
         }
     
-    def create_bezier_curve(self, start_point, end_point):
-        """创建贝塞尔曲线 - 基于核心参数2和3"""
-        path = QPainterPath()
-        path.moveTo(start_point)
-        
+    def bezier_control_point(self, start_point, end_point):
+        """腰线的二次贝塞尔控制点 - 基于核心参数2和3"""
         # 核心参数2: 控制点位置比例
         base_x = start_point.x() + (end_point.x() - start_point.x()) * self.position_ratio
         base_y = start_point.y() + (end_point.y() - start_point.y()) * self.position_ratio
         
         # 核心参数3: 横向偏移量
-        control_point = QPointF(base_x + self.curve_offset, base_y)
+        return QPointF(base_x + self.curve_offset, base_y)
+    
+    def create_bezier_curve(self, start_point, end_point):
+        """创建贝塞尔曲线 - 基于核心参数2和3"""
+        path = QPainterPath()
+        path.moveTo(start_point)
+        control_point = self.bezier_control_point(start_point, end_point)
         
         # 创建二次贝塞尔曲线
         path.quadTo(control_point, end_point)
@@ -90,62 +122,30 @@ class CoreCurvedTrapezoidWidget(QWidget):
     
     def create_line_gradient(self, start_point, end_point):
         """创建腰线渐变 (来自gradient_trapezoid.py)"""
-        # 创建沿腰线方向的线性渐变
-        gradient = QLinearGradient(start_point, end_point)
-        
-        # 设置渐变颜色点
-        # 起点（上端）：#B6B384，完全透明（alpha=0）
-        top_color = QColor(GRADIENT_COLORS['top'])
-        top_color.setAlpha(0)  # 完全透明
-        gradient.setColorAt(0.0, top_color)
-        
-        # 中间（50%）：#FEFFAF，50%透明（alpha=127）
-        middle_color = QColor(GRADIENT_COLORS['middle'])
-        middle_color.setAlpha(127)  # 50%透明
-        gradient.setColorAt(0.5, middle_color)
-        
-        # 终点（下端）：#B7B286，完全透明（alpha=0）
-        bottom_color = QColor(GRADIENT_COLORS['bottom'])
-        bottom_color.setAlpha(0)  # 完全透明
-        gradient.setColorAt(1.0, bottom_color)
-        
-        return gradient
+        return DEFAULT_GRADIENT_CACHE.linear_gradient(start_point, end_point, LEG_GRADIENT_STOPS)
     
     def draw_curved_trapezoid(self, painter, geometry):
-        """绘制弯曲梯形的渐变腰线"""
+        """绘制弯曲梯形的渐变腰线
+        
+        腰线的描边轮廓按控制点和线宽缓存，参数不变的重绘不再重新计算描边
+        """
         # 绘制左腰线（弯曲，带渐变）
-        left_path, left_control = self.create_bezier_curve(
-            geometry['top_left'], 
-            geometry['bottom_left']
-        )
+        left_control = self.bezier_control_point(geometry['top_left'], geometry['bottom_left'])
         left_gradient = self.create_line_gradient(
             geometry['top_left'], 
             geometry['bottom_left']
         )
-        
-        left_pen = QPen()
-        left_pen.setBrush(left_gradient)
-        left_pen.setWidth(self.line_width)
-        left_pen.setCapStyle(Qt.RoundCap)
-        painter.setPen(left_pen)
-        painter.drawPath(left_path)
+        DEFAULT_STROKE_CACHE.draw_leg(painter, geometry['top_left'], left_control,
+                                      geometry['bottom_left'], self.line_width, left_gradient)
         
         # 绘制右腰线（弯曲，带渐变）
-        right_path, right_control = self.create_bezier_curve(
-            geometry['top_right'], 
-            geometry['bottom_right']
-        )
+        right_control = self.bezier_control_point(geometry['top_right'], geometry['bottom_right'])
         right_gradient = self.create_line_gradient(
             geometry['top_right'], 
             geometry['bottom_right']
         )
-        
-        right_pen = QPen()
-        right_pen.setBrush(right_gradient)
-        right_pen.setWidth(self.line_width)
-        right_pen.setCapStyle(Qt.RoundCap)
-        painter.setPen(right_pen)
-        painter.drawPath(right_path)
+        DEFAULT_STROKE_CACHE.draw_leg(painter, geometry['top_right'], right_control,
+                                      geometry['bottom_right'], self.line_width, right_gradient)
         
         return left_control, right_control
     
@@ -173,67 +173,140 @@ class CoreCurvedTrapezoidWidget(QWidget):
         
         return path
     
+    def draw_background(self, painter):
+        """绘制背景色"""
+        if self.background_color is not None:
+            painter.fillRect(self.rect(), qcolor(self.background_color))
+    
+    def draw_fill(self, painter, geometry):
+        """绘制填充的弯曲梯形"""
+        filled_path = self.create_filled_trapezoid_path(geometry)
+        painter.setBrush(FILL_PALETTE.brush('fill'))  # 设置填充颜色
+        painter.setPen(Qt.NoPen)  # 不绘制边框
+        painter.drawPath(filled_path)
+    
+    def parameter_text_lines(self):
+        """参数信息文字: ((x, y, 文字), ...)，同时作为文字图层的缓存键"""
+        return (
+            (20, 30, "核心弯曲梯形 - 3参数控制 + 颜色填充"),
+            (20, 50, "=" * 40),
+            (20, 80, f"参数1 - 上底平移量: {self.top_offset:+.0f} 像素"),
+            (20, 100, f"参数2 - 控制点位置比例: {self.position_ratio:.2f}"),
+            (20, 120, f"参数3 - 横向偏移量: {self.curve_offset:+.0f} 像素"),
+            (20, 150, "填充颜色: #CBD900"),
+            (20, 170, "渐变腰线特性:"),
+            (20, 190, f"• 顶部: {GRADIENT_COLORS['top']} (完全透明)"),
+            (20, 210, f"• 中间: {GRADIENT_COLORS['middle']} (50%透明)"),
+            (20, 230, f"• 底部: {GRADIENT_COLORS['bottom']} (完全透明)")
+        )
+    
+    def draw_parameter_text(self, painter, lines=None):
+        """绘制参数信息"""
+        painter.setPen(FILL_PALETTE.pen('text'))
+        for x, y, text in lines or self.parameter_text_lines():
+            painter.drawText(x, y, text)
+    
+    def draw_key_points(self, painter, geometry, left_control, right_control):
+        """绘制关键点标记 (用于调试)"""
+        # 梯形顶点
+        painter.setPen(FILL_PALETTE.pen('vertex', 2))
+        painter.setBrush(FILL_PALETTE.brush('vertex'))
+        painter.drawEllipse(geometry['top_left'], 4, 4)
+        painter.drawEllipse(geometry['top_right'], 4, 4)
+        painter.drawEllipse(geometry['bottom_left'], 4, 4)
+        painter.drawEllipse(geometry['bottom_right'], 4, 4)
+        
+        # 控制点
+        painter.setPen(FILL_PALETTE.pen('control', 2))
+        painter.setBrush(FILL_PALETTE.brush('control'))
+        painter.drawEllipse(left_control, 6, 6)
+        painter.drawEllipse(right_control, 6, 6)
+        
+        # 标注
+        painter.setPen(FILL_PALETTE.pen('text'))
+        painter.drawText(geometry['top_left'].x() - 30, geometry['top_left'].y() - 10, "上左")
+        painter.drawText(geometry['top_right'].x() + 10, geometry['top_right'].y() - 10, "上右")
+        painter.drawText(geometry['bottom_left'].x() - 30, geometry['bottom_left'].y() + 20, "下左")
+        painter.drawText(geometry['bottom_right'].x() + 10, geometry['bottom_right'].y() + 20, "下右")
+        painter.drawText(left_control.x() - 30, left_control.y() - 10, "左控制点")
+        painter.drawText(right_control.x() + 10, right_control.y() - 10, "右控制点")
+    
+    def render(self, painter, layers=None):
+        """绘制核心弯曲梯形 (painter由调用方创建和结束)
+        
+        Args:
+            painter: 已激活的QPainter
+            layers: 可选的LayerCache。给出时背景和参数文字从缓存的像素图绘制，
+                    只有梯形本身 (填充、腰线、关键点) 每帧重新绘制
+        """
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        
+        # 0. 绘制背景色
+        if layers is None:
+            self.draw_background(painter)
+        elif self.background_color is not None:
+            layers.draw_layer(painter, 'background', self.background_color, self.draw_background)
+        
+        # 1. 创建梯形几何
+        geometry = self.create_trapezoid_geometry()
+        
+        # 2. 绘制填充的弯曲梯形
+        self.draw_fill(painter, geometry)
+        
+        # 3. 绘制弯曲梯形的渐变腰线 (在填充之上)
+        left_control, right_control = self.draw_curved_trapezoid(painter, geometry)
+        
+        # 4. 绘制参数信息 (文字只随格式化后的参数值变化)
+        if self.show_parameter_text:
+            if layers is None:
+                self.draw_parameter_text(painter)
+            else:
+                lines = self.parameter_text_lines()
+                layers.draw_layer(painter, 'parameter_text', lines,
+                                  lambda layer_painter: self.draw_parameter_text(layer_painter, lines))
+        
+        # 5. 绘制关键点标记 (可选，用于调试；随几何移动，属于动态层)
+        if self.show_key_points:
+            self.draw_key_points(painter, geometry, left_control, right_control)
+
+
+def _renderer_property(name):
+    """把Widget属性转发到其CoreTrapezoidRenderer"""
+    return property(lambda self: getattr(self.renderer, name),
+                    lambda self, value: setattr(self.renderer, name, value))
+
+
+class CoreCurvedTrapezoidWidget(QWidget):
+    """核心弯曲梯形Widget - 使用3个核心参数"""
+    
+    top_offset = _renderer_property('top_offset')
+    position_ratio = _renderer_property('position_ratio')
+    curve_offset = _renderer_property('curve_offset')
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        
+        # 绘制逻辑与Widget分离，批量离屏渲染复用同一个渲染器
+        self.renderer = CoreTrapezoidRenderer()
+        
+        # 分层绘制: 背景与参数文字缓存为像素图，设为None则每帧全部重绘
+        self.layers = LayerCache()
+        
+        # 设置窗口
+        self.setFixedSize(700, 500)
+        self.setStyleSheet("background-color: #94D8F6;")
+    
+    def resizeEvent(self, event):
+        """同步渲染器尺寸"""
+        self.renderer.resize(self.width(), self.height())
+        super().resizeEvent(event)
+    
     def paintEvent(self, event):
         """绘制核心弯曲梯形"""
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing, True)
         
         try:
-            # 0. 绘制背景色
-            painter.fillRect(self.rect(), QColor("#BDC5D5"))
-            
-            # 1. 创建梯形几何
-            geometry = self.create_trapezoid_geometry()
-            
-            # 2. 绘制填充的弯曲梯形
-            filled_path = self.create_filled_trapezoid_path(geometry)
-            painter.setBrush(QColor("#CBD900"))  # 设置填充颜色
-            painter.setPen(Qt.NoPen)  # 不绘制边框
-            painter.drawPath(filled_path)
-            
-            # 3. 绘制弯曲梯形的渐变腰线 (在填充之上)
-            left_control, right_control = self.draw_curved_trapezoid(painter, geometry)
-            
-            # 4. 绘制参数信息
-            painter.setPen(QColor("#333333"))
-            painter.drawText(20, 30, "核心弯曲梯形 - 3参数控制 + 颜色填充")
-            painter.drawText(20, 50, "=" * 40)
-            
-            painter.drawText(20, 80, f"参数1 - 上底平移量: {self.top_offset:+.0f} 像素")
-            painter.drawText(20, 100, f"参数2 - 控制点位置比例: {self.position_ratio:.2f}")
-            painter.drawText(20, 120, f"参数3 - 横向偏移量: {self.curve_offset:+.0f} 像素")
-            
-            painter.drawText(20, 150, "填充颜色: #CBD900")
-            painter.drawText(20, 170, "渐变腰线特性:")
-            painter.drawText(20, 190, f"• 顶部: {GRADIENT_COLORS['top']} (完全透明)")
-            painter.drawText(20, 210, f"• 中间: {GRADIENT_COLORS['middle']} (50%透明)")
-            painter.drawText(20, 230, f"• 底部: {GRADIENT_COLORS['bottom']} (完全透明)")
-            
-            # 5. 绘制关键点标记 (可选，用于调试)
-            if True:  # 显示关键点
-                # 梯形顶点
-                painter.setPen(QPen(QColor("#FF0000"), 2))
-                painter.setBrush(QColor("#FF0000"))
-                painter.drawEllipse(geometry['top_left'], 4, 4)
-                painter.drawEllipse(geometry['top_right'], 4, 4)
-                painter.drawEllipse(geometry['bottom_left'], 4, 4)
-                painter.drawEllipse(geometry['bottom_right'], 4, 4)
-                
-                # 控制点
-                painter.setPen(QPen(QColor("#0000FF"), 2))
-                painter.setBrush(QColor("#0000FF"))
-                painter.drawEllipse(left_control, 6, 6)
-                painter.drawEllipse(right_control, 6, 6)
-                
-                # 标注
-                painter.setPen(QColor("#333333"))
-                painter.drawText(geometry['top_left'].x() - 30, geometry['top_left'].y() - 10, "上左")
-                painter.drawText(geometry['top_right'].x() + 10, geometry['top_right'].y() - 10, "上右")
-                painter.drawText(geometry['bottom_left'].x() - 30, geometry['bottom_left'].y() + 20, "下左")
-                painter.drawText(geometry['bottom_right'].x() + 10, geometry['bottom_right'].y() + 20, "下右")
-                painter.drawText(left_control.x() - 30, left_control.y() - 10, "左控制点")
-                painter.drawText(right_control.x() + 10, right_control.y() - 10, "右控制点")
-            
+            self.renderer.render(painter, self.layers)
         except Exception as e:
             print(f"绘图错误: {e}")
         finally:
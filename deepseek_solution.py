@@ -2,9 +2,11 @@ import sys
 import math
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, 
                                QVBoxLayout, QSlider, QLabel)
-from PySide6.QtCore import Qt, QPointF, QTimer
+from PySide6.QtCore import Qt, QPointF
 from PySide6.QtGui import QPainter, QPainterPath, QColor, QPen, QBrush
 
+from animation_engine import AnimationEngine
+
 class ARGuidanceWidget(QWidget):
     def __init__(self):
         super().__init__()
@@ -156,6 +158,18 @@ class ARGuidanceWidget(QWidget):
             painter.drawLine(left_lane_x, y, left_lane_x, y + 10)
             painter.drawLine(right_lane_x, y, right_lane_x, y + 10)
 
+# 演示相位速度 (弧度/秒) 与模拟步长 (秒)
+DEMO_PHASE_RATE = 0.2
+DEMO_TIME_STEP = 0.01
+
+
+def demo_state(phase):
+    """演示状态: (相位, 转向偏移量, 曲线强度)，正弦波模拟转向变化"""
+    turn_value = math.sin(phase)
+    curve_value = abs(math.sin(phase * 2)) * 0.8 + 0.2
+    return (phase, turn_value, curve_value)
+
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -174,11 +188,16 @@ class MainWindow(QMainWindow):
         # 控制面板
         self.setup_controls(layout)
         
-        # 自动演示定时器
-        self.demo_timer = QTimer()
-        self.demo_timer.timeout.connect(self.auto_demo)
-        self.demo_timer.start(50)  # 20 FPS
+        # 帧统计
+        self.stats_label = QLabel()
+        layout.addWidget(self.stats_label)
+        
+        # 自动演示: 固定步长动画引擎，按屏幕刷新率出帧，直接驱动AR Widget
         self.demo_progress = 0
+        self.demo_engine = AnimationEngine(demo_state(self.demo_progress), self.auto_demo,
+                                           self.present_demo, fixed_dt=DEMO_TIME_STEP)
+        self.demo_engine.stats_updated.connect(self.show_frame_stats)
+        self.demo_engine.start()
         
     def setup_controls(self, layout):
         """设置控制滑块"""
@@ -213,18 +232,33 @@ class MainWindow(QMainWindow):
         curve_value = self.curve_slider.value() / 100.0
         self.ar_widget.set_turn_parameters(turn_value, curve_value)
     
-    def auto_demo(self):
-        """自动演示"""
-        self.demo_progress += 0.01
-        if self.demo_progress > 2 * math.pi:
-            self.demo_progress = 0
-        
-        # 正弦波模拟转向变化
-        turn_value = math.sin(self.demo_progress)
-        curve_value = abs(math.sin(self.demo_progress * 2)) * 0.8 + 0.2
-        
-        self.turn_slider.setValue(int(turn_value * 100))
-        self.curve_slider.setValue(int(curve_value * 100))
+    def auto_demo(self, state, dt):
+        """自动演示的模拟步: 相位按时间推进 (与原先每50ms推进0.01的速度相同)"""
+        self.demo_progress = (state[0] + DEMO_PHASE_RATE * dt) % (2 * math.pi)
+        return demo_state(self.demo_progress)
+    
+    def present_demo(self, state):
+        """显示插值后的演示状态
+        
+        直接写入AR Widget；滑块只同步位置 (屏蔽信号)，不再经由valueChanged触发第二次重绘
+        """
+        _, turn_value, curve_value = state
+        self.ar_widget.set_turn_parameters(turn_value, curve_value)
+        
+        for slider, value in ((self.turn_slider, turn_value), (self.curve_slider, curve_value)):
+            position = int(value * 100)
+            if slider.value() != position:
+                blocked = slider.blockSignals(True)
+                slider.setValue(position)
+                slider.blockSignals(blocked)
+    
+    def show_frame_stats(self, stats):
+        """显示实际帧率和帧时间抖动"""
+        self.stats_label.setText(
+            f"帧率: {stats['fps']:.1f} / {stats['target_fps']:.0f} FPS    "
+            f"帧时间: {stats['frame_time_ms']:.2f} ms    抖动: {stats['jitter_ms']:.2f} ms    "
+            f"跳帧: {stats['skipped_frames']}")
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
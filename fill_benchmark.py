@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+填充方案性能基准
+在离屏QImage上渲染四种填充方案及解析式填充，按参数网格统计每帧延迟分位数和内存分配:
+方案1 (贝塞尔边界)、方案2 (subtracted)、方案3 (分段多边形)、方案4 (united + setClipPath)
+
+另可将NumPy扫描线光栅化 (scanline_raster.py) 的覆盖率掩码与QPainter填充到Alpha8图像的
+结果逐像素比较，并对比两者的耗时。QPainter填充曲线路径时按自身的容差展平腰线，
+因此另外与腰线按0.01像素展平为多边形后的QPainter填充 (接近精确面积) 比较
+
+用法:
+    python fill_benchmark.py                      # 默认网格，输出表格
+    python fill_benchmark.py --frames 50 --format jsonl --output results.jsonl
+    python fill_benchmark.py --scanline --subsamples 2   # 扫描线光栅化与QPainter对比
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+import tracemalloc
+
+import numpy as np
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import Qt, QPointF
+from PySide6.QtGui import QPainter, QColor, QImage, QPolygonF
+
+from analytic_fill import create_fill_path
+from bezier_batch import evaluate_quadratic, quadratic_segment_counts, uniform_t
+from scanline_raster import DEFAULT_SUBSAMPLES, rasterize_trapezoids
+from solution1_bezier_boundary import Solution1Widget
+from solution2_path_subtraction import Solution2Widget
+from solution3_segmented_fill import Solution3Widget
+from solution4_mask_fill import Solution4Widget
+from trapezoid_geometry import create_trapezoid_geometry, leg_control_polygons
+
+
+FILL_COLOR = "#CBD900"
+BACKGROUND_COLOR = "#BDC5D5"
+
+# 默认参数网格 (上底平移量与横向偏移量覆盖正负两种符号)
+DEFAULT_GRID = {
+    'top_offset': [-200, 0, 200],
+    'position_ratio': [0.2, 0.5, 0.8],
+    'curve_offset': [-150, -50, 0, 50, 150],
+    'size': [(700, 500), (1400, 1000)]
+}
+
+# 分配统计的采样帧数 (tracemalloc会显著拖慢渲染，因此与计时分开进行)
+ALLOCATION_FRAMES = 5
+
+
+def fill_analytic(painter, widget, geometry):
+    """解析式填充: 直接构造区域，一次drawPath"""
+    painter.setBrush(QColor(FILL_COLOR))
+    painter.setPen(Qt.NoPen)
+    painter.drawPath(create_fill_path(geometry, widget.position_ratio, widget.curve_offset))
+
+
+def fill_solution1(painter, widget, geometry):
+    """方案1: 贝塞尔曲线作为填充边界"""
+    painter.setBrush(QColor(FILL_COLOR))
+    painter.setPen(Qt.NoPen)
+    painter.drawPath(widget.create_bezier_boundary_fill_path(geometry))
+
+
+def fill_solution2(painter, widget, geometry):
+    """方案2: 完整梯形 subtracted() 左侧弓形"""
+    painter.setBrush(QColor(FILL_COLOR))
+    painter.setPen(Qt.NoPen)
+    painter.drawPath(widget.create_path_subtraction_fill(geometry))
+
+
+def fill_solution3(painter, widget, geometry):
+    """方案3: 分段多边形逐个填充"""
+    painter.setBrush(QColor(FILL_COLOR))
+    painter.setPen(Qt.NoPen)
+    for _, segment_polygon in widget.create_segmented_fill_paths(geometry):
+        painter.drawPolygon(segment_polygon)
+
+
+def fill_solution4(painter, widget, geometry):
+    """方案4: united() 生成掩码后 setClipPath 填充边界矩形"""
+    widget.create_mask_fill_with_clipping(painter, geometry)
+
+
+# 方案名称 → (填充函数, 提供几何与参数的Widget类)
+STRATEGIES = {
+    'analytic': (fill_analytic, Solution4Widget),
+    'solution1_bezier_boundary': (fill_solution1, Solution1Widget),
+    'solution2_subtracted': (fill_solution2, Solution2Widget),
+    'solution3_segmented': (fill_solution3, Solution3Widget),
+    'solution4_united_clip': (fill_solution4, Solution4Widget)
+}
+
+
+def render_frame(fill, widget, image, background):
+    """渲染一帧: 清背景、重新构建几何并填充"""
+    image.fill(background)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing, True)
+    fill(painter, widget, widget.create_trapezoid_geometry())
+    painter.end()
+
+
+def time_strategy(fill, widget, image, frames, warmup=3):
+    """逐帧计时，返回每帧耗时列表 (秒)"""
+    background = QColor(BACKGROUND_COLOR)
+    for _ in range(warmup):
+        render_frame(fill, widget, image, background)
+
+    timings = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        render_frame(fill, widget, image, background)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def measure_allocations(fill, widget, image, frames=ALLOCATION_FRAMES):
+    """统计每帧Python侧的临时内存分配
+
+    Returns:
+        float: 每帧分配峰值 (字节) 的中位数
+    """
+    background = QColor(BACKGROUND_COLOR)
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(frames):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            render_frame(fill, widget, image, background)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - baseline)
+    finally:
+        tracemalloc.stop()
+    return percentile(peaks, 50)
+
+
+def percentile(values, q):
+    """线性插值分位数 (q为0-100)"""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def iter_cases(grid):
+    """遍历参数网格，生成 (上底平移量, 位置比例, 横向偏移量, (宽, 高))"""
+    return itertools.product(grid['top_offset'], grid['position_ratio'],
+                             grid['curve_offset'], grid['size'])
+
+
+def run_benchmark(grid=None, strategies=None, frames=100, allocations=True):
+    """按参数网格测量所有方案
+
+    Yields:
+        dict: 每个 (方案, 参数组合) 一条结果记录
+    """
+    grid = grid or DEFAULT_GRID
+    strategies = strategies or list(STRATEGIES)
+    widgets = {STRATEGIES[name][1]: STRATEGIES[name][1]() for name in strategies}
+    images = {}
+
+    for top_offset, position_ratio, curve_offset, (width, height) in iter_cases(grid):
+        if (width, height) not in images:
+            images[(width, height)] = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+        image = images[(width, height)]
+
+        for widget in widgets.values():
+            widget.setFixedSize(width, height)
+            widget.top_offset = top_offset
+            widget.position_ratio = position_ratio
+            widget.curve_offset = curve_offset
+
+        for name in strategies:
+            fill, widget_class = STRATEGIES[name]
+            widget = widgets[widget_class]
+            timings = time_strategy(fill, widget, image, frames)
+            record = {
+                'strategy': name,
+                'width': width,
+                'height': height,
+                'top_offset': top_offset,
+                'position_ratio': position_ratio,
+                'curve_offset': curve_offset,
+                'frames': frames,
+                'mean_us': sum(timings) / len(timings) * 1e6,
+                'p50_us': percentile(timings, 50) * 1e6,
+                'p90_us': percentile(timings, 90) * 1e6,
+                'p99_us': percentile(timings, 99) * 1e6,
+                'max_us': max(timings) * 1e6
+            }
+            if allocations:
+                record['alloc_peak_bytes'] = measure_allocations(fill, widget, image)
+            yield record
+
+
+def alpha8_array(image):
+    """Alpha8图像像素的NumPy视图 (去掉行尾填充)"""
+    rows = np.frombuffer(image.constBits(), dtype=np.uint8).reshape(
+        image.height(), image.bytesPerLine())
+    return rows[:, :image.width()]
+
+
+def flattened_trapezoid_polygon(geometry, tolerance=0.01):
+    """把第一个梯形的两条腰线按给定容差 (像素) 展平后围成的多边形
+
+    左腰线从上底到下底，右腰线反向回到上底，与 create_fill_path 围成同一区域
+    """
+    legs = leg_control_polygons(geometry)[0]
+    points = [evaluate_quadratic(leg[None], uniform_t(int(count)))[0]
+              for leg, count in zip(legs, quadratic_segment_counts(legs, tolerance))]
+    outline = np.concatenate([points[0], points[1][::-1]])
+    return QPolygonF([QPointF(x, y) for x, y in outline.tolist()])
+
+
+def run_scanline_comparison(grid=None, frames=100, subsamples=DEFAULT_SUBSAMPLES):
+    """按参数网格比较扫描线光栅化与QPainter抗锯齿填充的覆盖率掩码和耗时
+
+    Yields:
+        dict: 每个参数组合一条结果记录，误差以0-255的alpha值计
+    """
+    grid = grid or DEFAULT_GRID
+    widget = Solution4Widget()
+    white = QColor(255, 255, 255)
+
+    for top_offset, position_ratio, curve_offset, (width, height) in iter_cases(grid):
+        widget.setFixedSize(width, height)
+        widget.top_offset = top_offset
+        widget.position_ratio = position_ratio
+        widget.curve_offset = curve_offset
+        image = QImage(width, height, QImage.Format_Alpha8)
+        flattened = QImage(width, height, QImage.Format_Alpha8)
+        buffer = np.zeros((height, width), dtype=np.uint8)
+
+        def paint():
+            image.fill(0)
+            painter = QPainter(image)
+            painter.setRenderHint(QPainter.Antialiasing, True)
+            painter.setBrush(white)
+            painter.setPen(Qt.NoPen)
+            painter.drawPath(create_fill_path(widget.create_trapezoid_geometry(),
+                                              position_ratio, curve_offset))
+            painter.end()
+
+        def trapezoid_geometry():
+            return create_trapezoid_geometry(
+                top_offset, position_ratio, curve_offset, width, height,
+                widget.trapezoid_height, widget.trapezoid_top_width,
+                widget.trapezoid_bottom_width, num_points=None)
+
+        def rasterize():
+            buffer.fill(0)
+            rasterize_trapezoids(trapezoid_geometry(), buffer, subsamples)
+
+        timings = {}
+        for name, render in (('qpainter', paint), ('scanline', rasterize)):
+            render()
+            samples = []
+            for _ in range(frames):
+                start = time.perf_counter()
+                render()
+                samples.append(time.perf_counter() - start)
+            timings[name] = samples
+
+        # 参考: 腰线精细展平后的多边形
+        flattened.fill(0)
+        painter = QPainter(flattened)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setBrush(white)
+        painter.setPen(Qt.NoPen)
+        painter.drawPolygon(flattened_trapezoid_polygon(trapezoid_geometry()))
+        painter.end()
+
+        error = np.abs(buffer.astype(np.int16) - alpha8_array(image))
+        flattened_error = np.abs(buffer.astype(np.int16) - alpha8_array(flattened))
+        yield {
+            'strategy': 'scanline_vs_qpainter',
+            'width': width,
+            'height': height,
+            'top_offset': top_offset,
+            'position_ratio': position_ratio,
+            'curve_offset': curve_offset,
+            'frames': frames,
+            'subsamples': subsamples,
+            'qpainter_p50_us': percentile(timings['qpainter'], 50) * 1e6,
+            'scanline_p50_us': percentile(timings['scanline'], 50) * 1e6,
+            'max_abs_error': int(error.max()),
+            'mean_abs_error': float(error.mean()),
+            'pixels_over_8': int(np.count_nonzero(error > 8)),
+            'flattened_max_abs_error': int(flattened_error.max())
+        }
+
+
+def print_scanline_comparison(records, stream=sys.stdout):
+    """打印扫描线光栅化与QPainter的逐组合对比"""
+    print(f"{'尺寸':>10} {'平移':>6} {'比例':>5} {'偏移':>6} {'QPainter(us)':>13} "
+          f"{'扫描线(us)':>11} {'最大误差':>8} {'平均误差':>8} {'>8像素':>7} {'展平最大误差':>12}",
+          file=stream)
+    print("=" * 99, file=stream)
+    for record in records:
+        print(f"{record['width']:>5}x{record['height']:<4} {record['top_offset']:>6.0f} "
+              f"{record['position_ratio']:>5.2f} {record['curve_offset']:>6.0f} "
+              f"{record['qpainter_p50_us']:>13.1f} {record['scanline_p50_us']:>11.1f} "
+              f"{record['max_abs_error']:>8} {record['mean_abs_error']:>8.4f} "
+              f"{record['pixels_over_8']:>7} {record['flattened_max_abs_error']:>12}", file=stream)
+
+
+def summarize(records):
+    """按方案汇总: 所有参数组合的p50中位数与p99最大值"""
+    by_strategy = {}
+    for record in records:
+        by_strategy.setdefault(record['strategy'], []).append(record)
+
+    summary = {}
+    for name, rows in by_strategy.items():
+        summary[name] = {
+            'cases': len(rows),
+            'p50_us': percentile([row['p50_us'] for row in rows], 50),
+            'p99_us': max(row['p99_us'] for row in rows),
+            'alloc_peak_bytes': percentile([row.get('alloc_peak_bytes', 0) for row in rows], 50)
+        }
+    return summary
+
+
+def print_summary(summary, stream=sys.stdout):
+    """打印汇总表，按p50从快到慢排序"""
+    fastest = min(row['p50_us'] for row in summary.values())
+    print(f"{'方案':<28} {'组合数':>6} {'p50(us)':>10} {'p99max(us)':>12} {'分配(B)':>10} {'相对':>6}",
+          file=stream)
+    print("=" * 78, file=stream)
+    for name, row in sorted(summary.items(), key=lambda item: item[1]['p50_us']):
+        print(f"{name:<28} {row['cases']:>6} {row['p50_us']:>10.1f} {row['p99_us']:>12.1f} "
+              f"{row['alloc_peak_bytes']:>10.0f} {row['p50_us'] / fastest:>5.1f}x", file=stream)
+
+
+def parse_arguments(argv):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="弯曲梯形填充方案基准测试")
+    parser.add_argument('--frames', type=int, default=100, help="每个参数组合的计时帧数")
+    parser.add_argument('--strategies', nargs='+', choices=list(STRATEGIES),
+                        default=list(STRATEGIES), help="参与对比的方案")
+    parser.add_argument('--top-offsets', type=float, nargs='+',
+                        default=DEFAULT_GRID['top_offset'])
+    parser.add_argument('--position-ratios', type=float, nargs='+',
+                        default=DEFAULT_GRID['position_ratio'])
+    parser.add_argument('--curve-offsets', type=float, nargs='+',
+                        default=DEFAULT_GRID['curve_offset'])
+    parser.add_argument('--sizes', nargs='+', default=[f"{w}x{h}" for w, h in DEFAULT_GRID['size']],
+                        help="图像尺寸，如 700x500")
+    parser.add_argument('--no-allocations', action='store_true', help="跳过内存分配统计")
+    parser.add_argument('--scanline', action='store_true',
+                        help="改为比较扫描线光栅化与QPainter的覆盖率掩码和耗时")
+    parser.add_argument('--subsamples', type=int, default=DEFAULT_SUBSAMPLES,
+                        help="扫描线光栅化每行的条带数量")
+    parser.add_argument('--format', choices=['table', 'json', 'jsonl'], default='table')
+    parser.add_argument('--output', help="结果输出文件 (默认标准输出)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """应用程序入口点"""
+    args = parse_arguments(sys.argv[1:] if argv is None else argv)
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    grid = {
+        'top_offset': args.top_offsets,
+        'position_ratio': args.position_ratios,
+        'curve_offset': args.curve_offsets,
+        'size': [tuple(int(v) for v in size.lower().split('x')) for size in args.sizes]
+    }
+
+    stream = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        if args.scanline:
+            records = list(run_scanline_comparison(grid, args.frames, args.subsamples))
+            if args.format == 'table':
+                print_scanline_comparison(records, stream)
+            elif args.format == 'json':
+                json.dump({'results': records}, stream, indent=2)
+                stream.write("\n")
+            else:
+                for record in records:
+                    stream.write(json.dumps(record) + "\n")
+            return app
+
+        records = []
+        for record in run_benchmark(grid, args.strategies, args.frames,
+                                    allocations=not args.no_allocations):
+            records.append(record)
+            if args.format == 'jsonl':
+                stream.write(json.dumps(record) + "\n")
+                stream.flush()
+
+        summary = summarize(records)
+        if args.format == 'json':
+            json.dump({'results': records, 'summary': summary}, stream, indent=2)
+            stream.write("\n")
+        elif args.format == 'table':
+            print(f"离屏渲染每帧耗时 (抗锯齿, 每组合{args.frames}帧)", file=stream)
+            print_summary(summary, stream)
+        else:
+            print_summary(summary, sys.stderr)
+    finally:
+        if args.output:
+            stream.close()
+
+    return app
+
+
+if __name__ == "__main__":
+    main()
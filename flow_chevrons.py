@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+沿腰线流动的方向箭头 (V形)
+箭头形状预先按若干旋转角度绘制到一张精灵图集中，每帧只需按弧长位置计算
+每个箭头的中心和朝向，再从图集中贴出对应角度的小图，不再为每个箭头构建和描边路径
+"""
+
+import time
+
+import numpy as np
+from PySide6.QtCore import Qt, QPointF, QRectF
+from PySide6.QtGui import QPainter, QPixmap
+
+from arc_length import DEFAULT_ARC_LENGTH_CACHE, quadratic_derivative
+from bezier_batch import evaluate_quadratic
+from palette import get_palette
+
+
+# 箭头颜色
+CHEVRON_PALETTE = get_palette('ship')
+
+# 预绘制的旋转角度数量 (朝向误差不超过 180° / 数量)
+DEFAULT_ROTATIONS = 32
+
+
+class ChevronAtlas:
+    """V形箭头的精灵图集
+
+    所有旋转角度的箭头排成一行，第k格为箭头朝 +x 方向顺时针旋转 k × 360° / rotations 后的图像。
+    图集按设备像素绘制，贴图时按 1 / 设备像素比缩放，在高分屏上保持清晰
+    """
+
+    def __init__(self, size=14, rotations=DEFAULT_ROTATIONS, color=None, line_width=2.0,
+                 device_pixel_ratio=1.0):
+        """
+        Args:
+            size: 每格的逻辑边长 (像素)
+            rotations: 旋转角度数量
+            color: 箭头颜色，None表示使用船舶主题的 'chevron' 颜色
+            line_width: 箭头线宽 (逻辑像素)
+            device_pixel_ratio: 目标设备的像素比
+        """
+        self.size = size
+        self.rotations = rotations
+        self.device_pixel_ratio = device_pixel_ratio
+        self.cell = int(np.ceil(size * device_pixel_ratio))
+
+        pen = CHEVRON_PALETTE.pen('chevron', line_width)
+        if color is not None:
+            pen.setColor(color)
+        pen.setCapStyle(Qt.RoundCap)
+        pen.setJoinStyle(Qt.RoundJoin)
+
+        # 箭头尖端指向 +x，高度约为每格边长的 60%
+        half = size * 0.3
+        shape = [QPointF(-half * 0.6, -half), QPointF(half * 0.6, 0), QPointF(-half * 0.6, half)]
+
+        self.pixmap = QPixmap(self.cell * rotations, self.cell)
+        self.pixmap.fill(Qt.transparent)
+        painter = QPainter(self.pixmap)
+        try:
+            painter.setRenderHint(QPainter.Antialiasing, True)
+            painter.setPen(pen)
+            for index in range(rotations):
+                painter.save()
+                painter.translate((index + 0.5) * self.cell, 0.5 * self.cell)
+                painter.scale(device_pixel_ratio, device_pixel_ratio)
+                painter.rotate(index * 360.0 / rotations)
+                painter.drawPolyline(shape)
+                painter.restore()
+        finally:
+            painter.end()
+
+    def rotation_index(self, angles):
+        """朝向角 (弧度，屏幕坐标系中从 +x 顺时针) 对应的格子序号"""
+        steps = np.rint(np.asarray(angles) * self.rotations / (2 * np.pi)).astype(np.intp)
+        return np.mod(steps, self.rotations)
+
+    def source_rect(self, index):
+        """第index格在图集中的源矩形 (设备像素)"""
+        return QRectF(index * self.cell, 0, self.cell, self.cell)
+
+
+class ChevronFlow:
+    """沿多条二次腰线匀速流动的箭头
+
+    箭头从曲线终点 (船位) 向起点移动，相邻箭头沿弧长间隔 spacing，
+    在两端 spacing 长度内淡入淡出
+    """
+
+    def __init__(self, spacing=24.0, speed=40.0, size=14, rotations=DEFAULT_ROTATIONS,
+                 cache=DEFAULT_ARC_LENGTH_CACHE):
+        """
+        Args:
+            spacing: 相邻箭头的弧长间隔 (像素)
+            speed: 流动速度 (像素/秒)
+            size: 箭头逻辑尺寸 (像素)
+            rotations: 图集的旋转角度数量
+            cache: 弧长表缓存
+        """
+        self.spacing = spacing
+        self.speed = speed
+        self.size = size
+        self.rotations = rotations
+        self.cache = cache
+        self.atlas = None
+        self._started = time.perf_counter()
+
+    def elapsed(self):
+        """自创建起经过的秒数 (流动动画的时钟)"""
+        return time.perf_counter() - self._started
+
+    def atlas_for(self, device_pixel_ratio):
+        """获取与设备像素比匹配的图集，像素比变化时重新绘制"""
+        if self.atlas is None or self.atlas.device_pixel_ratio != device_pixel_ratio:
+            self.atlas = ChevronAtlas(self.size, self.rotations,
+                                      device_pixel_ratio=device_pixel_ratio)
+        return self.atlas
+
+    def instances(self, curves, seconds):
+        """计算某一时刻所有箭头的位置、朝向和不透明度
+
+        Args:
+            curves: (N, 3, 2) 控制点 [起点, 控制点, 终点]
+            seconds: 动画时刻 (秒)
+
+        Returns:
+            tuple: (points, angles, opacities)，均为展平后的可见箭头
+                points: (K, 2) 箭头中心
+                angles: (K,) 朝向角 (弧度，指向曲线起点方向)
+                opacities: (K,) 0.0-1.0
+        """
+        table = self.cache.table(curves)
+        total = table.total[:, None]
+        count = int(np.ceil(total.max(initial=0.0) / self.spacing)) + 1
+
+        # 距终点的弧长: 相位随时间增长，每个箭头间隔 spacing
+        phase = (seconds * self.speed) % self.spacing
+        travelled = phase + self.spacing * np.arange(count)[None, :]
+        visible = travelled <= total
+        fade = np.minimum(travelled, total - travelled) / self.spacing
+
+        t = table.t_at_length(np.maximum(total - travelled, 0.0))
+        points = evaluate_quadratic(table.curves, t)
+        direction = -quadratic_derivative(table.curves, t)
+        angles = np.arctan2(direction[..., 1], direction[..., 0])
+        return points[visible], angles[visible], np.clip(fade[visible], 0.0, 1.0)
+
+    def draw(self, painter, curves, seconds=None):
+        """绘制所有箭头
+
+        Args:
+            painter: 活动的QPainter
+            curves: (N, 3, 2) 控制点
+            seconds: 动画时刻，None表示使用内部时钟
+        """
+        if seconds is None:
+            seconds = self.elapsed()
+        atlas = self.atlas_for(painter.device().devicePixelRatio())
+        points, angles, opacities = self.instances(curves, seconds)
+
+        scale = 1.0 / atlas.device_pixel_ratio
+        indices = atlas.rotation_index(angles).tolist()
+        for (x, y), index, opacity in zip(points.tolist(), indices, opacities.tolist()):
+            fragment = QPainter.PixmapFragment.create(QPointF(x, y), atlas.source_rect(index),
+                                                      scale, scale, 0.0, opacity)
+            painter.drawPixmapFragments(fragment, 1, atlas.pixmap)
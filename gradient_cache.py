@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+渐变对象缓存
+按颜色停止点和量化后的端点复用QLinearGradient，静态或缓慢变化的画面不再每帧创建渐变和QColor
+"""
+
+from PySide6.QtCore import QPointF
+from PySide6.QtGui import QLinearGradient, QColor
+
+from lru_cache import LRUCache
+
+
+class GradientCache(LRUCache):
+    """QLinearGradient的LRU缓存
+
+    静态或缓慢变化的画面每帧命中同一个渐变，不再重复创建QLinearGradient和QColor。
+    缓存键 = (颜色停止点, 量化后的起点和终点)。渐变总是用量化后的端点创建，
+    因此无论是否命中，相同输入得到的渐变完全一致。
+    返回的渐变对象被多个调用方共享，调用方不应修改它。
+    """
+
+    def __init__(self, max_size=256, quantum=0.5):
+        """
+        Args:
+            max_size: 最多缓存的渐变数量，超出时淘汰最久未使用的
+            quantum: 端点量化步长 (像素)
+        """
+        super().__init__(max_size)
+        self.quantum = quantum
+
+    def _quantize(self, value):
+        return round(value / self.quantum) * self.quantum
+
+    def linear_gradient(self, start_point, end_point, stops):
+        """获取沿 start_point → end_point 的线性渐变
+
+        Args:
+            start_point, end_point: QPointF端点
+            stops: 可哈希的停止点序列，每项为 (位置, RGBA) (见palette.Palette.gradient_stops)，
+                   或 (位置, QColor可接受的颜色值, 透明度)
+
+        Returns:
+            QLinearGradient: 共享的渐变对象
+        """
+        key = (stops,
+               self._quantize(start_point.x()), self._quantize(start_point.y()),
+               self._quantize(end_point.x()), self._quantize(end_point.y()))
+
+        gradient = self._get(key)
+        if gradient is not None:
+            return gradient
+
+        gradient = QLinearGradient(QPointF(key[1], key[2]), QPointF(key[3], key[4]))
+        for stop in stops:
+            if len(stop) == 2:
+                position, rgba = stop
+                stop_color = QColor(*rgba)
+            else:
+                position, color, alpha = stop
+                stop_color = QColor(color)
+                stop_color.setAlpha(alpha)
+            gradient.setColorAt(position, stop_color)
+
+        self._put(key, gradient)
+        return gradient
+
+
+# 所有Widget共享的默认缓存
+DEFAULT_GRADIENT_CACHE = GradientCache()
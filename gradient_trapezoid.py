@@ -11,6 +11,9 @@ from PySide6.QtCore import Qt
 from PySide6.QtGui import QPainter, QLinearGradient, QPen, QPolygonF, QColor, QPainterPath
 from PySide6.QtCore import QPointF
 
+from gradient_cache import DEFAULT_GRADIENT_CACHE
+from palette import get_palette
+
 
 # 颜色定义
 COLORS = {
@@ -20,6 +23,9 @@ COLORS = {
     'outline': '#B7B286'   # 轮廓颜色
 }
 
+# 腰线渐变停止点 (主题只解析一次)
+LEG_GRADIENT_STOPS = get_palette('leg_gradient').gradient_stops()
+
 # 尺寸参数
 DIMENSIONS = {
     'height': 300,
@@ -209,27 +215,7 @@ class TrapezoidWidget(QWidget):
         Returns:
             QLinearGradient: 沿腰线方向的渐变
         """
-        # 对于曲线路径，我们仍然使用起点到终点的线性渐变
-        # 这样渐变会沿着曲线的整体方向分布
-        gradient = QLinearGradient(start_point, end_point)
-        
-        # 设置渐变颜色点
-        # 起点（上端）：#B6B384，完全透明（alpha=0）
-        top_color = QColor(COLORS['top'])
-        top_color.setAlpha(0)  # 完全透明
-        gradient.setColorAt(0.0, top_color)
-        
-        # 中间（50%）：#FEFFAF，50%透明（alpha=127）
-        middle_color = QColor(COLORS['middle'])
-        middle_color.setAlpha(127)  # 50%透明
-        gradient.setColorAt(0.5, middle_color)
-        
-        # 终点（下端）：#B7B286，完全透明（alpha=0）
-        bottom_color = QColor(COLORS['bottom'])
-        bottom_color.setAlpha(0)  # 完全透明
-        gradient.setColorAt(1.0, bottom_color)
-        
-        return gradient
+        return DEFAULT_GRADIENT_CACHE.linear_gradient(start_point, end_point, LEG_GRADIENT_STOPS)
     
     def _draw_trapezoid_outline(self, painter, geometry):
         """绘制弯曲梯形轮廓线（只绘制左右两条腰边，带渐变效果）
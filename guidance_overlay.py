@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多目标引导叠加层
+交通态势显示中为每个跟踪目标绘制一个转向梯形 (可达数千个)。
+所有目标的几何一次以NumPy数组计算，视口外的目标先按腰线的精确包围盒剔除，
+同一紧急程度档位的目标合并为一条QPainterPath，每帧只需每档一次drawPath
+"""
+
+import sys
+import time
+import numpy as np
+from PySide6.QtWidgets import QApplication, QWidget
+from PySide6.QtCore import QRectF, QTimer
+from PySide6.QtGui import QPainter
+
+from palette import get_palette, qcolor
+from path_batch import CURVE_DATA, CURVE_TO, LINE_TO, MOVE_TO, path_from_elements
+from trapezoid_geometry import create_trapezoid_geometry, leg_bounds, leg_control_polygons
+from turn_table import URGENCY_THRESHOLDS
+
+
+# 档位 → 主题 (顺序与 turn_table.urgency_band 的档位编号一致)
+OVERLAY_BANDS = ('steering_gentle', 'steering_moderate', 'steering_hard')
+
+# 每个目标的路径元素: 上底右端 → 右腰 → 下底 → 左腰 → 回到起点 (闭合子路径，
+# 与closeSubpath()生成的元素相同)。二次腰线按三次曲线写入 (CurveToElement + 两个CurveToDataElement)
+PATH_ELEMENT_TYPES = np.array([MOVE_TO,
+                               CURVE_TO, CURVE_DATA, CURVE_DATA,
+                               LINE_TO,
+                               CURVE_TO, CURVE_DATA, CURVE_DATA,
+                               LINE_TO], dtype='>i4')
+
+
+def urgency_bands(urgency):
+    """紧急程度 (0.0-1.0，即 |舵角| / 30°) 对应的档位数组"""
+    return np.searchsorted(URGENCY_THRESHOLDS, np.abs(urgency), side='right')
+
+
+class GuidanceOverlayRenderer:
+    """批量绘制多个目标的转向梯形
+
+    梯形在目标的局部坐标中以下底中心为锚点、向前 (画面上方) 延伸，
+    再按每个目标的缩放、航向 (从正上方顺时针，弧度) 和位置变换到画面坐标。
+    几何在 set_targets 时计算；视口与目标不变时复用上一次构建的路径。
+    """
+
+    def __init__(self, trapezoid_height=60.0, top_width=6.0, bottom_width=40.0,
+                 outline_width=1.0):
+        self.trapezoid_height = trapezoid_height
+        self.top_width = top_width
+        self.bottom_width = bottom_width
+        self.outline_width = outline_width
+
+        self.palettes = [get_palette(name) for name in OVERLAY_BANDS]
+        self._elements = np.empty((0, len(PATH_ELEMENT_TYPES), 2))
+        self._bounds = np.empty((0, 4))
+        self._bands = np.empty(0, dtype=np.intp)
+        self._paths = None
+        self._paths_viewport = None
+
+        # 最近一帧的统计
+        self.drawn = 0
+        self.culled = 0
+
+    def set_targets(self, positions, top_offset, curve_offset=0.0, position_ratio=0.5,
+                    urgency=0.0, heading=0.0, scale=1.0):
+        """设置全部目标 (参数为标量或长度N的数组，按NumPy规则广播)
+
+        Args:
+            positions: (N, 2) 目标在画面中的位置 (梯形下底中心)
+            top_offset: 上底平移量 (像素，未缩放)
+            curve_offset: 腰线弯曲偏移 (像素，未缩放)
+            position_ratio: 控制点位置比例 (0.0-1.0)
+            urgency: 紧急程度 (0.0-1.0)，决定颜色档位
+            heading: 航向 (弧度，从正上方顺时针)
+            scale: 缩放倍数
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        count = len(positions)
+        top_offset, curve_offset, position_ratio, urgency, heading, scale = (
+            np.broadcast_to(np.asarray(value, dtype=np.float64), (count,))
+            for value in (top_offset, curve_offset, position_ratio, urgency, heading, scale))
+
+        # 局部坐标: 下底中心为原点 (width=0, height=-梯形高度 → 下底 y=0，上底 y=-高度)
+        geometry = create_trapezoid_geometry(
+            top_offset, position_ratio, curve_offset, width=0.0,
+            height=-self.trapezoid_height, trapezoid_height=self.trapezoid_height,
+            top_width=self.top_width, bottom_width=self.bottom_width, num_points=None)
+        # 路径元素与二次腰线控制点一起变换 (仿射变换下贝塞尔曲线的控制点关系不变)
+        local = np.concatenate([self.local_elements(geometry),
+                                leg_control_polygons(geometry).reshape(count, 6, 2)], axis=1)
+
+        # 缩放、旋转、平移
+        cos, sin = np.cos(heading)[:, None], np.sin(heading)[:, None]
+        x = local[..., 0] * scale[:, None]
+        y = local[..., 1] * scale[:, None]
+        world = np.empty_like(local)
+        world[..., 0] = x * cos - y * sin + positions[:, None, 0]
+        world[..., 1] = x * sin + y * cos + positions[:, None, 1]
+
+        elements_count = len(PATH_ELEMENT_TYPES)
+        self._elements = world[:, :elements_count]
+        # 剔除使用腰线的精确包围盒
+        self._bounds = leg_bounds(world[:, elements_count:].reshape(count, 2, 3, 2))
+        self._bands = urgency_bands(urgency)
+        self._paths = None
+
+    @staticmethod
+    def local_elements(geometry):
+        """把几何字典转换为每个目标的路径元素坐标 (N, 9, 2)，二次腰线升阶为三次"""
+        top_left, top_right = geometry['top_left'], geometry['top_right']
+        bottom_left, bottom_right = geometry['bottom_left'], geometry['bottom_right']
+        left_control, right_control = geometry['left_control'], geometry['right_control']
+        return np.stack([
+            top_right,
+            top_right + (right_control - top_right) * (2 / 3),
+            bottom_right + (right_control - bottom_right) * (2 / 3),
+            bottom_right,
+            bottom_left,
+            bottom_left + (left_control - bottom_left) * (2 / 3),
+            top_left + (left_control - top_left) * (2 / 3),
+            top_left,
+            top_right
+        ], axis=1)
+
+    def target_count(self):
+        return len(self._elements)
+
+    def visible(self, viewport):
+        """与视口相交的目标掩码 (包围盒按轮廓线宽外扩)"""
+        margin = self.outline_width / 2
+        left, top, right, bottom = self._bounds.T
+        return ((right + margin >= viewport.left()) & (left - margin <= viewport.right())
+                & (bottom + margin >= viewport.top()) & (top - margin <= viewport.bottom()))
+
+    def band_paths(self, viewport=None):
+        """每个档位一条路径 (只包含可见目标)
+
+        Returns:
+            list: [(档位, QPainterPath)]，跳过没有可见目标的档位
+        """
+        key = None if viewport is None else QRectF(viewport).getCoords()
+        if self._paths is not None and self._paths_viewport == key:
+            return self._paths
+
+        mask = (np.ones(len(self._elements), dtype=bool) if viewport is None
+                else self.visible(viewport))
+        self.drawn = int(np.count_nonzero(mask))
+        self.culled = len(mask) - self.drawn
+
+        paths = []
+        for band in range(len(OVERLAY_BANDS)):
+            selected = self._elements[mask & (self._bands == band)]
+            if len(selected):
+                types = np.tile(PATH_ELEMENT_TYPES, len(selected))
+                paths.append((band, path_from_elements(selected.reshape(-1, 2), types)))
+
+        self._paths = paths
+        self._paths_viewport = key
+        return paths
+
+    def render(self, painter, viewport=None):
+        """绘制所有可见目标: 每个档位一次填充、一次描边
+
+        抗锯齿光栅化单条包含大量子路径的路径时开销远高于逐个绘制，
+        因此填充不开抗锯齿，由抗锯齿的轮廓线覆盖填充边缘；没有轮廓线时才抗锯齿填充
+        """
+        outlined = self.outline_width > 0
+        painter.save()
+        for band, path in self.band_paths(viewport):
+            palette = self.palettes[band]
+            painter.setRenderHint(QPainter.Antialiasing, not outlined)
+            painter.fillPath(path, palette.brush('top'))
+            if outlined:
+                painter.setRenderHint(QPainter.Antialiasing)
+                painter.strokePath(path, palette.pen('middle', self.outline_width))
+        painter.restore()
+
+
+class GuidanceOverlayWidget(QWidget):
+    """交通态势演示: 随机目标缓慢移动并转向"""
+
+    def __init__(self, count=2000, seed=0):
+        super().__init__()
+        self.setMinimumSize(900, 700)
+        self.setWindowTitle(f"多目标引导叠加层 - {count}个目标")
+        self.background_color = "#1A2A3A"
+
+        self.overlay = GuidanceOverlayRenderer()
+        rng = np.random.default_rng(seed)
+        # 目标散布在比窗口更大的区域内，部分目标需要剔除
+        self.positions = rng.uniform([-200, -200], [1400, 1100], size=(count, 2))
+        self.headings = rng.uniform(0, 2 * np.pi, count)
+        self.rudders = rng.uniform(-30, 30, count)
+        self.speeds = rng.uniform(5, 25, count)
+        self.scales = rng.uniform(0.4, 1.0, count)
+        self.frame_time_ms = 0.0
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.advance)
+        self.timer.start(16)
+        self.update_targets()
+
+    def update_targets(self):
+        angle = self.rudders / 30.0
+        self.overlay.set_targets(self.positions, angle * 20, angle * 10, 0.5,
+                                 np.abs(angle), self.headings, self.scales)
+
+    def advance(self):
+        dt = 0.016
+        self.headings += np.radians(self.rudders) * 0.05 * dt
+        forward = np.stack([np.sin(self.headings), -np.cos(self.headings)], axis=1)
+        self.positions += forward * self.speeds[:, None] * dt
+        self.update_targets()
+        self.update()
+
+    def paintEvent(self, event):
+        start = time.perf_counter()
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), qcolor(self.background_color))
+        self.overlay.render(painter, QRectF(self.rect()))
+
+        painter.setPen(get_palette('ship').color('text'))
+        painter.drawText(10, 20, f"绘制: {self.overlay.drawn}  剔除: {self.overlay.culled}  "
+                                 f"上一帧: {self.frame_time_ms:.1f} ms")
+        painter.end()
+        self.frame_time_ms = (time.perf_counter() - start) * 1000
+
+
+def main():
+    """应用程序入口点"""
+    app = QApplication(sys.argv)
+    widget = GuidanceOverlayWidget(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
+    widget.show()
+    sys.exit(app.exec())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+输入合并与限速
+滑块或传感器总线以每秒数百次的频率推送参数时，每个参数只保留最新值，
+最多按显示器刷新率 (或配置的最大频率) 向界面提交一次，避免每个样本都触发重绘和标签更新
+"""
+
+import time
+
+from PySide6.QtCore import QObject, QTimer, Qt, Signal
+from PySide6.QtGui import QGuiApplication
+
+
+# 无法获取屏幕刷新率时使用的默认提交频率 (Hz)
+DEFAULT_MAX_RATE = 60.0
+
+
+def display_refresh_rate():
+    """主屏幕刷新率 (Hz)，无屏幕时返回默认值"""
+    app = QGuiApplication.instance()
+    screen = app.primaryScreen() if app is not None else None
+    if screen is None or screen.refreshRate() <= 0:
+        return DEFAULT_MAX_RATE
+    return screen.refreshRate()
+
+
+class InputCoalescer(QObject):
+    """按参数名合并输入，并以不超过 max_rate 的频率发出 flushed(dict)
+
+    Qt Widgets没有直接暴露垂直同步信号，因此默认以主屏幕刷新率作为提交上限，
+    即每个刷新周期最多提交一次。
+
+    计数器:
+        submitted: 收到的样本数
+        merged: 覆盖了同一参数尚未提交的旧值的样本数
+        dropped: 与待提交值 (或已提交值) 相同、直接丢弃的样本数
+        flushes: 实际提交次数
+    """
+
+    flushed = Signal(dict)
+
+    def __init__(self, max_rate=None, parent=None):
+        """
+        Args:
+            max_rate: 每秒最多提交次数，None表示使用主屏幕刷新率
+            parent: Qt父对象
+        """
+        super().__init__(parent)
+        self._pending = {}
+        self._committed = {}
+        self._last_flush = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self.flush)
+        self.set_max_rate(max_rate)
+        self.reset_stats()
+
+    def set_max_rate(self, max_rate=None):
+        """设置提交频率上限 (Hz)"""
+        self.max_rate = max_rate or display_refresh_rate()
+        self.min_interval = 1.0 / self.max_rate
+
+    def submit(self, name, value):
+        """提交一个参数样本，只保留每个参数的最新值"""
+        self.submitted += 1
+
+        if name in self._pending:
+            if self._pending[name] == value:
+                self.dropped += 1
+                return
+            self.merged += 1
+        elif self._committed.get(name, object()) == value:
+            self.dropped += 1
+            return
+
+        self._pending[name] = value
+        self._schedule()
+
+    def submit_many(self, values):
+        """一次提交多个参数样本"""
+        for name, value in values.items():
+            self.submit(name, value)
+
+    def _schedule(self):
+        """距上次提交不足一个周期时推迟到周期结束，否则在下一次事件循环提交"""
+        if self._timer.isActive():
+            return
+        delay = 0.0
+        if self._last_flush is not None:
+            delay = max(0.0, self._last_flush + self.min_interval - time.perf_counter())
+        self._timer.start(int(round(delay * 1000)))
+
+    def flush(self):
+        """立即提交所有待处理的参数"""
+        self._timer.stop()
+        if not self._pending:
+            return
+        changes, self._pending = self._pending, {}
+        self._committed.update(changes)
+        self._last_flush = time.perf_counter()
+        self.flushes += 1
+        self.flushed.emit(changes)
+
+    @property
+    def pending(self):
+        """尚未提交的参数 (只读副本)"""
+        return dict(self._pending)
+
+    def stats(self):
+        """返回计数器快照"""
+        return {
+            'submitted': self.submitted,
+            'merged': self.merged,
+            'dropped': self.dropped,
+            'flushes': self.flushes,
+            'max_rate': self.max_rate
+        }
+
+    def reset_stats(self):
+        """重置计数器"""
+        self.submitted = 0
+        self.merged = 0
+        self.dropped = 0
+        self.flushes = 0
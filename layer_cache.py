@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+保留模式图层缓存
+把很少变化的图层 (背景、参数文字) 绘制到QPixmap中，只有图层输入改变时才重新绘制，
+其余重绘只需一次drawPixmap，文字排版等昂贵操作不再出现在每帧的绘制路径中
+"""
+
+from PySide6.QtCore import Qt, QPoint
+from PySide6.QtGui import QPainter, QPixmap
+
+
+class LayerCache:
+    """按名称保存图层像素图，缓存键变化时失效
+
+    每个图层只保留最新的一张像素图: 键 = (调用方给出的输入键, 尺寸, 设备像素比)。
+    调用方应把影响图层内容的全部输入 (例如已格式化的文字) 放入键中。
+    """
+
+    def __init__(self):
+        self._layers = {}
+        self.hits = 0
+        self.misses = 0
+
+    def layer(self, name, key, size, device_pixel_ratio, draw):
+        """获取图层像素图，必要时重新绘制
+
+        Args:
+            name: 图层名称
+            key: 可哈希的图层输入
+            size: 图层逻辑尺寸 (QSize)
+            device_pixel_ratio: 目标设备的像素比，保证高分屏下文字清晰
+            draw: draw(painter) 回调，在透明像素图上绘制图层内容
+
+        Returns:
+            QPixmap: 图层像素图 (调用方不应修改)
+        """
+        full_key = (key, size.width(), size.height(), device_pixel_ratio)
+        entry = self._layers.get(name)
+        if entry is not None and entry[0] == full_key:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        pixmap = QPixmap(size * device_pixel_ratio)
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        try:
+            painter.setRenderHint(QPainter.Antialiasing, True)
+            draw(painter)
+        finally:
+            painter.end()
+
+        self._layers[name] = (full_key, pixmap)
+        return pixmap
+
+    def draw_layer(self, painter, name, key, draw):
+        """在painter的设备左上角绘制图层 (尺寸与像素比取自painter的设备)"""
+        device = painter.device()
+        pixmap = self.layer(name, key, device.size(), device.devicePixelRatio(), draw)
+        painter.drawPixmap(QPoint(0, 0), pixmap)
+
+    def invalidate(self, name=None):
+        """丢弃指定图层 (None表示全部)，下次访问时重新绘制"""
+        if name is None:
+            self._layers.clear()
+        else:
+            self._layers.pop(name, None)
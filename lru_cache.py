@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+带命中统计的LRU缓存基类 (不依赖Qt)
+渐变、描边轮廓、弧长表和预测航迹的缓存共用同一套淘汰策略和计数器，
+子类只负责生成缓存键和缓存值
+"""
+
+from collections import OrderedDict
+
+
+class LRUCache:
+    """按最近使用顺序淘汰的缓存，记录命中、未命中和淘汰次数
+
+    子类用 _get 查找 (计入命中或未命中)，未命中时生成值并用 _put 加入缓存。
+    缓存值不能为None (None表示未命中)。
+    """
+
+    def __init__(self, max_size):
+        """
+        Args:
+            max_size: 最多缓存的条目数量，超出时淘汰最久未使用的
+        """
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _get(self, key):
+        """查找缓存值，命中时标记为最近使用，未命中时返回None"""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def _put(self, key, value):
+        """加入缓存值 (标记为最近使用)，超出容量时淘汰最久未使用的条目"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def _evict(self):
+        """淘汰最久未使用的条目直到不超过容量"""
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    @property
+    def hit_rate(self):
+        """命中率 (0.0-1.0)，尚无请求时为0"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        """返回计数器快照"""
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate
+        }
+
+    def clear(self):
+        """清空缓存并重置计数器"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
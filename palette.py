@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+调色板
+每个主题只解析一次十六进制颜色，保存为只读的RGBA (直通与预乘) 数值，
+并按需创建、缓存QColor/QBrush/QPen，绘制热路径中不再出现字符串解析
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor, QBrush, QPen
+
+
+RGBA = namedtuple('RGBA', ['red', 'green', 'blue', 'alpha'])
+
+# 主题定义: 颜色名称 → (十六进制颜色, 透明度)
+THEMES = {
+    # 腰线渐变 (gradient_trapezoid.py / core_curved_trapezoid.py)
+    'leg_gradient': {
+        'top': ('#B6B384', 0),       # 上端：完全透明
+        'middle': ('#FEFFAF', 127),  # 中间：50%透明
+        'bottom': ('#B7B286', 0)     # 下端：完全透明
+    },
+    # 腰线渐变 - 半透明版本 (complete_curve_control.py)
+    'leg_gradient_soft': {
+        'top': ('#B6B384', 100),
+        'middle': ('#FEFFAF', 200),
+        'bottom': ('#B7B286', 100)
+    },
+    # 转向紧急程度: 轻微 - 绿色
+    'steering_gentle': {
+        'top': ('#00FF88', 150),
+        'middle': ('#88FFAA', 220),
+        'bottom': ('#00FF88', 150)
+    },
+    # 转向紧急程度: 中等 - 黄色
+    'steering_moderate': {
+        'top': ('#FFAA00', 150),
+        'middle': ('#FFDD88', 220),
+        'bottom': ('#FFAA00', 150)
+    },
+    # 转向紧急程度: 急转 - 红色
+    'steering_hard': {
+        'top': ('#FF4444', 150),
+        'middle': ('#FF8888', 220),
+        'bottom': ('#FF4444', 150)
+    },
+    # 梯形填充与标注
+    'fill': {
+        'fill': ('#CBD900', 255),
+        'background': ('#BDC5D5', 255),
+        'text': ('#333333', 255),
+        'vertex': ('#FF0000', 255),
+        'control': ('#0000FF', 255)
+    },
+    # 船舶转向显示
+    'ship': {
+        'text': ('#FFFFFF', 255),
+        'marker_outline': ('#FFFFFF', 255),
+        'marker': ('#FFFF00', 255),
+        'track': ('#88CCFF', 160),
+        'chevron': ('#FFFFFF', 200)
+    }
+}
+
+# 三段渐变的停止点位置
+GRADIENT_STOP_POSITIONS = (('top', 0.0), ('middle', 0.5), ('bottom', 1.0))
+
+
+def parse_hex_color(hex_color, alpha=255):
+    """解析 '#RRGGBB' 为直通 (非预乘) RGBA"""
+    value = hex_color.lstrip('#')
+    if len(value) != 6:
+        raise ValueError(f"无效的颜色值: {hex_color}")
+    return RGBA(int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16), alpha)
+
+
+def premultiply(rgba):
+    """把直通RGBA转换为预乘RGBA (各通道乘以 alpha/255 并四舍五入)"""
+    alpha = rgba.alpha
+    return RGBA((rgba.red * alpha + 127) // 255,
+                (rgba.green * alpha + 127) // 255,
+                (rgba.blue * alpha + 127) // 255,
+                alpha)
+
+
+def mix_rgba(first, second, t):
+    """在两个直通RGBA之间线性插值 (t为0-1，结果取整)"""
+    return RGBA(*(round(a + (b - a) * t) for a, b in zip(first, second)))
+
+
+@lru_cache(maxsize=64)
+def qcolor(value):
+    """缓存的QColor构造，用于只在配置中以字符串给出的颜色 (如背景色)
+
+    返回共享对象，调用方不应修改
+    """
+    return QColor(value)
+
+
+class Palette:
+    """解析后的只读主题"""
+
+    def __init__(self, name, entries):
+        self.name = name
+        self._rgba = MappingProxyType({
+            key: parse_hex_color(hex_color, alpha) for key, (hex_color, alpha) in entries.items()
+        })
+        self._premultiplied = MappingProxyType({
+            key: premultiply(value) for key, value in self._rgba.items()
+        })
+        self._colors = {}
+        self._brushes = {}
+        self._pens = {}
+
+    def __contains__(self, key):
+        return key in self._rgba
+
+    def keys(self):
+        return self._rgba.keys()
+
+    def rgba(self, key):
+        """直通RGBA"""
+        return self._rgba[key]
+
+    def premultiplied(self, key):
+        """预乘RGBA (供无Qt的光栅化等场景直接使用)"""
+        return self._premultiplied[key]
+
+    def color(self, key):
+        """共享的QColor (调用方不应修改)"""
+        color = self._colors.get(key)
+        if color is None:
+            color = self._colors[key] = QColor(*self._rgba[key])
+        return color
+
+    def brush(self, key):
+        """共享的实色QBrush"""
+        brush = self._brushes.get(key)
+        if brush is None:
+            brush = self._brushes[key] = QBrush(self.color(key))
+        return brush
+
+    def pen(self, key, width=1, cap_style=Qt.SquareCap):
+        """共享的实色QPen，按 (颜色, 线宽, 端点样式) 缓存"""
+        cache_key = (key, width, cap_style)
+        pen = self._pens.get(cache_key)
+        if pen is None:
+            pen = QPen(self.color(key), width)
+            pen.setCapStyle(cap_style)
+            self._pens[cache_key] = pen
+        return pen
+
+    def gradient_stops(self, positions=GRADIENT_STOP_POSITIONS):
+        """返回可哈希的渐变停止点 ((位置, RGBA), ...)，供GradientCache使用"""
+        return tuple((position, self._rgba[key]) for key, position in positions)
+
+
+_palettes = {}
+
+
+def get_palette(name):
+    """获取命名主题 (首次访问时解析，之后复用)"""
+    palette = _palettes.get(name)
+    if palette is None:
+        palette = _palettes[name] = Palette(name, THEMES[name])
+    return palette
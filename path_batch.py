@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+由NumPy元素数组批量构建QPainterPath
+数千条子路径逐个调用 moveTo / lineTo / cubicTo 时开销主要在Python层。
+这里按QDataStream的序列化格式一次拼出所有元素的字节，再一次反序列化为路径；
+序列化格式先按逐个元素构建的结果自检，不一致时退回逐个元素构建。
+
+闭合子路径的写法: 最后一个元素为回到子路径起点的LINE_TO。QPainterPath没有单独的
+闭合元素，closeSubpath() 生成的正是这样的lineTo，描边时首尾相同的子路径按连接样式衔接
+"""
+
+import numpy as np
+from PySide6.QtCore import Qt, QByteArray, QDataStream, QIODevice
+from PySide6.QtGui import QPainterPath
+
+
+# QPainterPath.ElementType 的取值
+MOVE_TO, LINE_TO, CURVE_TO, CURVE_DATA = 0, 1, 2, 3
+
+# QDataStream中QPainterPath元素的布局 (默认大端、双精度)
+_PATH_ELEMENT_DTYPE = np.dtype([('type', '>i4'), ('x', '>f8'), ('y', '>f8')])
+
+# 自检样本的元素类型: 覆盖所有类型，包含一个闭合子路径和一个开放子路径
+_SELF_CHECK_TYPES = np.array([MOVE_TO, LINE_TO, CURVE_TO, CURVE_DATA, CURVE_DATA, LINE_TO,
+                              MOVE_TO, CURVE_TO, CURVE_DATA, CURVE_DATA, LINE_TO])
+_SELF_CHECK_CLOSING = (0, 5)
+
+
+def _path_from_elements_plain(points, types, fill_rule):
+    """逐个元素调用 moveTo / lineTo / cubicTo 构建路径 (快速路径不可用时的实现)
+
+    子路径最后一个回到起点的LINE_TO用 closeSubpath() 闭合
+    """
+    path = QPainterPath()
+    path.setFillRule(fill_rule)
+    coordinates = points.tolist()
+    types = types.tolist()
+    start = None
+    for index, element_type in enumerate(types):
+        if element_type == MOVE_TO:
+            start = coordinates[index]
+            path.moveTo(*start)
+        elif element_type == LINE_TO:
+            last = index + 1 == len(types) or types[index + 1] == MOVE_TO
+            if last and coordinates[index] == start:
+                path.closeSubpath()
+            else:
+                path.lineTo(*coordinates[index])
+        elif element_type == CURVE_TO:
+            path.cubicTo(*coordinates[index], *coordinates[index + 1],
+                         *coordinates[index + 2])
+    return path
+
+
+def _path_from_stream(points, types, fill_rule):
+    """按QDataStream的序列化格式拼出字节，一次反序列化为路径
+
+    Returns:
+        QPainterPath: 读取失败或元素数量不符时为None
+    """
+    count = len(points)
+    elements = np.empty(count, dtype=_PATH_ELEMENT_DTYPE)
+    elements['type'] = types
+    elements['x'] = points[:, 0]
+    elements['y'] = points[:, 1]
+
+    # 最后一个子路径的起点下标 (cStart)
+    last_start = int(np.flatnonzero(types == MOVE_TO)[-1])
+    data = b''.join((np.array([count], dtype='>i4').tobytes(),
+                     elements.tobytes(),
+                     np.array([last_start, int(fill_rule == Qt.WindingFill)],
+                              dtype='>i4').tobytes()))
+    # QDataStream只保存QByteArray的指针，字节数组需在读取期间保持存活
+    buffer = QByteArray(data)
+    stream = QDataStream(buffer, QIODevice.ReadOnly)
+    path = QPainterPath()
+    stream >> path
+    if stream.status() != QDataStream.Ok or path.elementCount() != count:
+        return None
+    return path
+
+
+def _same_elements(path, expected):
+    """两条路径的填充规则和每个元素的类型、坐标是否完全一致"""
+    if path.fillRule() != expected.fillRule() or path.elementCount() != expected.elementCount():
+        return False
+    for index in range(expected.elementCount()):
+        element, reference = path.elementAt(index), expected.elementAt(index)
+        if (element.type != reference.type or element.x != reference.x
+                or element.y != reference.y):
+            return False
+    return True
+
+
+# 快速路径的自检结果 (None表示尚未检查)
+_stream_layout_ok = None
+
+
+def stream_layout_supported():
+    """当前Qt版本的QPainterPath序列化格式是否与快速路径的字节布局一致
+
+    第一次调用时用一个包含所有元素类型和闭合子路径的小样本分别按两种方式构建路径并逐元素比较，
+    结果缓存在模块中
+    """
+    global _stream_layout_ok
+    if _stream_layout_ok is None:
+        types = _SELF_CHECK_TYPES
+        points = np.arange(len(types) * 2, dtype=np.float64).reshape(-1, 2) / 4
+        start, end = _SELF_CHECK_CLOSING
+        points[end] = points[start]
+        _stream_layout_ok = True
+        for fill_rule in (Qt.WindingFill, Qt.OddEvenFill):
+            path = _path_from_stream(points, types, fill_rule)
+            expected = _path_from_elements_plain(points, types, fill_rule)
+            if path is None or not _same_elements(path, expected):
+                _stream_layout_ok = False
+                break
+    return _stream_layout_ok
+
+
+def path_from_elements(points, types, fill_rule=Qt.WindingFill):
+    """由元素数组一次构建QPainterPath
+
+    序列化格式未通过自检 (stream_layout_supported) 或读取失败时，改为逐个元素构建。
+
+    Args:
+        points: (M, 2) 元素坐标
+        types: 与points等长的元素类型数组 (MOVE_TO / LINE_TO / CURVE_TO / CURVE_DATA)，
+            每个子路径以MOVE_TO开始，CURVE_TO后跟两个CURVE_DATA；
+            以回到起点的LINE_TO结束的子路径为闭合子路径
+        fill_rule: 填充规则
+
+    Returns:
+        QPainterPath
+    """
+    points = np.asarray(points, dtype=np.float64)
+    types = np.asarray(types)
+    if len(points) == 0:
+        return QPainterPath()
+
+    if stream_layout_supported():
+        path = _path_from_stream(points, types, fill_rule)
+        if path is not None:
+            return path
+    return _path_from_elements_plain(points, types, fill_rule)
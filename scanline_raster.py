@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+弯曲梯形扫描线光栅化 (不依赖Qt)
+无界面的流水线只需要填充区域的alpha覆盖率掩码。填充区域由水平的上底、下底和
+两条y方向单调的二次腰线围成，每条扫描线与区域的交集是一个区间，
+区间端点直接由腰线方程求出，不需要展平曲线或构建路径。
+
+抗锯齿时按面积精确计算覆盖率: 每个像素行分为若干水平条带，条带内腰线按直线处理，
+直线右侧在像素内的面积比例有闭式解。只有腰线经过的边缘像素需要计算；
+两条腰线之间的整像素完全覆盖，用预先算好的叠加查找表直接写入。
+
+覆盖率与按128×128超采样得到的精确面积相差不到1/255。与QPainter填充到Alpha8图像相比
+(fill_benchmark.py --scanline): 直腰线最多相差3；腰线按0.01像素展平为多边形后最多相差8
+(QPainter在近水平的短边上的面积误差)；直接填充曲线路径时沿弯曲腰线可达约45，
+这部分来自QPainter按自身容差展平曲线
+"""
+
+import numpy as np
+
+from bezier_batch import quadratic_x_at_y
+from trapezoid_geometry import leg_bounds, leg_control_polygons
+
+
+# 抗锯齿时每个像素行划分的条带数量 (条带内腰线按直线计算面积，腰线在半行内的弯曲可以忽略)
+DEFAULT_SUBSAMPLES = 2
+
+
+def scanline_spans(legs, y):
+    """扫描线 y 与弯曲梯形填充区域的交集区间
+
+    与 analytic_fill.create_fill_path 的奇偶填充一致: 腰线交叉时区间取两条腰线之间
+
+    Args:
+        legs: (2, 3, 2) 左右腰线控制多边形 (从上底到下底)
+        y: 扫描线高度数组
+
+    Returns:
+        tuple: (x0, x1) 与y同形状；区间为空的扫描线 x0 == x1
+    """
+    left = quadratic_x_at_y(legs[0], y)
+    right = quadratic_x_at_y(legs[1], y)
+    x0 = np.minimum(left, right)
+    x1 = np.maximum(left, right)
+
+    top, bottom = sorted((legs[0, 0, 1], legs[0, 2, 1]))
+    inside = (y >= top) & (y < bottom)
+    return x0, np.where(inside, x1, x0)
+
+
+def _clamped_integral(u):
+    """min(max(u, 0), 1) 的原函数 (在u ≤ 0处为0)"""
+    clamped = np.clip(u, 0.0, 1.0)
+    return clamped * clamped / 2 + np.maximum(u - 1.0, 0.0)
+
+
+def _right_of_edge(columns, x_top, x_bottom):
+    """像素列 [c, c+1) 在一个条带内位于直线边右侧的面积比例 (以条带高度为1)
+
+    边的x在条带内线性变化，比例为 min(max(c + 1 − x, 0), 1) 沿边的平均值
+    """
+    dx = x_bottom - x_top
+    vertical = np.abs(dx) < 1e-6
+    safe = np.where(vertical, 1.0, dx)
+    sloped = (_clamped_integral(columns + 1 - x_top) - _clamped_integral(columns + 1 - x_bottom)) / safe
+    return np.where(vertical, np.clip(columns + 1 - (x_top + x_bottom) / 2, 0.0, 1.0), sloped)
+
+
+def trapezoid_spans(legs, rows, column_range, subsamples=DEFAULT_SUBSAMPLES, antialias=True):
+    """单个弯曲梯形在若干像素行上的覆盖: 每行一段完全覆盖的整像素和若干边缘像素
+
+    抗锯齿时每行分为 subsamples 个条带 (按上底、下底截断)，条带内两条腰线按直线处理。
+    腰线在一行内经过的列是边缘像素，覆盖率为各条带内左腰线右侧面积减去右腰线右侧面积；
+    两条腰线之间的列完全覆盖。上底、下底所在的行不完整，整行都按边缘像素计算。
+    边缘像素数量与 行数 × (1 + 腰线每行的横向跨度) 成正比，与梯形面积无关
+
+    Args:
+        legs: (2, 3, 2) 左右腰线控制多边形
+        rows: (R,) 像素行号
+        column_range: (起始列, 结束列) 只返回此范围内的列
+        subsamples: 抗锯齿时每行的条带数量
+        antialias: False时按像素中心判断 (没有边缘像素)
+
+    Returns:
+        tuple: (start, stop, edge_rows, edge_columns, edge_coverage)
+            start, stop: (R,) 每行完全覆盖的列 [start, stop)
+            edge_rows: 边缘像素所在行在rows中的下标
+            edge_columns: 边缘像素的列号
+            edge_coverage: 边缘像素 0.0-1.0 的覆盖率
+    """
+    rows = np.asarray(rows, dtype=np.float64)
+    first, last = column_range
+
+    if not antialias:
+        x0, x1 = scanline_spans(legs, rows + 0.5)
+        # 像素中心 c + 0.5 落在 [x0, x1) 内的列
+        start = np.clip(np.ceil(x0 - 0.5), first, last).astype(np.intp)
+        stop = np.maximum(np.clip(np.ceil(x1 - 0.5), first, last).astype(np.intp), start)
+        empty = np.zeros(0, dtype=np.intp)
+        return start, stop, empty, empty, np.zeros(0)
+
+    # 条带边界 (R, subsamples + 1)，截断到上底与下底之间，条带高度以像素行高为1
+    top, bottom = sorted((legs[0, 0, 1], legs[0, 2, 1]))
+    ys = np.clip(rows[:, None] + np.arange(subsamples + 1) / subsamples, top, bottom)
+    heights = np.diff(ys, axis=1)
+    left, right = quadratic_x_at_y(legs[:, None, None], ys)
+    x0, x1 = np.minimum(left, right), np.maximum(left, right)
+
+    # 两条腰线各自在一行内经过的列 [floor(最小x), ceil(最大x))
+    left_start, left_stop = np.floor(x0.min(axis=1)), np.ceil(x0.max(axis=1))
+    right_start, right_stop = np.floor(x1.min(axis=1)), np.ceil(x1.max(axis=1))
+    covered = heights.sum(axis=1)
+    separate = (covered > 1 - 1e-9) & (left_stop <= right_start)
+
+    # 腰线不相交的完整行: 两段边缘和中间的整像素；其余行整段按边缘像素计算
+    start = np.where(separate, left_stop, 0)
+    stop = np.where(separate, right_start, 0)
+    ranges = np.stack([left_start, np.where(separate, left_stop, np.maximum(left_stop, right_stop)),
+                       np.where(separate, right_start, 0), np.where(separate, right_stop, 0)], axis=1)
+    ranges[covered <= 0] = 0
+    start, stop, ranges = (np.clip(values, first, last).astype(np.intp)
+                           for values in (start, stop, ranges))
+
+    # 展开为逐像素的 (行下标, 列号)
+    range_starts = ranges[:, 0::2].ravel()
+    counts = np.maximum(ranges[:, 1::2].ravel() - range_starts, 0)
+    edge_rows = np.repeat(np.arange(len(rows)).repeat(2), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    edge_columns = np.repeat(range_starts, counts) + offsets
+
+    # 两条腰线一起计算: (边缘像素, 腰线, 条带)
+    edges = np.stack([x0, x1], axis=1)[edge_rows]
+    area = _right_of_edge(edge_columns[:, None, None], edges[..., :-1], edges[..., 1:])
+    coverage = np.clip(np.sum((area[:, 0] - area[:, 1]) * heights[edge_rows], axis=1), 0.0, 1.0)
+    return start, stop, edge_rows, edge_columns, coverage
+
+
+def trapezoid_coverage(legs, rows, columns, subsamples=DEFAULT_SUBSAMPLES, antialias=True):
+    """单个弯曲梯形在像素块上的覆盖率 (由 trapezoid_spans 展开为稠密数组)
+
+    Args:
+        legs: (2, 3, 2) 左右腰线控制多边形
+        rows: (R,) 像素行号
+        columns: (C,) 连续的像素列号
+        subsamples: 抗锯齿时每行的条带数量
+        antialias: False时按像素中心判断 (覆盖率只有0和1)
+
+    Returns:
+        np.ndarray: (R, C) 0.0-1.0 的覆盖率
+    """
+    columns = np.asarray(columns)
+    start, stop, edge_rows, edge_columns, edge_coverage = trapezoid_spans(
+        legs, rows, (columns[0], columns[-1] + 1), subsamples, antialias)
+    coverage = ((columns >= start[:, None]) & (columns < stop[:, None])).astype(np.float64)
+    coverage[edge_rows, edge_columns - columns[0]] = edge_coverage
+    return coverage
+
+
+def rasterize_trapezoids(geometry, buffer, subsamples=DEFAULT_SUBSAMPLES, antialias=True,
+                         alpha=255):
+    """把弯曲梯形的填充覆盖率写入调用方提供的uint8缓冲区
+
+    每个梯形只处理其精确包围盒与缓冲区的交集；多个梯形按 source-over 叠加
+    (dst = src + dst·(1 − src/255))，与QPainter逐个填充到Alpha8图像的结果一致。
+    完全覆盖的整像素逐行按切片写入，只有边缘像素做浮点叠加
+
+    Args:
+        geometry: create_trapezoid_geometry 返回的N个梯形 (可不含腰线采样点)
+        buffer: (高, 宽) uint8数组，可以是带行填充的视图
+                (如 QImage Alpha8 的 bits 按 bytesPerLine 整形后截取宽度)
+        subsamples: 抗锯齿时每行的条带数量
+        antialias: 是否抗锯齿
+        alpha: 填充不透明度 (0-255)
+
+    Returns:
+        np.ndarray: buffer (同一对象)
+    """
+    if buffer.dtype != np.uint8 or buffer.ndim != 2:
+        raise ValueError(f"缓冲区应为二维uint8数组: {buffer.dtype}, {buffer.shape}")
+
+    height, width = buffer.shape
+    legs = leg_control_polygons(geometry)
+    bounds = leg_bounds(legs)
+
+    # 完全覆盖的像素按查找表叠加: dst = alpha + dst·(1 − alpha/255)
+    full = np.rint(alpha + np.arange(256) * (1.0 - alpha / 255.0)).astype(np.uint8)
+
+    for leg_pair, (min_x, min_y, max_x, max_y) in zip(legs, bounds.tolist()):
+        row0, row1 = max(int(np.floor(min_y)), 0), min(int(np.ceil(max_y)), height)
+        col0, col1 = max(int(np.floor(min_x)), 0), min(int(np.ceil(max_x)), width)
+        if row0 >= row1 or col0 >= col1:
+            continue
+
+        start, stop, edge_rows, edge_columns, coverage = trapezoid_spans(
+            leg_pair, np.arange(row0, row1), (col0, col1), subsamples, antialias)
+        region = buffer[row0:row1, col0:col1]
+        for line, begin, end in zip(region, (start - col0).tolist(), (stop - col0).tolist()):
+            line[begin:end] = 255 if alpha == 255 else full[line[begin:end]]
+
+        edge_columns = edge_columns - col0
+        source = coverage * alpha
+        region[edge_rows, edge_columns] = np.rint(
+            source + region[edge_rows, edge_columns] * (1.0 - source / 255.0))
+
+    return buffer
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+船舶动力学模型 (不依赖Qt)
+按船速和舵角预测一段时间内的航迹，多组 (船速, 舵角) 假设一次以NumPy数组计算；
+转向梯形的弯曲由预测航迹拟合得到，而不是经验公式
+
+坐标约定: 船舶位于原点，x向右 (右舷)，y向前，航向角从正前方顺时针计 (弧度)；
+舵角为正 (右舵) 时向右转
+"""
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+# 1节 = 0.514444 米/秒
+KNOT = 0.514444
+
+# 拟合显示曲线时控制点位置比例的范围
+CONTROL_RATIO_RANGE = (0.05, 0.95)
+
+
+class ShipDynamicsModel(ABC):
+    """船舶动力学模型基类
+
+    子类实现 heading(speed, rudder, t, yaw_rate)，返回航向角随时间的变化，
+    以及稳态转弯半径 turn_radius；航迹积分等公共部分由基类完成。
+    未实现这两个方法的子类在创建时即报错
+    """
+
+    name = None
+
+    @abstractmethod
+    def heading(self, speed, rudder, t, yaw_rate):
+        """航向角 (弧度)
+
+        Args:
+            speed: 船速 (米/秒)，形状 (N, 1)
+            rudder: 舵角 (弧度)，形状 (N, 1)
+            t: 时间 (秒)，形状 (N, M)
+            yaw_rate: 初始转首角速度 (弧度/秒)，形状 (N, 1)
+        """
+
+    @abstractmethod
+    def turn_radius(self, speeds, rudders):
+        """稳态转弯半径 (米)，舵角为0时为inf
+
+        Args:
+            speeds: 船速 (节)
+            rudders: 舵角 (度)
+        """
+
+    def predict_track(self, speeds, rudders, horizon, steps=64, yaw_rate=0.0):
+        """预测航迹 (所有输入按NumPy规则广播后展平为N组假设)
+
+        Args:
+            speeds: 船速 (节)
+            rudders: 舵角 (度)
+            horizon: 预测时长 (秒)，可为每组假设单独给出
+            steps: 时间步数，每条航迹 steps+1 个采样点
+            yaw_rate: 初始转首角速度 (度/秒)
+
+        Returns:
+            dict: 't' / 'x' / 'y' / 'heading' 数组，形状 (N, steps+1)；x、y单位为米
+        """
+        speeds, rudders, horizon, yaw_rate = (
+            np.ravel(value) for value in np.broadcast_arrays(
+                np.asarray(speeds, dtype=float), np.asarray(rudders, dtype=float),
+                np.asarray(horizon, dtype=float), np.asarray(yaw_rate, dtype=float)))
+
+        speed = (speeds * KNOT)[:, None]
+        t = np.linspace(0.0, 1.0, steps + 1)[None, :] * horizon[:, None]
+        heading = self.heading(speed, np.radians(rudders)[:, None], t,
+                               np.radians(yaw_rate)[:, None])
+
+        # 中点法积分位置: 每个时间步内按平均航向直线前进
+        mid_heading = 0.5 * (heading[:, 1:] + heading[:, :-1])
+        step_distance = speed * np.diff(t, axis=1)
+        x = np.zeros_like(t)
+        y = np.zeros_like(t)
+        np.cumsum(step_distance * np.sin(mid_heading), axis=1, out=x[:, 1:])
+        np.cumsum(step_distance * np.cos(mid_heading), axis=1, out=y[:, 1:])
+        return {'t': t, 'x': x, 'y': y, 'heading': heading}
+
+
+class NomotoModel(ShipDynamicsModel):
+    """Nomoto一阶操纵模型: T·r' + r = K·δ
+
+    K、T由无因次参数按船速和船长换算: K = K'·U/L，T = T'·L/U，
+    因此稳态转弯半径 L / (K'·|δ|) 与船速无关，而转首响应的滞后随船速降低而变长。
+    恒定舵角下航向角有闭式解，不需要逐步积分:
+        ψ(t) = Kδ·t − (Kδ − r0)·T·(1 − e^(−t/T))
+    """
+
+    name = 'nomoto'
+
+    def __init__(self, length=100.0, gain=2.0, time_constant=1.0):
+        """
+        Args:
+            length: 船长 (米)
+            gain: 无因次回转性指数 K'
+            time_constant: 无因次追随性指数 T'
+        """
+        self.length = length
+        self.gain = gain
+        self.time_constant = time_constant
+
+    def coefficients(self, speed):
+        """船速 (米/秒) 对应的 (K, T)"""
+        speed = np.maximum(speed, 1e-6)
+        return self.gain * speed / self.length, self.time_constant * self.length / speed
+
+    def heading(self, speed, rudder, t, yaw_rate):
+        gain, time_constant = self.coefficients(speed)
+        steady_rate = gain * rudder
+        lag = time_constant * -np.expm1(-t / time_constant)
+        return steady_rate * t - (steady_rate - yaw_rate) * lag
+
+    def turn_radius(self, speeds, rudders):
+        _, rudders = np.broadcast_arrays(np.asarray(speeds, dtype=float),
+                                         np.asarray(rudders, dtype=float))
+        with np.errstate(divide='ignore'):
+            return self.length / (self.gain * np.abs(np.radians(rudders)))
+
+
+class LegacyTurnModel(ShipDynamicsModel):
+    """原显示中的简化估算: 立即以半径 船速×10 / |舵角| 匀速转弯 (无转首滞后)"""
+
+    name = 'legacy'
+
+    def heading(self, speed, rudder, t, yaw_rate):
+        radius = self.turn_radius(speed / KNOT, np.degrees(rudder))
+        return np.sign(rudder) * speed * t / radius
+
+    def turn_radius(self, speeds, rudders):
+        with np.errstate(divide='ignore'):
+            return np.asarray(speeds, dtype=float) * 10 / np.abs(rudders)
+
+
+# 可选的动力学模型
+DYNAMICS_MODELS = {
+    NomotoModel.name: NomotoModel,
+    LegacyTurnModel.name: LegacyTurnModel
+}
+
+
+def fit_display_curve(track, lookahead, height):
+    """把预测航迹拟合为转向梯形中心线的二次贝塞尔曲线 (批量)
+
+    航迹截取到前进距离达到 lookahead 米处 (或航向转过90°处)，横向按 height/lookahead
+    缩放到像素，纵向把截取终点映射到梯形顶部。起点 (船位) 与终点固定，
+    控制点按最小二乘拟合航迹采样点。
+
+    Args:
+        track: predict_track 的结果
+        lookahead: 梯形高度代表的前进距离 (米)
+        height: 梯形高度 (像素)
+
+    Returns:
+        dict: 每组假设的 'lateral_offset' (终点横向偏移，像素)、
+              'bend' (控制点相对中心线中点的横向偏移，像素)、
+              'control_ratio' (控制点从船位起算的高度比例)
+    """
+    x, y, heading = track['x'], track['y'], track['heading']
+    count = x.shape[1]
+
+    # 截取点: 首个前进距离达到lookahead或航向超过90°的采样点，否则取最后一点
+    stop = (y >= lookahead) | (np.abs(heading) >= np.pi / 2)
+    end = np.where(stop.any(axis=1), stop.argmax(axis=1), count - 1)
+    end = np.maximum(end, 1)
+    rows = np.arange(x.shape[0])
+
+    end_x = x[rows, end]
+    end_y = np.maximum(y[rows, end], 1e-9)
+    u = x * (height / lookahead)
+    v = y / end_y[:, None] * height
+    end_u = end_x * (height / lookahead)
+
+    # 采样点参数 t = k / end，截取点之后的采样权重为0
+    k = np.arange(count)[None, :]
+    t = np.minimum(k / end[:, None], 1.0)
+    weight = np.where(k <= end[:, None], 2 * t * (1 - t), 0.0)
+
+    # B(t) − t²·P2 = w·P1 (P0为原点) → P1 = Σw·(Q − t²·P2) / Σw²
+    denominator = np.maximum((weight ** 2).sum(axis=1), 1e-12)
+    control_u = (weight * (u - t ** 2 * end_u[:, None])).sum(axis=1) / denominator
+    control_v = (weight * (v - t ** 2 * height)).sum(axis=1) / denominator
+
+    control_ratio = np.clip(control_v / height, *CONTROL_RATIO_RANGE)
+    return {
+        'lateral_offset': end_u,
+        'bend': control_u - end_u * control_ratio,
+        'control_ratio': control_ratio
+    }
@@ -7,10 +7,62 @@
 
 import sys
 import math
+import numpy as np
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                                QHBoxLayout, QLabel, QSlider, QComboBox)
-from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QPainter, QLinearGradient, QPen, QColor, QPainterPath
+from PySide6.QtCore import Qt, QPointF, QTimer
+from PySide6.QtGui import QPainter, QPen, QPainterPath, QPolygonF
+
+from flow_chevrons import ChevronFlow
+from gradient_cache import DEFAULT_GRADIENT_CACHE
+from input_coalescer import InputCoalescer, display_refresh_rate
+from layer_cache import LayerCache
+from palette import get_palette, mix_rgba
+from stroke_cache import DEFAULT_STROKE_CACHE
+from ship_dynamics import KNOT, NomotoModel, fit_display_curve
+from steering_tween import EASING_CURVES, ParameterTween
+from track_cache import TrackCache
+from turn_table import turn_parameters, urgency_band
+
+
+# 转向紧急程度对应的渐变停止点 (主题只解析一次)
+STEERING_GRADIENT_STOPS = {
+    urgency: get_palette(f'steering_{urgency}').gradient_stops()
+    for urgency in ('gentle', 'moderate', 'hard')
+}
+
+# 紧急程度档位顺序 (补间时颜色在相邻档位之间混合)
+STEERING_BANDS = ('gentle', 'moderate', 'hard')
+BAND_BLEND_STEPS = 16
+
+# 航迹预测: 梯形高度代表的前进距离 (米)、预测时长余量、时间步数和最低船速 (节)
+PREDICTION_LOOKAHEAD = 200.0
+PREDICTION_HORIZON_MARGIN = 1.5
+PREDICTION_STEPS = 48
+MIN_PREDICTION_SPEED = 0.5
+
+# 船舶指示器与文字颜色
+SHIP_PALETTE = get_palette('ship')
+TRACK_PEN = QPen(SHIP_PALETTE.color('track'), 2, Qt.DashLine)
+
+
+def blend_steering_stops(band):
+    """档位 (可为小数) 对应的渐变停止点，小数部分在相邻两档颜色之间插值
+    
+    回弹类缓动曲线会使补间中的档位越过两端，超出范围的档位按最近的一档处理
+    """
+    band = min(max(band, 0.0), len(STEERING_BANDS) - 1)
+    lower = int(band)
+    # 混合比例量化为 1/BAND_BLEND_STEPS，补间中的颜色组合有限，渐变缓存可以复用
+    fraction = round((band - lower) * BAND_BLEND_STEPS) / BAND_BLEND_STEPS
+    if fraction >= 1:
+        lower, fraction = lower + 1, 0.0
+    if fraction <= 0 or lower == len(STEERING_BANDS) - 1:
+        return STEERING_GRADIENT_STOPS[STEERING_BANDS[lower]]
+    upper_stops = STEERING_GRADIENT_STOPS[STEERING_BANDS[lower + 1]]
+    return tuple((position, mix_rgba(rgba, upper_rgba, fraction))
+                 for (position, rgba), (_, upper_rgba)
+                 in zip(STEERING_GRADIENT_STOPS[STEERING_BANDS[lower]], upper_stops))
 
 
 class ShipSteeringWidget(QWidget):
@@ -31,40 +83,210 @@ class ShipSteeringWidget(QWidget):
         self.trapezoid_top = 20
         self.trapezoid_bottom = 200
         
+        # 可选的转弯参数查找表，只在未设置动力学模型时决定梯形弯曲 (None表示每次按公式计算)
+        self.turn_table = None
+        
+        # 可选的船舶动力学模型 (None表示使用经验公式决定梯形弯曲)
+        # 与预测航迹缓存 (None表示每次重新预测)
+        self.dynamics_model = None
+        self.track_cache = None
+        self.show_predicted_track = True
+        self._track_polyline = None
+        
+        # 转向信息文字缓存为像素图，只在文字内容变化时重新排版
+        self.layers = LayerCache()
+        
+        # 转向补间: 上底横向偏移、控制点弯曲量 (带方向) 和颜色档位平滑过渡到新目标
+        self.tween = ParameterTween(self.steering_targets(), duration=0.25,
+                                    easing='ease_out_cubic')
+        self._display_geometry = None
+        self._tween_timer = QTimer(self)
+        self._tween_timer.setTimerType(Qt.PreciseTimer)
+        self._tween_timer.setInterval(round(1000 / display_refresh_rate()))
+        self._tween_timer.timeout.connect(self._advance_tween)
+        
+        # 沿转向线从船位向前流动的方向箭头 (None表示不显示，船舶静止时也不显示)，
+        # 显示期间按屏幕刷新率只重绘箭头所在的区域
+        self.flow_chevrons = ChevronFlow()
+        self._flow_timer = QTimer(self)
+        self._flow_timer.setTimerType(Qt.PreciseTimer)
+        self._flow_timer.setInterval(self._tween_timer.interval())
+        self._flow_timer.timeout.connect(self._advance_flow)
+        
         self.setFixedSize(500, 400)
         self.setStyleSheet("background-color: #001122; border: 2px solid #336699;")  # 海洋色调
     
     def set_steering_parameters(self, rudder_angle, turn_intensity, ship_speed):
-        """设置船舶转向参数"""
+        """设置船舶转向参数 (显示的梯形按补间过渡到新参数)"""
         self.rudder_angle = rudder_angle
         self.turn_intensity = turn_intensity
         self.ship_speed = ship_speed
+        
+        self.tween.retarget(self.steering_targets())
+        if self.tween.active and not self._tween_timer.isActive():
+            self._tween_timer.start()
+        self._update_flow_timer()
         self.update()
     
-    def calculate_turn_parameters(self):
-        """根据船舶参数计算转弯参数"""
-        # 1. 计算转向偏移 (基于舵角和船速)
-        # 物理原理：
-        # - 舵角越大，转向意图越强
-        # - 船速越快，转弯半径越大，转向越困难
-        # - 高速时相同舵角产生的弯曲效果应该更小
-        max_offset = 150  # 最大偏移像素
+    def set_easing(self, easing, duration=None):
+        """选择补间缓动曲线 (EASING_CURVES中的名称) 和时长 (秒)"""
+        self.tween.set_easing(easing)
+        if duration is not None:
+            self.tween.duration = duration
+    
+    def flow_visible(self):
+        """是否显示流动的方向箭头"""
+        return self.flow_chevrons is not None and self.ship_speed != 0
+    
+    def _update_flow_timer(self):
+        """可见且显示方向箭头时运行流动动画定时器，否则停止"""
+        if self.isVisible() and self.flow_visible():
+            if not self._flow_timer.isActive():
+                self._flow_timer.start()
+        else:
+            self._flow_timer.stop()
+    
+    def chevron_band_rect(self):
+        """方向箭头可能覆盖的区域: 两条转向线控制多边形的外接矩形，向外扩展一个箭头尺寸
         
-        # 舵角影响 (-30° 到 +30° 映射到 -1.0 到 +1.0)
-        angle_factor = self.rudder_angle / 30.0
+        二次曲线位于控制点的凸包内，箭头中心都在曲线上
+        """
+        geometry = self._display_geometry
+        if geometry is None:
+            return self.rect()
+        band = QPolygonF([geometry[key] for key in
+                          ('top_left', 'left_control', 'bottom_left',
+                           'top_right', 'right_control', 'bottom_right')]).boundingRect()
+        size = self.flow_chevrons.size
+        return band.adjusted(-size, -size, size, size).toAlignedRect()
+    
+    def _advance_flow(self):
+        """流动动画的一帧只重绘箭头所在的区域，不再显示箭头时停止定时器"""
+        if not self.flow_visible():
+            self._flow_timer.stop()
+            return
+        self.update(self.chevron_band_rect())
+    
+    def _advance_tween(self):
+        """补间进行中按屏幕刷新率重绘，结束后停止定时器"""
+        self.update()
+        if not self.tween.active:
+            self._tween_timer.stop()
+    
+    def steering_targets(self):
+        """当前参数对应的补间目标值
         
-        # 船速影响 (速度越快，转弯越困难，偏移量应该降低)
-        # 使用反比关系：速度越快，转向能力越弱
-        speed_factor = 10.0 / self.ship_speed  # 反比关系，速度快时因子小
+        设置了动力学模型时由预测航迹拟合得到梯形弯曲，否则查转弯参数表或使用经验公式
+        """
+        band = float(urgency_band(self.rudder_angle))
+        if self.dynamics_model is not None:
+            return {**self.predict_turn(), 'urgency_band': band}
         
-        # 转弯强度影响
-        intensity_factor = self.turn_intensity
+        lateral_offset, curve_offset = self.calculate_turn_parameters()
         
-        # 最终偏移计算
-        lateral_offset = angle_factor * max_offset * intensity_factor
-        curve_offset = abs(angle_factor) * speed_factor * intensity_factor * 50
+        # 颠倒偏移量正负值：右舵 → 向左弯曲，左舵 → 向右弯曲
+        if self.rudder_angle > 0:
+            bend = -curve_offset
+        elif self.rudder_angle < 0:
+            bend = curve_offset
+        else:
+            bend = 0.0
         
-        return lateral_offset, curve_offset
+        return {
+            'lateral_offset': lateral_offset,
+            'bend': bend,
+            'control_ratio': 0.5,
+            'urgency_band': band
+        }
+    
+    def predict_turn(self):
+        """用动力学模型预测航迹，并拟合为梯形中心线 (转弯强度线性缩放弯曲程度)
+        
+        Returns:
+            dict: 'lateral_offset' / 'bend' / 'control_ratio'
+        """
+        if self.track_cache is not None:
+            # 从相邻 (船速, 舵角) 桶的缓存航迹插值，航迹已按转弯强度横向放大
+            track = self.track_cache.track(self.ship_speed, self.rudder_angle,
+                                           self.turn_intensity)
+        else:
+            speed = max(self.ship_speed, MIN_PREDICTION_SPEED)
+            horizon = PREDICTION_LOOKAHEAD / (speed * KNOT) * PREDICTION_HORIZON_MARGIN
+            track = self.dynamics_model.predict_track(speed, self.rudder_angle, horizon,
+                                                      PREDICTION_STEPS)
+            track['x'] *= self.turn_intensity
+        
+        self._track_polyline = self.create_track_polyline(track)
+        fit = fit_display_curve(track, PREDICTION_LOOKAHEAD, self.trapezoid_height)
+        return {
+            'lateral_offset': float(fit['lateral_offset'][0]),
+            'bend': float(fit['bend'][0]),
+            'control_ratio': float(fit['control_ratio'][0])
+        }
+    
+    def create_track_polyline(self, track):
+        """预测航迹在梯形高度范围内的部分，转换为相对船位的像素折线"""
+        scale = self.trapezoid_height / PREDICTION_LOOKAHEAD
+        x, y = track['x'][0], track['y'][0]
+        beyond = np.flatnonzero(y > PREDICTION_LOOKAHEAD)
+        count = beyond[0] + 1 if beyond.size else len(y)
+        return QPolygonF([QPointF(px, -py) for px, py
+                          in zip((x[:count] * scale).tolist(), (y[:count] * scale).tolist())])
+    
+    def estimate_turn_radius(self):
+        """稳态转弯半径估算 (米)"""
+        if self.dynamics_model is not None:
+            return float(self.dynamics_model.turn_radius(self.ship_speed, self.rudder_angle))
+        # 简化的转弯半径计算 (未设置船舶动力学模型时)
+        return (self.ship_speed * 10) / abs(self.rudder_angle)
+    
+    def display_geometry(self, state):
+        """补间状态对应的显示几何 (在上一帧的几何上增量更新)
+        
+        下底、所有y坐标和上底宽度只与Widget尺寸有关，只在尺寸变化后创建一次；
+        每帧只原地更新随补间变化的上底x坐标和两个控制点
+        """
+        geometry = self._display_geometry
+        if geometry is None:
+            geometry = self._display_geometry = self.create_ship_trapezoid()
+            for side in ('left', 'right'):
+                geometry[f'{side}_control'] = QPointF()
+        
+        top_center_x = self.width() / 2 + state['lateral_offset']
+        geometry['top_left'].setX(top_center_x - self.trapezoid_top / 2)
+        geometry['top_right'].setX(top_center_x + self.trapezoid_top / 2)
+        
+        # 控制点位于从船位 (下底) 起算 control_ratio 高度处，相对腰线横向偏移bend
+        ratio = state['control_ratio']
+        for side in ('left', 'right'):
+            top, bottom = geometry[f'top_{side}'], geometry[f'bottom_{side}']
+            control = geometry[f'{side}_control']
+            control.setX(bottom.x() + (top.x() - bottom.x()) * ratio + state['bend'])
+            control.setY(bottom.y() + (top.y() - bottom.y()) * ratio)
+        return geometry
+    
+    def resizeEvent(self, event):
+        """尺寸变化后重新创建显示几何"""
+        self._display_geometry = None
+        super().resizeEvent(event)
+    
+    def showEvent(self, event):
+        """可见时启动方向箭头的流动动画"""
+        super().showEvent(event)
+        self._update_flow_timer()
+    
+    def hideEvent(self, event):
+        """不可见时停止流动动画"""
+        self._flow_timer.stop()
+        super().hideEvent(event)
+    
+    def calculate_turn_parameters(self):
+        """根据船舶参数计算转弯参数 (设置了查找表时查表，否则按公式计算)"""
+        if self.turn_table is not None:
+            lateral_offset, curve_offset, _ = self.turn_table.lookup(
+                self.rudder_angle, self.ship_speed, self.turn_intensity)
+            return lateral_offset, curve_offset
+        return turn_parameters(self.rudder_angle, self.ship_speed, self.turn_intensity)
     
     def create_ship_trapezoid(self):
         """创建船舶转向梯形"""
@@ -114,36 +336,48 @@ class ShipSteeringWidget(QWidget):
         path.quadTo(control_point, end_point)
         return path
     
-    def get_steering_gradient(self, start_point, end_point):
-        """获取转向强度渐变"""
-        gradient = QLinearGradient(start_point, end_point)
-        
-        # 根据转向紧急程度调整颜色
-        urgency = abs(self.rudder_angle) / 30.0  # 0.0 到 1.0
-        
-        if urgency < 0.3:  # 轻微转向 - 绿色
-            top_color = QColor("#00FF88")
-            middle_color = QColor("#88FFAA") 
-            bottom_color = QColor("#00FF88")
-        elif urgency < 0.7:  # 中等转向 - 黄色
-            top_color = QColor("#FFAA00")
-            middle_color = QColor("#FFDD88")
-            bottom_color = QColor("#FFAA00")
-        else:  # 急转 - 红色
-            top_color = QColor("#FF4444")
-            middle_color = QColor("#FF8888")
-            bottom_color = QColor("#FF4444")
-        
-        # 设置透明度
-        top_color.setAlpha(150)
-        middle_color.setAlpha(220)
-        bottom_color.setAlpha(150)
-        
-        gradient.setColorAt(0.0, top_color)
-        gradient.setColorAt(0.5, middle_color)
-        gradient.setColorAt(1.0, bottom_color)
-        
-        return gradient
+    def get_steering_gradient(self, start_point, end_point, band=None):
+        """获取转向强度渐变
+        
+        Args:
+            band: 紧急程度档位 (补间中可为小数)，None表示按当前舵角确定
+        """
+        # 根据转向紧急程度选择颜色: 轻微 - 绿色，中等 - 黄色，急转 - 红色
+        if band is None:
+            band = urgency_band(self.rudder_angle)
+        stops = blend_steering_stops(band)
+        
+        # 舵角不变时两条转向线的渐变直接从缓存复用
+        return DEFAULT_GRADIENT_CACHE.linear_gradient(start_point, end_point, stops)
+    
+    def info_text_lines(self):
+        """转向信息文字: ((x, y, 文字), ...)，同时作为文字图层的缓存键"""
+        lines = [
+            (10, 30, f"舵角: {self.rudder_angle:+.1f}°"),
+            (10, 50, f"转弯强度: {self.turn_intensity:.1f}"),
+            (10, 70, f"船速: {self.ship_speed:.1f} 节")
+        ]
+        
+        # 转向方向指示
+        if abs(self.rudder_angle) > 1:
+            direction = "右转" if self.rudder_angle > 0 else "左转"
+            urgency = "急转" if abs(self.rudder_angle) > 20 else "缓转"
+            lines.append((10, 100, f"转向: {direction} ({urgency})"))
+        else:
+            lines.append((10, 100, "转向: 直航"))
+        
+        # 转弯半径估算
+        if abs(self.rudder_angle) > 1:
+            turn_radius = self.estimate_turn_radius()
+            lines.append((10, 120, f"转弯半径: ~{turn_radius:.0f}m"))
+        
+        return tuple(lines)
+    
+    def draw_info_text(self, painter, lines):
+        """绘制转向信息文字"""
+        painter.setPen(SHIP_PALETTE.pen('text'))
+        for x, y, text in lines:
+            painter.drawText(x, y, text)
     
     def paintEvent(self, event):
         """绘制船舶转向引导"""
@@ -151,71 +385,46 @@ class ShipSteeringWidget(QWidget):
         painter.setRenderHint(QPainter.Antialiasing, True)
         
         try:
-            # 创建船舶转向梯形
-            trapezoid = self.create_ship_trapezoid()
-            
-            # 绘制左舷转向线
-            left_path = self.create_steering_curve(
-                trapezoid['top_left'], 
-                trapezoid['bottom_left'], 
-                trapezoid['curve_offset']
-            )
-            left_gradient = self.get_steering_gradient(
-                trapezoid['top_left'], 
-                trapezoid['bottom_left']
-            )
-            
-            left_pen = QPen()
-            left_pen.setBrush(left_gradient)
-            left_pen.setWidth(4)
-            left_pen.setCapStyle(Qt.RoundCap)
-            painter.setPen(left_pen)
-            painter.drawPath(left_path)
+            # 当前补间状态下的船舶转向梯形
+            state = self.tween.value_at()
+            trapezoid = self.display_geometry(state)
             
-            # 绘制右舷转向线
-            right_path = self.create_steering_curve(
-                trapezoid['top_right'], 
-                trapezoid['bottom_right'], 
-                trapezoid['curve_offset']
-            )
-            right_gradient = self.get_steering_gradient(
-                trapezoid['top_right'], 
-                trapezoid['bottom_right']
-            )
+            # 绘制左舷、右舷转向线 (描边轮廓按控制点缓存，补间结束后不再重新描边)
+            for side in ('left', 'right'):
+                start_point = trapezoid[f'top_{side}']
+                end_point = trapezoid[f'bottom_{side}']
+                gradient = self.get_steering_gradient(start_point, end_point,
+                                                      state['urgency_band'])
+                DEFAULT_STROKE_CACHE.draw_leg(painter, start_point, trapezoid[f'{side}_control'],
+                                              end_point, 4, gradient)
             
-            right_pen = QPen()
-            right_pen.setBrush(right_gradient)
-            right_pen.setWidth(4)
-            right_pen.setCapStyle(Qt.RoundCap)
-            painter.setPen(right_pen)
-            painter.drawPath(right_path)
+            # 方向箭头沿两条转向线的弧长等距排列，从图集中贴图
+            if self.flow_visible():
+                legs = [[(point.x(), point.y()) for point in
+                         (trapezoid[f'top_{side}'], trapezoid[f'{side}_control'],
+                          trapezoid[f'bottom_{side}'])] for side in ('left', 'right')]
+                self.flow_chevrons.draw(painter, legs)
             
             # 绘制船舶位置指示器 (下底中心)
             ship_center = QPointF(self.width() / 2, 
                                 (self.height() + self.trapezoid_height) / 2)
-            painter.setPen(QPen(QColor("#FFFFFF"), 3))
-            painter.setBrush(QColor("#FFFF00"))
-            painter.drawEllipse(ship_center, 8, 8)
             
-            # 绘制转向信息
-            painter.setPen(QColor("#FFFFFF"))
-            painter.drawText(10, 30, f"舵角: {self.rudder_angle:+.1f}°")
-            painter.drawText(10, 50, f"转弯强度: {self.turn_intensity:.1f}")
-            painter.drawText(10, 70, f"船速: {self.ship_speed:.1f} 节")
+            # 预测航迹叠加层 (折线相对船位，只在参数变化时重新生成)
+            if self.show_predicted_track and self._track_polyline is not None:
+                painter.save()
+                painter.translate(ship_center)
+                painter.setPen(TRACK_PEN)
+                painter.drawPolyline(self._track_polyline)
+                painter.restore()
             
-            # 转向方向指示
-            if abs(self.rudder_angle) > 1:
-                direction = "右转" if self.rudder_angle > 0 else "左转"
-                urgency = "急转" if abs(self.rudder_angle) > 20 else "缓转"
-                painter.drawText(10, 100, f"转向: {direction} ({urgency})")
-            else:
-                painter.drawText(10, 100, "转向: 直航")
+            painter.setPen(SHIP_PALETTE.pen('marker_outline', 3))
+            painter.setBrush(SHIP_PALETTE.brush('marker'))
+            painter.drawEllipse(ship_center, 8, 8)
             
-            # 绘制转弯半径估算
-            if abs(self.rudder_angle) > 1:
-                # 简化的转弯半径计算 (实际应用中需要更复杂的船舶动力学模型)
-                turn_radius = (self.ship_speed * 10) / abs(self.rudder_angle)
-                painter.drawText(10, 120, f"转弯半径: ~{turn_radius:.0f}m")
+            # 绘制转向信息 (文字不变时直接复用缓存的文字图层)
+            lines = self.info_text_lines()
+            self.layers.draw_layer(painter, 'info_text', lines,
+                                   lambda layer_painter: self.draw_info_text(layer_painter, lines))
             
         except Exception as e:
             print(f"绘图错误: {e}")
@@ -242,8 +451,13 @@ class ShipSteeringWindow(QMainWindow):
         title.setStyleSheet("font-size: 18px; font-weight: bold; margin: 10px; color: #003366;")
         layout.addWidget(title)
         
-        # 创建转向显示Widget
+        # 创建转向显示Widget: 梯形弯曲跟随Nomoto模型预测的航迹，航迹按 (船速, 舵角) 桶缓存
+        # (设置了动力学模型时不使用转弯参数查找表)
         self.steering_widget = ShipSteeringWidget()
+        self.steering_widget.dynamics_model = NomotoModel()
+        self.steering_widget.track_cache = TrackCache(
+            self.steering_widget.dynamics_model, PREDICTION_LOOKAHEAD,
+            PREDICTION_HORIZON_MARGIN, PREDICTION_STEPS)
         layout.addWidget(self.steering_widget)
         
         # 创建控制面板
@@ -282,12 +496,29 @@ class ShipSteeringWindow(QMainWindow):
         speed_layout.addWidget(self.speed_label)
         controls_layout.addLayout(speed_layout)
         
+        # 过渡曲线选择
+        easing_layout = QVBoxLayout()
+        easing_layout.addWidget(QLabel("过渡曲线:"))
+        self.easing_combo = QComboBox()
+        self.easing_combo.addItems(list(EASING_CURVES))
+        self.easing_combo.setCurrentText(self.steering_widget.tween.easing)
+        self.easing_combo.currentTextChanged.connect(self.steering_widget.set_easing)
+        easing_layout.addWidget(self.easing_combo)
+        controls_layout.addLayout(easing_layout)
+        
         layout.addLayout(controls_layout)
         
+        # 输入合并: 滑块和传感器样本只保留每个参数的最新值，每个刷新周期最多提交一次
+        self.input_coalescer = InputCoalescer(parent=self)
+        self.input_coalescer.flushed.connect(self.apply_steering)
+        
         # 连接事件
-        self.rudder_slider.valueChanged.connect(self.update_steering)
-        self.intensity_slider.valueChanged.connect(self.update_steering)
-        self.speed_slider.valueChanged.connect(self.update_steering)
+        self.rudder_slider.valueChanged.connect(
+            lambda value: self.input_coalescer.submit('rudder_angle', value / 10.0))
+        self.intensity_slider.valueChanged.connect(
+            lambda value: self.input_coalescer.submit('turn_intensity', value / 100.0))
+        self.speed_slider.valueChanged.connect(
+            lambda value: self.input_coalescer.submit('ship_speed', value))
         
         # 添加说明
         info_text = """
@@ -325,19 +556,27 @@ class ShipSteeringWindow(QMainWindow):
         )
         layout.addWidget(info_label)
     
-    def update_steering(self):
-        """更新转向参数"""
-        rudder_angle = self.rudder_slider.value() / 10.0  # 转换为度数
-        turn_intensity = self.intensity_slider.value() / 100.0
-        ship_speed = self.speed_slider.value()
-        
-        # 更新标签
-        self.rudder_label.setText(f"{rudder_angle:+.1f}°")
-        self.intensity_label.setText(f"{turn_intensity:.1f}")
-        self.speed_label.setText(f"{ship_speed} 节")
+    def submit_sensor_sample(self, name, value):
+        """接收传感器总线样本 (如 'rudder_angle')，与滑块输入一起合并限速"""
+        self.input_coalescer.submit(name, value)
+    
+    def apply_steering(self, changes):
+        """应用合并后的转向参数 (每个刷新周期最多一次)"""
+        widget = self.steering_widget
+        rudder_angle = changes.get('rudder_angle', widget.rudder_angle)
+        turn_intensity = changes.get('turn_intensity', widget.turn_intensity)
+        ship_speed = changes.get('ship_speed', widget.ship_speed)
+        
+        # 只更新变化了的标签
+        if 'rudder_angle' in changes:
+            self.rudder_label.setText(f"{rudder_angle:+.1f}°")
+        if 'turn_intensity' in changes:
+            self.intensity_label.setText(f"{turn_intensity:.1f}")
+        if 'ship_speed' in changes:
+            self.speed_label.setText(f"{ship_speed} 节")
         
         # 更新显示
-        self.steering_widget.set_steering_parameters(rudder_angle, turn_intensity, ship_speed)
+        widget.set_steering_parameters(rudder_angle, turn_intensity, ship_speed)
 
 
 def main():
@@ -46,6 +46,17 @@ RATIO_CONFIG = {
     'curve_ratio': 0.24  # 相对于高度的比例 (72/300 = 0.24)
 }
 
+def resolve_curve_offset(config):
+    """根据任一配置方案计算最终的横向偏移量 (像素)"""
+    if 'curve_amount' in config:
+        return config['curve_amount']
+    if 'curve_pixels' in config:
+        return config['curve_pixels']
+    if 'curve_ratio' in config:
+        return config['curve_ratio'] * config['height']
+    # 当前方法
+    return config.get('curve_intensity', 0) * config['height'] * config.get('control_point_ratio', 0)
+
 def analyze_configs():
     """分析不同配置方案"""
     
@@ -65,15 +76,7 @@ def analyze_configs():
         print(f"   参数列表: {list(config.keys())}")
         
         # 计算最终偏移量
-        if 'curve_amount' in config:
-            offset = config['curve_amount']
-        elif 'curve_pixels' in config:
-            offset = config['curve_pixels']
-        elif 'curve_ratio' in config:
-            offset = config['curve_ratio'] * config['height']
-        else:
-            # 当前方法
-            offset = config.get('curve_intensity', 0) * config['height'] * config.get('control_point_ratio', 0)
+        offset = resolve_curve_offset(config)
         
         print(f"   最终偏移: {offset:.1f}像素")
         
@@ -8,7 +8,10 @@
 import sys
 from PySide6.QtWidgets import QApplication, QMainWindow, QWidget
 from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QPainter, QLinearGradient, QPen, QColor, QPainterPath
+from PySide6.QtGui import QPainter, QPen, QColor, QPainterPath
+
+from gradient_cache import DEFAULT_GRADIENT_CACHE
+from palette import get_palette
 
 
 # 渐变颜色定义 (来自原始gradient_trapezoid.py)
@@ -19,6 +22,9 @@ GRADIENT_COLORS = {
     'outline': '#B7B286'   # 轮廓颜色
 }
 
+# 腰线渐变停止点 (主题只解析一次)
+LEG_GRADIENT_STOPS = get_palette('leg_gradient').gradient_stops()
+
 
 class Solution1Widget(QWidget):
     """方案1: 贝塞尔曲线边界填充Widget"""
@@ -90,26 +96,7 @@ class Solution1Widget(QWidget):
     
     def create_line_gradient(self, start_point, end_point):
         """创建腰线渐变 (来自gradient_trapezoid.py)"""
-        # 创建沿腰线方向的线性渐变
-        gradient = QLinearGradient(start_point, end_point)
-        
-        # 设置渐变颜色点
-        # 起点（上端）：#B6B384，完全透明（alpha=0）
-        top_color = QColor(GRADIENT_COLORS['top'])
-        top_color.setAlpha(0)  # 完全透明
-        gradient.setColorAt(0.0, top_color)
-        
-        # 中间（50%）：#FEFFAF，50%透明（alpha=127）
-        middle_color = QColor(GRADIENT_COLORS['middle'])
-        middle_color.setAlpha(127)  # 50%透明
-        gradient.setColorAt(0.5, middle_color)
-        
-        # 终点（下端）：#B7B286，完全透明（alpha=0）
-        bottom_color = QColor(GRADIENT_COLORS['bottom'])
-        bottom_color.setAlpha(0)  # 完全透明
-        gradient.setColorAt(1.0, bottom_color)
-        
-        return gradient
+        return DEFAULT_GRADIENT_CACHE.linear_gradient(start_point, end_point, LEG_GRADIENT_STOPS)
     
     def draw_curved_trapezoid(self, painter, geometry):
         """绘制弯曲梯形的渐变腰线"""
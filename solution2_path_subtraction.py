@@ -8,7 +8,11 @@
 import sys
 from PySide6.QtWidgets import QApplication, QMainWindow, QWidget
 from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QPainter, QLinearGradient, QPen, QColor, QPainterPath
+from PySide6.QtGui import QPainter, QPen, QColor, QPainterPath
+
+from analytic_fill import create_fill_path
+from gradient_cache import DEFAULT_GRADIENT_CACHE
+from palette import get_palette
 
 
 # 渐变颜色定义 (来自原始gradient_trapezoid.py)
@@ -19,6 +23,9 @@ GRADIENT_COLORS = {
     'outline': '#B7B286'   # 轮廓颜色
 }
 
+# 腰线渐变停止点 (主题只解析一次)
+LEG_GRADIENT_STOPS = get_palette('leg_gradient').gradient_stops()
+
 
 class Solution2Widget(QWidget):
     """方案2: 路径减法运算Widget"""
@@ -90,26 +97,7 @@ class Solution2Widget(QWidget):
     
     def create_line_gradient(self, start_point, end_point):
         """创建腰线渐变 (来自gradient_trapezoid.py)"""
-        # 创建沿腰线方向的线性渐变
-        gradient = QLinearGradient(start_point, end_point)
-        
-        # 设置渐变颜色点
-        # 起点（上端）：#B6B384，完全透明（alpha=0）
-        top_color = QColor(GRADIENT_COLORS['top'])
-        top_color.setAlpha(0)  # 完全透明
-        gradient.setColorAt(0.0, top_color)
-        
-        # 中间（50%）：#FEFFAF，50%透明（alpha=127）
-        middle_color = QColor(GRADIENT_COLORS['middle'])
-        middle_color.setAlpha(127)  # 50%透明
-        gradient.setColorAt(0.5, middle_color)
-        
-        # 终点（下端）：#B7B286，完全透明（alpha=0）
-        bottom_color = QColor(GRADIENT_COLORS['bottom'])
-        bottom_color.setAlpha(0)  # 完全透明
-        gradient.setColorAt(1.0, bottom_color)
-        
-        return gradient
+        return DEFAULT_GRADIENT_CACHE.linear_gradient(start_point, end_point, LEG_GRADIENT_STOPS)
     
     def draw_curved_trapezoid(self, painter, geometry):
         """绘制弯曲梯形的渐变腰线"""
@@ -224,7 +212,7 @@ class Solution2Widget(QWidget):
         return path
     
     def create_path_subtraction_fill(self, geometry):
-        """方案2: 路径减法运算 - 完整梯形减去左侧弓形"""
+        """方案2: 路径减法运算 - 完整梯形减去左侧弓形 (布尔运算的参考实现，供fill_benchmark对比)"""
         # 创建完整梯形路径
         full_trapezoid = self.create_full_trapezoid_path(geometry)
         
@@ -249,8 +237,8 @@ class Solution2Widget(QWidget):
             # 1. 创建梯形几何
             geometry = self.create_trapezoid_geometry()
             
-            # 2. 方案2: 路径减法运算填充
-            filled_path = self.create_path_subtraction_fill(geometry)
+            # 2. 填充区域与方案2的结果相同，重绘时直接构造，不再每帧执行路径布尔运算
+            filled_path = create_fill_path(geometry, self.position_ratio, self.curve_offset)
             painter.setBrush(QColor("#CBD900"))  # 设置填充颜色
             painter.setPen(Qt.NoPen)  # 不绘制边框
             painter.drawPath(filled_path)
@@ -278,6 +266,7 @@ class Solution2Widget(QWidget):
             painter.drawText(20, 280, "技术实现:")
             painter.drawText(20, 300, "• QPainterPath.subtracted() 方法")
             painter.drawText(20, 320, "• 布尔路径运算")
+            painter.drawText(20, 340, "• 重绘: 解析式填充路径 (analytic_fill)")
             
         except Exception as e:
             print(f"绘图错误: {e}")
@@ -6,9 +6,14 @@
 """
 
 import sys
+import numpy as np
 from PySide6.QtWidgets import QApplication, QMainWindow, QWidget
 from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QPainter, QLinearGradient, QPen, QColor, QPainterPath, QPolygonF
+from PySide6.QtGui import QPainter, QPen, QColor, QPainterPath, QPolygonF
+
+from bezier_batch import evaluate_quadratic, quadratic_segment_counts, uniform_t
+from gradient_cache import DEFAULT_GRADIENT_CACHE
+from palette import get_palette
 
 
 # 渐变颜色定义 (来自原始gradient_trapezoid.py)
@@ -19,6 +24,9 @@ GRADIENT_COLORS = {
     'outline': '#B7B286'   # 轮廓颜色
 }
 
+# 腰线渐变停止点 (主题只解析一次)
+LEG_GRADIENT_STOPS = get_palette('leg_gradient').gradient_stops()
+
 
 class Solution3Widget(QWidget):
     """方案3: 分段填充Widget"""
@@ -41,6 +49,9 @@ class Solution3Widget(QWidget):
         self.trapezoid_bottom_width = 500
         self.line_width = 3
         
+        # 腰线展平容差 (像素): 按弯曲程度自适应细分; 为None时固定采样20段
+        self.flatten_tolerance = 0.25
+        
         # 设置窗口
         self.setFixedSize(700, 500)
         self.setStyleSheet("background-color: #BDC5D5;")
@@ -90,26 +101,7 @@ class Solution3Widget(QWidget):
     
     def create_line_gradient(self, start_point, end_point):
         """创建腰线渐变 (来自gradient_trapezoid.py)"""
-        # 创建沿腰线方向的线性渐变
-        gradient = QLinearGradient(start_point, end_point)
-        
-        # 设置渐变颜色点
-        # 起点（上端）：#B6B384，完全透明（alpha=0）
-        top_color = QColor(GRADIENT_COLORS['top'])
-        top_color.setAlpha(0)  # 完全透明
-        gradient.setColorAt(0.0, top_color)
-        
-        # 中间（50%）：#FEFFAF，50%透明（alpha=127）
-        middle_color = QColor(GRADIENT_COLORS['middle'])
-        middle_color.setAlpha(127)  # 50%透明
-        gradient.setColorAt(0.5, middle_color)
-        
-        # 终点（下端）：#B7B286，完全透明（alpha=0）
-        bottom_color = QColor(GRADIENT_COLORS['bottom'])
-        bottom_color.setAlpha(0)  # 完全透明
-        gradient.setColorAt(1.0, bottom_color)
-        
-        return gradient
+        return DEFAULT_GRADIENT_CACHE.linear_gradient(start_point, end_point, LEG_GRADIENT_STOPS)
     
     def draw_curved_trapezoid(self, painter, geometry):
         """绘制弯曲梯形的渐变腰线"""
@@ -149,31 +141,34 @@ class Solution3Widget(QWidget):
         
         return left_control, right_control
     
-    def get_bezier_points_on_curve(self, start_point, end_point, num_points=10):
-        """获取贝塞尔曲线上的采样点"""
+    def get_bezier_points_on_curve(self, start_point, end_point, num_points=10, tolerance=None):
+        """获取贝塞尔曲线上的采样点
+        
+        指定tolerance (像素) 时忽略num_points，按曲线平直度自适应决定分段数
+        """
         # 计算控制点
         base_x = start_point.x() + (end_point.x() - start_point.x()) * self.position_ratio
         base_y = start_point.y() + (end_point.y() - start_point.y()) * self.position_ratio
         control_point = QPointF(base_x + self.curve_offset, base_y)
         
-        points = []
-        for i in range(num_points + 1):
-            t = i / num_points
-            # 二次贝塞尔曲线公式: B(t) = (1-t)²P₀ + 2(1-t)tP₁ + t²P₂
-            x = (1-t)**2 * start_point.x() + 2*(1-t)*t * control_point.x() + t**2 * end_point.x()
-            y = (1-t)**2 * start_point.y() + 2*(1-t)*t * control_point.y() + t**2 * end_point.y()
-            points.append(QPointF(x, y))
+        # 二次贝塞尔曲线公式: B(t) = (1-t)²P₀ + 2(1-t)tP₁ + t²P₂ (批量求值)
+        curve = np.array([[[start_point.x(), start_point.y()],
+                           [control_point.x(), control_point.y()],
+                           [end_point.x(), end_point.y()]]])
+        if tolerance is not None:
+            num_points = int(quadratic_segment_counts(curve, tolerance)[0])
+        samples = evaluate_quadratic(curve, uniform_t(num_points))[0]
         
-        return points
+        return [QPointF(x, y) for x, y in samples.tolist()]
     
     def create_core_trapezoid_segment(self, geometry):
         """创建核心梯形段（不包含弓形区域）"""
         # 获取贝塞尔曲线上的点
         left_curve_points = self.get_bezier_points_on_curve(
-            geometry['top_left'], geometry['bottom_left'], 20
+            geometry['top_left'], geometry['bottom_left'], 20, self.flatten_tolerance
         )
         right_curve_points = self.get_bezier_points_on_curve(
-            geometry['top_right'], geometry['bottom_right'], 20
+            geometry['top_right'], geometry['bottom_right'], 20, self.flatten_tolerance
         )
         
         # 创建核心区域多边形
@@ -200,7 +195,7 @@ class Solution3Widget(QWidget):
         """创建右侧弯曲段（右侧弓形区域）"""
         # 获取右侧贝塞尔曲线上的点
         right_curve_points = self.get_bezier_points_on_curve(
-            geometry['top_right'], geometry['bottom_right'], 20
+            geometry['top_right'], geometry['bottom_right'], 20, self.flatten_tolerance
         )
         
         # 创建右侧弓形多边形
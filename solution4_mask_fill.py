@@ -6,9 +6,15 @@
 """
 
 import sys
+import numpy as np
 from PySide6.QtWidgets import QApplication, QMainWindow, QWidget
 from PySide6.QtCore import Qt, QPointF, QRectF
-from PySide6.QtGui import QPainter, QLinearGradient, QPen, QColor, QPainterPath
+from PySide6.QtGui import QPainter, QPen, QColor, QPainterPath
+
+from analytic_fill import create_fill_path
+from gradient_cache import DEFAULT_GRADIENT_CACHE
+from palette import get_palette
+from trapezoid_geometry import LEG_ENDPOINTS, leg_bounds
 
 
 # 渐变颜色定义 (来自原始gradient_trapezoid.py)
@@ -19,6 +25,9 @@ GRADIENT_COLORS = {
     'outline': '#B7B286'   # 轮廓颜色
 }
 
+# 腰线渐变停止点 (主题只解析一次)
+LEG_GRADIENT_STOPS = get_palette('leg_gradient').gradient_stops()
+
 
 class Solution4Widget(QWidget):
     """方案4: 掩码填充Widget"""
@@ -90,26 +99,7 @@ class Solution4Widget(QWidget):
     
     def create_line_gradient(self, start_point, end_point):
         """创建腰线渐变 (来自gradient_trapezoid.py)"""
-        # 创建沿腰线方向的线性渐变
-        gradient = QLinearGradient(start_point, end_point)
-        
-        # 设置渐变颜色点
-        # 起点（上端）：#B6B384，完全透明（alpha=0）
-        top_color = QColor(GRADIENT_COLORS['top'])
-        top_color.setAlpha(0)  # 完全透明
-        gradient.setColorAt(0.0, top_color)
-        
-        # 中间（50%）：#FEFFAF，50%透明（alpha=127）
-        middle_color = QColor(GRADIENT_COLORS['middle'])
-        middle_color.setAlpha(127)  # 50%透明
-        gradient.setColorAt(0.5, middle_color)
-        
-        # 终点（下端）：#B7B286，完全透明（alpha=0）
-        bottom_color = QColor(GRADIENT_COLORS['bottom'])
-        bottom_color.setAlpha(0)  # 完全透明
-        gradient.setColorAt(1.0, bottom_color)
-        
-        return gradient
+        return DEFAULT_GRADIENT_CACHE.linear_gradient(start_point, end_point, LEG_GRADIENT_STOPS)
     
     def draw_curved_trapezoid(self, painter, geometry):
         """绘制弯曲梯形的渐变腰线"""
@@ -183,21 +173,23 @@ class Solution4Widget(QWidget):
         return mask_path
     
     def create_trapezoid_bounding_rect(self, geometry):
-        """创建梯形的边界矩形"""
-        # 找到所有点的边界
-        min_x = min(geometry['top_left'].x(), geometry['bottom_left'].x())
-        max_x = max(geometry['top_right'].x(), geometry['bottom_right'].x())
-        min_y = min(geometry['top_left'].y(), geometry['top_right'].y())
-        max_y = max(geometry['bottom_left'].y(), geometry['bottom_right'].y())
-        
-        # 扩展边界以包含贝塞尔曲线的控制点区域
-        margin = abs(self.curve_offset) + 20
-        
-        return QRectF(min_x - margin, min_y - margin, 
-                     max_x - min_x + 2*margin, max_y - min_y + 2*margin)
+        """创建梯形的边界矩形
+        
+        两条二次腰线的精确包围盒 (由导数零点求极值)，
+        不再按 |curve_offset| + 20 外扩，剪切填充的矩形面积与图形本身相当
+        """
+        curves = []
+        for start_key, end_key in LEG_ENDPOINTS.values():
+            start, end = geometry[start_key], geometry[end_key]
+            control_x = start.x() + (end.x() - start.x()) * self.position_ratio + self.curve_offset
+            control_y = start.y() + (end.y() - start.y()) * self.position_ratio
+            curves.append([(start.x(), start.y()), (control_x, control_y), (end.x(), end.y())])
+        
+        min_x, min_y, max_x, max_y = leg_bounds(np.array([curves]))[0].tolist()
+        return QRectF(QPointF(min_x, min_y), QPointF(max_x, max_y))
     
     def create_mask_fill_with_clipping(self, painter, geometry):
-        """方案4: 使用剪切路径进行掩码填充"""
+        """方案4: 使用剪切路径进行掩码填充 (布尔运算的参考实现，供fill_benchmark对比)"""
         # 1. 保存当前画笔状态
         painter.save()
         
@@ -230,8 +222,11 @@ class Solution4Widget(QWidget):
             # 1. 创建梯形几何
             geometry = self.create_trapezoid_geometry()
             
-            # 2. 方案4: 掩码填充
-            self.create_mask_fill_with_clipping(painter, geometry)
+            # 2. 填充区域与方案4的结果相同，重绘时直接构造，不再每帧执行路径布尔运算
+            filled_path = create_fill_path(geometry, self.position_ratio, self.curve_offset)
+            painter.setBrush(QColor("#CBD900"))  # 设置填充颜色
+            painter.setPen(Qt.NoPen)  # 不绘制边框
+            painter.drawPath(filled_path)
             
             # 3. 绘制弯曲梯形的渐变腰线 (在填充之上)
             left_control, right_control = self.draw_curved_trapezoid(painter, geometry)
@@ -255,6 +250,7 @@ class Solution4Widget(QWidget):
             painter.drawText(20, 280, "• QPainter.setClipPath()")
             painter.drawText(20, 300, "• 路径联合运算")
             painter.drawText(20, 320, "• 精确区域控制")
+            painter.drawText(20, 340, "• 重绘: 解析式填充路径 (analytic_fill)")
             
         except Exception as e:
             print(f"绘图错误: {e}")
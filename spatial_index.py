@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+弯曲梯形空间索引 (不依赖Qt)
+均匀网格索引大量弯曲梯形的包围盒，支持 "视口内有哪些梯形" 与 "光标下是哪个梯形"
+两类查询；后者在包围盒筛选后做精确的点在弯曲梯形内判断。
+参数变化时只更新包围盒所覆盖网格发生变化的部分
+"""
+
+from collections import defaultdict
+
+import numpy as np
+
+from bezier_batch import quadratic_x_at_y
+from trapezoid_geometry import leg_bounds, leg_control_polygons
+
+
+def points_in_trapezoids(legs, points):
+    """精确判断点是否在弯曲梯形内 (逐个梯形对应一个点)
+
+    上底与下底水平，点需位于两底之间，且横向位于该高度处两条腰线之间；
+    腰线交叉时按奇偶规则判断，与 trapezoid_geometry.fill_polygons 的填充区域一致
+
+    Args:
+        legs: (N, 2, 3, 2) 腰线控制多边形
+        points: (N, 2) 待测点
+
+    Returns:
+        np.ndarray: (N,) 布尔数组
+    """
+    legs = np.asarray(legs, dtype=np.float64)
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    x, y = points[:, 0], points[:, 1]
+
+    top = legs[:, 0, 0, 1]
+    bottom = legs[:, 0, 2, 1]
+    within = (y >= np.minimum(top, bottom)) & (y <= np.maximum(top, bottom))
+
+    left = quadratic_x_at_y(legs[:, 0], y)
+    right = quadratic_x_at_y(legs[:, 1], y)
+    return within & (x >= np.minimum(left, right)) & (x <= np.maximum(left, right))
+
+
+class TrapezoidGridIndex:
+    """弯曲梯形的均匀网格索引
+
+    每个梯形以调用方给出的键标识；包围盒覆盖的每个网格单元记录该键。
+    更新梯形时比较新旧包围盒覆盖的单元范围，只在增减的单元中改动。
+    """
+
+    def __init__(self, cell_size=64.0, bounds=leg_bounds):
+        """
+        Args:
+            cell_size: 网格单元边长 (像素)
+            bounds: 由 (N, 2, 3, 2) 腰线控制多边形计算 (N, 4) 包围盒的函数，
+                    默认为腰线的精确包围盒
+        """
+        self.cell_size = cell_size
+        self.bounds_function = bounds
+        self._cells = defaultdict(set)
+        self._slots = {}
+        self._keys = []
+        self._free = []
+        self._legs = np.empty((0, 2, 3, 2))
+        self._bounds = np.empty((0, 4))
+        self._ranges = np.empty((0, 4), dtype=np.int64)
+
+        # 网格单元的增删次数 (增量更新的工作量)
+        self.cell_changes = 0
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, key):
+        return key in self._slots
+
+    def _cell_range(self, bounds):
+        return np.floor(bounds / self.cell_size).astype(np.int64)
+
+    @staticmethod
+    def _cells_in(cell_range):
+        x0, y0, x1, y1 = cell_range
+        return {(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)}
+
+    def _allocate(self, key):
+        if self._free:
+            slot = self._free.pop()
+            self._keys[slot] = key
+        else:
+            slot = len(self._keys)
+            self._keys.append(key)
+            if slot >= len(self._legs):
+                capacity = max(16, 2 * len(self._legs))
+                self._legs = np.resize(self._legs, (capacity, 2, 3, 2))
+                self._bounds = np.resize(self._bounds, (capacity, 4))
+                self._ranges = np.resize(self._ranges, (capacity, 4))
+        self._slots[key] = slot
+        return slot
+
+    def update(self, keys, geometry):
+        """插入或更新梯形
+
+        Args:
+            keys: N个键 (可哈希)
+            geometry: create_trapezoid_geometry 返回的N个梯形 (可不含腰线采样点)
+        """
+        legs = leg_control_polygons(geometry)
+        bounds = self.bounds_function(legs)
+        ranges = self._cell_range(bounds)
+
+        for key, leg, bound, cell_range in zip(keys, legs, bounds, ranges):
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._allocate(key)
+                old_cells = set()
+            elif np.array_equal(self._ranges[slot], cell_range):
+                old_cells = None
+            else:
+                old_cells = self._cells_in(self._ranges[slot].tolist())
+
+            if old_cells is not None:
+                new_cells = self._cells_in(cell_range.tolist())
+                for cell in old_cells - new_cells:
+                    self._cells[cell].discard(key)
+                    if not self._cells[cell]:
+                        del self._cells[cell]
+                for cell in new_cells - old_cells:
+                    self._cells[cell].add(key)
+                self.cell_changes += len(old_cells ^ new_cells)
+
+            self._legs[slot] = leg
+            self._bounds[slot] = bound
+            self._ranges[slot] = cell_range
+
+    def remove(self, key):
+        """移除梯形 (键不存在时抛出KeyError)"""
+        slot = self._slots.pop(key)
+        for cell in self._cells_in(self._ranges[slot].tolist()):
+            self._cells[cell].discard(key)
+            if not self._cells[cell]:
+                del self._cells[cell]
+            self.cell_changes += 1
+        self._keys[slot] = None
+        self._free.append(slot)
+
+    def bounds(self, key):
+        """梯形的包围盒 (min_x, min_y, max_x, max_y)"""
+        return tuple(self._bounds[self._slots[key]].tolist())
+
+    def _ordered_slots(self, keys):
+        """候选键对应的槽位，按槽位排序使结果顺序稳定"""
+        return np.array(sorted(self._slots[key] for key in keys), dtype=np.intp)
+
+    def query_rect(self, left, top, right, bottom):
+        """包围盒与矩形相交的梯形键列表"""
+        x0, y0, x1, y1 = self._cell_range(np.array([left, top, right, bottom])).tolist()
+        candidates = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                candidates.update(self._cells.get((cx, cy), ()))
+        if not candidates:
+            return []
+
+        slots = self._ordered_slots(candidates)
+        min_x, min_y, max_x, max_y = self._bounds[slots].T
+        hit = (max_x >= left) & (min_x <= right) & (max_y >= top) & (min_y <= bottom)
+        return [self._keys[slot] for slot in slots[hit]]
+
+    def hit_test(self, x, y):
+        """包含点 (x, y) 的梯形键列表 (精确判断)"""
+        cell = tuple(self._cell_range(np.array([x, y])).tolist())
+        candidates = self._cells.get(cell)
+        if not candidates:
+            return []
+
+        slots = self._ordered_slots(candidates)
+        point = np.broadcast_to(np.array([x, y], dtype=np.float64), (len(slots), 2))
+        inside = points_in_trapezoids(self._legs[slots], point)
+        return [self._keys[slot] for slot in slots[inside]]
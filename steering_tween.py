@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+转向参数补间
+新的舵角到来时，显示值从当前 (可能正处于上一段补间中) 的值出发，
+按可选的缓动曲线在 duration 秒内过渡到目标值，而不是直接跳变
+"""
+
+import time
+
+from PySide6.QtCore import QEasingCurve
+
+
+# 可选的缓动曲线名称 → QEasingCurve类型
+EASING_CURVES = {
+    'linear': QEasingCurve.Linear,
+    'ease_in': QEasingCurve.InQuad,
+    'ease_out': QEasingCurve.OutQuad,
+    'ease_in_out': QEasingCurve.InOutQuad,
+    'ease_out_cubic': QEasingCurve.OutCubic,
+    'ease_in_out_cubic': QEasingCurve.InOutCubic,
+    'ease_out_back': QEasingCurve.OutBack,
+    'ease_out_elastic': QEasingCurve.OutElastic
+}
+
+
+class ParameterTween:
+    """多个标量参数的补间
+
+    所有参数共享同一段时间轴和缓动曲线；retarget() 以当前显示值为新的起点，
+    因此补间过程中收到新目标时显示值保持连续
+    """
+
+    def __init__(self, values, duration=0.25, easing='ease_out_cubic'):
+        """
+        Args:
+            values: 初始值字典 (参数名 → 浮点数)
+            duration: 补间时长 (秒)，0表示直接跳到目标值
+            easing: EASING_CURVES中的名称
+        """
+        self.duration = duration
+        self.set_easing(easing)
+        self._start = dict(values)
+        self._end = dict(values)
+        self._start_time = 0.0
+        self._progress = 1.0
+
+    def set_easing(self, easing):
+        """选择缓动曲线"""
+        self.easing = easing
+        self._curve = QEasingCurve(EASING_CURVES[easing])
+
+    @property
+    def active(self):
+        """补间是否仍在进行"""
+        return self._progress < 1.0
+
+    @property
+    def target(self):
+        return dict(self._end)
+
+    def retarget(self, targets, now=None):
+        """从当前显示值开始向新目标补间"""
+        now = time.perf_counter() if now is None else now
+        self._start = self.value_at(now)
+        self._end = {**self._start, **targets}
+        self._start_time = now
+        self._progress = 0.0 if self.duration > 0 else 1.0
+
+    def value_at(self, now=None):
+        """在时间 now 的显示值"""
+        now = time.perf_counter() if now is None else now
+        if self._progress < 1.0:
+            self._progress = min(1.0, (now - self._start_time) / self.duration)
+        if self._progress >= 1.0:
+            return dict(self._end)
+
+        eased = self._curve.valueForProgress(self._progress)
+        return {name: start + (self._end[name] - start) * eased
+                for name, start in self._start.items()}
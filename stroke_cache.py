@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+腰线描边轮廓缓存
+宽画笔描边时Qt每次重绘都要重新计算曲线两侧的偏移轮廓。这里用QPainterPathStroker
+把 "腰线 + 线宽 + 端点样式" 转换为填充轮廓并缓存，腰线不变的重绘直接用原画笔的画刷填充轮廓，
+与设置画笔后 drawPath 的像素结果一致
+"""
+
+from PySide6.QtCore import Qt, QPointF
+from PySide6.QtGui import QPainterPath, QPainterPathStroker
+
+from lru_cache import LRUCache
+
+
+class StrokeCache(LRUCache):
+    """二次腰线描边轮廓的LRU缓存
+
+    缓存键 = (量化后的起点、控制点、终点, 线宽, 端点样式, 连接样式)。轮廓总是用量化后的
+    控制点生成，因此无论是否命中，相同输入得到的轮廓完全一致。
+    返回的轮廓对象被多个调用方共享，调用方不应修改它。
+    """
+
+    def __init__(self, max_size=256, quantum=0.01):
+        """
+        Args:
+            max_size: 最多缓存的轮廓数量，超出时淘汰最久未使用的
+            quantum: 控制点量化步长 (像素)，应远小于一个像素，避免补间中的腰线位置跳动
+        """
+        super().__init__(max_size)
+        self.quantum = quantum
+
+    def _quantize(self, value):
+        return round(value / self.quantum) * self.quantum
+
+    def _entry(self, start_point, control_point, end_point, width, cap_style, join_style):
+        """(腰线路径, 描边轮廓)，未命中时生成"""
+        key = (self._quantize(start_point.x()), self._quantize(start_point.y()),
+               self._quantize(control_point.x()), self._quantize(control_point.y()),
+               self._quantize(end_point.x()), self._quantize(end_point.y()),
+               width, cap_style, join_style)
+
+        entry = self._get(key)
+        if entry is not None:
+            return entry
+
+        path = QPainterPath(QPointF(key[0], key[1]))
+        path.quadTo(QPointF(key[2], key[3]), QPointF(key[4], key[5]))
+
+        stroker = QPainterPathStroker()
+        stroker.setWidth(width)
+        stroker.setCapStyle(cap_style)
+        stroker.setJoinStyle(join_style)
+        entry = (path, stroker.createStroke(path))
+
+        self._put(key, entry)
+        return entry
+
+    def outline(self, start_point, control_point, end_point, width,
+                cap_style=Qt.RoundCap, join_style=Qt.BevelJoin):
+        """获取二次腰线 start_point → control_point → end_point 的描边轮廓
+
+        Args:
+            start_point, control_point, end_point: QPointF
+            width: 线宽 (与 QPen.setWidth 相同)
+            cap_style: 端点样式
+            join_style: 连接样式 (默认与QPen相同)
+
+        Returns:
+            QPainterPath: 共享的填充轮廓 (WindingFill)
+        """
+        return self._entry(start_point, control_point, end_point, width,
+                           cap_style, join_style)[1]
+
+    def draw_leg(self, painter, start_point, control_point, end_point, width, brush,
+                 cap_style=Qt.RoundCap):
+        """绘制腰线，等价于 setPen(以brush为画刷、宽width的画笔) 后 drawPath
+
+        与drawPath一样，painter当前设置了画刷时先用它填充曲线与弦围成的区域
+        """
+        path, outline = self._entry(start_point, control_point, end_point, width, cap_style,
+                                    Qt.BevelJoin)
+        if painter.brush().style() != Qt.NoBrush:
+            painter.fillPath(path, painter.brush())
+        painter.fillPath(outline, brush)
+
+
+# 所有Widget共享的默认缓存
+DEFAULT_STROKE_CACHE = StrokeCache()
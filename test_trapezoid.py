@@ -8,19 +8,30 @@ import sys
 import unittest
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import QPointF, Qt
-from PySide6.QtGui import QColor
+from PySide6.QtGui import QColor, QImage
 
 # 导入我们的梯形Widget
 from gradient_trapezoid import TrapezoidWidget
 
 
-class TestTrapezoidGeometry(unittest.TestCase):
-    """测试梯形几何计算"""
-    
+class QtTestCase(unittest.TestCase):
+    """需要QApplication的测试 (所有测试类共用一个实例)"""
+
     @classmethod
     def setUpClass(cls):
         """设置测试环境"""
-        cls.app = QApplication(sys.argv)
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+
+def transparent_image(width, height, image_format=QImage.Format_ARGB32_Premultiplied):
+    """透明背景的测试画布"""
+    image = QImage(width, height, image_format)
+    image.fill(Qt.transparent)
+    return image
+
+
+class TestTrapezoidGeometry(QtTestCase):
+    """测试梯形几何计算"""
     
     def setUp(self):
         """每个测试前的设置"""
@@ -223,5 +234,584 @@ class TestTrapezoidGeometry(unittest.TestCase):
         print(f"  向右偏移: {path_mid.x() - straight_mid_x:.1f}像素")
 
 
+class TestGradientCache(QtTestCase):
+    """测试渐变对象缓存"""
+
+    def test_line_gradient_reuse(self):
+        """测试腰线渐变按端点和颜色缓存复用"""
+        from gradient_cache import GradientCache
+        
+        cache = GradientCache(max_size=2, quantum=0.5)
+        stops = ((0.0, "#B6B384", 0), (0.5, "#FEFFAF", 127), (1.0, "#B7B286", 0))
+        
+        first = cache.linear_gradient(QPointF(100, 50), QPointF(50, 350), stops)
+        # 量化步长内的微小抖动应命中同一个渐变
+        second = cache.linear_gradient(QPointF(100.1, 50), QPointF(50, 349.9), stops)
+        self.assertIs(first, second, "相同端点和颜色应复用渐变对象")
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+        
+        # 渐变用量化后的端点创建，颜色停止点与输入一致
+        self.assertEqual((first.start(), first.finalStop()), (QPointF(100, 50), QPointF(50, 350)))
+        self.assertEqual([(position, color.name().upper(), color.alpha())
+                          for position, color in first.stops()],
+                         [(0.0, "#B6B384", 0), (0.5, "#FEFFAF", 127), (1.0, "#B7B286", 0)])
+        
+        # 超出容量时淘汰最久未使用的渐变，重新创建的渐变与被淘汰的相同
+        cache.linear_gradient(QPointF(0, 0), QPointF(0, 100), stops)
+        cache.linear_gradient(QPointF(0, 0), QPointF(0, 200), stops)
+        self.assertEqual(cache.evictions, 1)
+        self.assertAlmostEqual(cache.hit_rate, 0.25)
+        rebuilt = cache.linear_gradient(QPointF(100, 50), QPointF(50, 350), stops)
+        self.assertIsNot(rebuilt, first)
+        self.assertEqual((rebuilt.start(), rebuilt.finalStop(), rebuilt.stops()),
+                         (first.start(), first.finalStop(), first.stops()))
+
+
+class TestPalette(QtTestCase):
+    """测试调色板"""
+
+    def test_palette_parsing(self):
+        """测试调色板一次解析、预乘和对象复用"""
+        from palette import get_palette, parse_hex_color, premultiply, RGBA
+
+        self.assertEqual(parse_hex_color("#FEFFAF", 127), RGBA(254, 255, 175, 127))
+        self.assertEqual(premultiply(RGBA(254, 255, 175, 127)), RGBA(127, 127, 87, 127))
+        with self.assertRaises(ValueError):
+            parse_hex_color("#FFF")
+
+        palette = get_palette('leg_gradient')
+        self.assertIs(palette, get_palette('leg_gradient'), "主题应只解析一次")
+        self.assertIs(palette.brush('middle'), palette.brush('middle'))
+        self.assertIs(palette.pen('middle', 2), palette.pen('middle', 2))
+        self.assertEqual(palette.brush('middle').color().getRgb(), (254, 255, 175, 127))
+        self.assertEqual(palette.pen('middle', 2).widthF(), 2.0)
+
+        # 调色板停止点与原有的字符串停止点生成相同的渐变
+        from gradient_cache import GradientCache
+        cache = GradientCache()
+        legacy = ((0.0, "#B6B384", 0), (0.5, "#FEFFAF", 127), (1.0, "#B7B286", 0))
+        expected = cache.linear_gradient(QPointF(0, 0), QPointF(0, 100), legacy)
+        actual = cache.linear_gradient(QPointF(0, 0), QPointF(0, 100), palette.gradient_stops())
+        self.assertEqual([(p, c.rgba()) for p, c in actual.stops()],
+                         [(p, c.rgba()) for p, c in expected.stops()])
+
+
+class TestLayerCache(QtTestCase):
+    """测试分层渲染缓存"""
+
+    def test_layered_rendering(self):
+        """测试背景与参数文字图层只在输入变化时重新绘制"""
+        from core_curved_trapezoid import CoreCurvedTrapezoidWidget
+
+        widget = CoreCurvedTrapezoidWidget()
+        first = widget.grab().toImage()
+        self.assertEqual(widget.layers.misses, 2, "首帧应绘制背景层和文字层")
+
+        second = widget.grab().toImage()
+        self.assertEqual(widget.layers.hits, 2, "参数未变时应复用两个图层")
+        self.assertEqual(first, second, "复用图层的画面应与首帧一致")
+
+        # 不改变格式化文字的微小变化不会使文字层失效
+        widget.curve_offset = 200.2
+        widget.grab()
+        self.assertEqual(widget.layers.misses, 2)
+
+        widget.curve_offset = 150
+        changed = widget.grab().toImage()
+        self.assertEqual(widget.layers.misses, 3, "参数文字变化时只重绘文字层")
+        self.assertNotEqual(changed, first)
+
+        # 复用背景层的画面与从头绘制的画面逐像素一致
+        fresh = CoreCurvedTrapezoidWidget()
+        fresh.curve_offset = 150
+        self.assertEqual(changed, fresh.grab().toImage())
+
+
+class TestDirtyRect(QtTestCase):
+    """测试局部重绘"""
+
+    def test_dirty_rect_update(self):
+        """测试参数变化时只重绘新旧梯形外接矩形的并集"""
+        from complete_curve_control import CompleteTrapezoidWidget
+
+        widget = CompleteTrapezoidWidget()
+        widget.resize(1000, 600)
+        requested = []
+        widget.update = lambda *args: requested.append(args)
+
+        previous = widget._shape_bounds()
+        widget.set_parameters(150, 40, 0.4)
+        current = widget._shape_bounds()
+
+        self.assertEqual(len(requested), 1)
+        self.assertEqual(len(requested[0]), 1, "应只请求重绘一个矩形区域")
+        dirty = requested[0][0]
+        self.assertTrue(dirty.contains(previous) and dirty.contains(current))
+        self.assertLess(dirty.width() * dirty.height(), widget.width() * widget.height())
+
+        # 外接矩形覆盖实际描边的腰线
+        for start, end in (('top_left', 'bottom_left'), ('top_right', 'bottom_right')):
+            geometry = widget._create_trapezoid_geometry()
+            path = widget._create_curved_path(geometry[start], geometry[end])
+            self.assertTrue(current.contains(path.boundingRect().toAlignedRect()))
+
+        # 参考线贯穿全高，显示时退回整体重绘
+        widget.show_guides = True
+        widget.set_parameters(0, 0, 0.5)
+        self.assertEqual(requested[-1], ())
+
+
+class TestInputCoalescer(QtTestCase):
+    """测试输入合并与限速"""
+
+    def test_input_coalescing(self):
+        """测试高频输入按参数合并并限速提交"""
+        from PySide6.QtTest import QTest
+        from ship_steering_guidance import ShipSteeringWindow
+
+        window = ShipSteeringWindow()
+        coalescer = window.input_coalescer
+        coalescer.set_max_rate(5)
+        flushed = []
+        coalescer.flushed.connect(flushed.append)
+
+        # 模拟传感器突发: 同一刷新周期内的300个舵角样本
+        for i in range(300):
+            window.submit_sensor_sample('rudder_angle', i / 10.0)
+        window.submit_sensor_sample('ship_speed', 12)
+        window.submit_sensor_sample('ship_speed', 12)
+        self.assertEqual(flushed, [], "提交应推迟到事件循环")
+
+        QTest.qWait(50)
+        self.assertEqual(flushed, [{'rudder_angle': 29.9, 'ship_speed': 12}])
+        self.assertEqual(coalescer.merged, 299)
+        self.assertEqual(coalescer.dropped, 1)
+        self.assertEqual(window.steering_widget.rudder_angle, 29.9)
+        self.assertEqual(window.rudder_label.text(), "+29.9°")
+
+        # 与已提交值相同的样本直接丢弃，不触发提交
+        window.submit_sensor_sample('ship_speed', 12)
+        self.assertEqual(coalescer.dropped, 2)
+        self.assertEqual(coalescer.pending, {})
+
+        # 上次提交后的一个周期 (200ms) 内不会再次提交
+        window.submit_sensor_sample('rudder_angle', -5.0)
+        QTest.qWait(20)
+        self.assertEqual(coalescer.flushes, 1)
+        QTest.qWait(250)
+        self.assertEqual(coalescer.flushes, 2)
+
+
+class TestAnimationEngine(QtTestCase):
+    """测试固定步长动画引擎"""
+
+    def test_fixed_timestep_animation(self):
+        """测试固定步长推进与插值显示不受帧间隔影响"""
+        from animation_engine import AnimationEngine
+
+        presented = []
+        engine = AnimationEngine((0.0,), lambda state, dt: (state[0] + dt,), presented.append,
+                                 fixed_dt=0.01, max_rate=60)
+
+        # 不规则的帧间隔: 模拟时间只按整步推进，显示值按剩余时间插值，
+        # 始终比真实经过的时间滞后一个步长
+        elapsed = 0.0
+        for frame_time in (0.016, 0.017, 0.004, 0.033, 0.015):
+            engine.advance(frame_time)
+            elapsed += frame_time
+            self.assertAlmostEqual(presented[-1][0], elapsed - 0.01, places=9)
+        self.assertAlmostEqual(engine.state[0], 0.08, places=9)
+
+        # 长时间卡顿后最多追赶 MAX_STEPS_PER_FRAME 步
+        engine.advance(1.0)
+        self.assertAlmostEqual(engine.state[0], 0.16, places=9)
+
+
+class TestSteeringTween(QtTestCase):
+    """测试转向参数补间"""
+
+    def test_steering_tween(self):
+        """测试转向参数补间从当前显示值连续过渡到新目标"""
+        from steering_tween import ParameterTween
+        from ship_steering_guidance import ShipSteeringWidget, blend_steering_stops, STEERING_GRADIENT_STOPS
+
+        tween = ParameterTween({'bend': 0.0}, duration=1.0, easing='linear')
+        tween.retarget({'bend': 100.0}, now=0.0)
+        self.assertAlmostEqual(tween.value_at(0.25)['bend'], 25.0)
+        # 补间中途改变目标: 从当前显示值出发，不发生跳变
+        tween.retarget({'bend': -100.0}, now=0.5)
+        self.assertAlmostEqual(tween.value_at(0.5)['bend'], 50.0)
+        self.assertAlmostEqual(tween.value_at(1.0)['bend'], -25.0)
+        self.assertEqual(tween.value_at(2.0), {'bend': -100.0})
+        self.assertFalse(tween.active)
+
+        # 颜色档位之间按比例混合，整数档位与原有停止点一致
+        self.assertEqual(blend_steering_stops(2.0), STEERING_GRADIENT_STOPS['hard'])
+        self.assertEqual(blend_steering_stops(0.5)[1][1].alpha, 220)
+        # 回弹缓动使档位越界时按最近的一档着色
+        self.assertEqual(blend_steering_stops(-1.2), STEERING_GRADIENT_STOPS['gentle'])
+        self.assertEqual(blend_steering_stops(-0.4), STEERING_GRADIENT_STOPS['gentle'])
+        self.assertEqual(blend_steering_stops(2.98), STEERING_GRADIENT_STOPS['hard'])
+        self.assertEqual(blend_steering_stops(3.1), STEERING_GRADIENT_STOPS['hard'])
+
+        # 补间结束后增量更新的显示几何与从头创建的几何一致
+        widget = ShipSteeringWidget()
+        widget.set_easing('ease_in_out', duration=0)
+        widget.set_steering_parameters(-12, 1.5, 8)
+        geometry = widget.display_geometry(widget.tween.value_at())
+        expected = widget.create_ship_trapezoid()
+        for key in ('top_left', 'top_right', 'bottom_left', 'bottom_right'):
+            self.assertEqual(geometry[key], expected[key])
+        self.assertAlmostEqual(geometry['left_control'].x(),
+                               (expected['top_left'].x() + expected['bottom_left'].x()) / 2
+                               + expected['curve_offset'])
+
+
+class TestGuidanceOverlay(QtTestCase):
+    """测试多目标引导叠加层"""
+
+    def test_guidance_overlay(self):
+        """测试多目标叠加层: 批量路径与逐个构建的路径一致，视口外目标被剔除"""
+        from PySide6.QtCore import QRectF
+        from PySide6.QtGui import QPainter, QPainterPath
+        import numpy as np
+        from guidance_overlay import GuidanceOverlayRenderer
+
+        overlay = GuidanceOverlayRenderer(trapezoid_height=60, top_width=6, bottom_width=40)
+        overlay.set_targets([[100, 200], [300, 250], [2000, 2000]],
+                            top_offset=[20, -10, 0], curve_offset=[15, -5, 0],
+                            position_ratio=0.5, urgency=[0.1, 0.1, 0.9])
+
+        paths = overlay.band_paths(QRectF(0, 0, 600, 400))
+        self.assertEqual((overlay.drawn, overlay.culled), (2, 1))
+        self.assertEqual([band for band, _ in paths], [0])
+        path = paths[0][1]
+        self.assertEqual(path.elementCount(), 18)
+        self.assertEqual(path.fillRule(), Qt.WindingFill)
+
+        # 第一个目标: 下底中心 (100, 200)，上底中心右移20，控制点右移15
+        expected = QPainterPath()
+        expected.moveTo(123, 140)
+        expected.quadTo(QPointF(121.5 + 15, 170), QPointF(120, 200))
+        expected.lineTo(80, 200)
+        expected.quadTo(QPointF(98.5 + 15, 170), QPointF(117, 140))
+        expected.closeSubpath()
+        first = path.toSubpathPolygons()[0]
+        for point, reference in zip(first, expected.toSubpathPolygons()[0]):
+            self.assertAlmostEqual(point.x(), reference.x())
+            self.assertAlmostEqual(point.y(), reference.y())
+
+        # 视口不变时复用路径，航向旋转90°后目标朝右
+        self.assertIs(overlay.band_paths(QRectF(0, 0, 600, 400)), paths)
+        overlay.set_targets([[100, 200]], 0, heading=np.pi / 2)
+        bounds = overlay.band_paths()[0][1].boundingRect()
+        self.assertAlmostEqual(bounds.left(), 100)
+        self.assertAlmostEqual(bounds.right(), 160)
+
+        # 绘制结果: 梯形内部为档位主题的填充色，梯形外保持透明
+        overlay.set_targets([[100, 200]], top_offset=20, curve_offset=15)
+        image = transparent_image(300, 300, QImage.Format_ARGB32)
+        painter = QPainter(image)
+        overlay.render(painter, QRectF(0, 0, 300, 300))
+        painter.end()
+        fill = overlay.palettes[0].brush('top').color()
+        self.assertEqual(image.pixelColor(110, 190), fill)
+        for x, y in ((100, 205), (150, 100), (100, 170)):
+            self.assertEqual(image.pixelColor(x, y).alpha(), 0)
+
+
+class TestPathBatch(QtTestCase):
+    """测试批量构建QPainterPath"""
+
+    def test_path_from_elements_fallback(self):
+        """测试字节序列化构建的路径与逐个元素构建的一致，自检失败时改用逐个元素构建"""
+        from unittest import mock
+        import numpy as np
+        from PySide6.QtGui import QPainterPath
+        import path_batch
+        from guidance_overlay import PATH_ELEMENT_TYPES
+        from path_batch import path_from_elements
+
+        points = np.random.default_rng(0).uniform(0, 100, (len(PATH_ELEMENT_TYPES) * 3, 2))
+        types = np.tile(PATH_ELEMENT_TYPES, 3)
+        self.assertTrue(path_batch.stream_layout_supported())
+        fast = path_from_elements(points, types, Qt.OddEvenFill)
+
+        with mock.patch.object(path_batch, '_path_from_stream') as stream:
+            with mock.patch.object(path_batch, '_stream_layout_ok', False):
+                plain = path_from_elements(points, types, Qt.OddEvenFill)
+            stream.assert_not_called()
+
+        self.assertEqual(fast.fillRule(), Qt.OddEvenFill)
+        self.assertEqual(plain.fillRule(), Qt.OddEvenFill)
+        self.assertEqual(fast.elementCount(), len(points))
+        self.assertEqual(plain.elementCount(), len(points))
+        for index, (x, y) in enumerate(points.tolist()):
+            for path in (fast, plain):
+                element = path.elementAt(index)
+                self.assertEqual((element.type, element.x, element.y),
+                                 (QPainterPath.ElementType(int(types[index])), x, y))
+
+
+    def test_closed_subpaths_join(self):
+        """测试回到起点的子路径与closeSubpath()构建的路径描边结果一致 (拐角为连接而不是端点)"""
+        from unittest import mock
+        import numpy as np
+        from PySide6.QtCore import QRectF
+        from PySide6.QtGui import QPainter, QPainterPath, QPen
+        import path_batch
+        from guidance_overlay import PATH_ELEMENT_TYPES, GuidanceOverlayRenderer
+
+        overlay = GuidanceOverlayRenderer(trapezoid_height=60, top_width=6, bottom_width=40)
+        overlay.set_targets([[60, 90], [140, 100]], top_offset=[10, -15], curve_offset=[12, -8])
+        points = overlay._elements.reshape(-1, 2)
+        types = np.tile(PATH_ELEMENT_TYPES, 2)
+
+        reference = QPainterPath()
+        for target in overlay._elements.tolist():
+            reference.moveTo(*target[0])
+            reference.cubicTo(*target[1], *target[2], *target[3])
+            reference.lineTo(*target[4])
+            reference.cubicTo(*target[5], *target[6], *target[7])
+            reference.closeSubpath()
+
+        def stroked(path):
+            image = transparent_image(200, 120)
+            painter = QPainter(image)
+            painter.setRenderHint(QPainter.Antialiasing)
+            pen = QPen(QColor("#000000"), 8)
+            pen.setJoinStyle(Qt.MiterJoin)
+            pen.setCapStyle(Qt.FlatCap)
+            painter.setPen(pen)
+            painter.drawPath(path)
+            painter.end()
+            return image
+
+        expected = stroked(reference)
+        self.assertEqual(stroked(overlay.band_paths(QRectF(0, 0, 200, 120))[0][1]), expected)
+        with mock.patch.object(path_batch, '_stream_layout_ok', False):
+            plain = path_batch.path_from_elements(points, types)
+        self.assertEqual(plain.elementCount(), reference.elementCount())
+        self.assertEqual(stroked(plain), expected)
+
+
+class TestArcGradient(QtTestCase):
+    """测试弧长渐变描边"""
+
+    def test_arc_length_gradient(self):
+        """测试弧长渐变: 颜色档按弧长划分，每档一条路径，超出帧预算时减少细分"""
+        import numpy as np
+        from PySide6.QtGui import QPainter
+        from arc_gradient import ArcLengthGradientStroker, MIN_SEGMENTS, gradient_colors
+
+        # 直线 (长度100) 按弧长等分为4段，每段一个颜色档
+        line = np.array([[[0, 0], [30, 40], [60, 80]]], dtype=np.float64)
+        stroker = ArcLengthGradientStroker(width=4, color_steps=4)
+        pieces, steps = stroker.tessellate(line, 4)
+        self.assertEqual(pieces.shape, (4, 2, 2))
+        np.testing.assert_allclose(pieces[:, 0], [[0, 0], [15, 20], [30, 40], [45, 60]], atol=1e-9)
+        self.assertEqual(steps.tolist(), [0, 1, 2, 3])
+
+        # 两条腰线的同档短段合并为一条路径
+        curves = np.concatenate([line, line + 100])
+        paths = stroker.step_paths(curves, 8)
+        self.assertEqual([step for step, _ in paths], [0, 1, 2, 3])
+        self.assertTrue(all(path.elementCount() == 8 for _, path in paths))
+
+        # 绘制结果: 水平腰线上每处的颜色等于该处弧长比例所在颜色档的颜色
+        stroker = ArcLengthGradientStroker(width=6, color_steps=16, segments=16)
+        image = transparent_image(120, 20, QImage.Format_ARGB32)
+        painter = QPainter(image)
+        stroker.stroke(painter, np.array([[[10, 10], [60, 10], [110, 10]]], dtype=np.float64))
+        painter.end()
+        for x in (35, 60, 85):
+            step = int((x - 10) / 100 * 16)
+            expected = gradient_colors(stroker.stops, [(step + 0.5) / 16])[0]
+            self.assertAlmostEqual(image.pixelColor(x, 10).alpha(), expected[3], delta=2)
+        self.assertLess(image.pixelColor(11, 10).alpha(), 16)
+        self.assertEqual(image.pixelColor(60, 2).alpha(), 0)
+
+        stroker.frame_budget_ms = 10
+        stroker.segments = 16
+        stroker.adapt_segments(40)
+        self.assertEqual(stroker.segments, 4)
+        stroker.adapt_segments(40)
+        self.assertEqual(stroker.segments, MIN_SEGMENTS)
+        stroker.adapt_segments(1)
+        self.assertEqual(stroker.segments, MIN_SEGMENTS + 1)
+
+    def test_curved_leg_without_gaps(self):
+        """测试大弯曲腰线: 短段衔接处没有缺口，两端为半圆端帽，覆盖范围与普通画笔描边一致"""
+        import numpy as np
+        from PySide6.QtGui import QPainter, QPainterPath, QPen
+        from arc_gradient import ArcLengthGradientStroker
+        from fill_benchmark import alpha8_array
+
+        # 不透明停止点，缺口处的alpha明显低于完全覆盖处
+        stops = ((0.0, (200, 40, 40, 255)), (1.0, (40, 40, 200, 255)))
+        stroker = ArcLengthGradientStroker(stops, width=12, color_steps=8, segments=16)
+        image = transparent_image(200, 120, QImage.Format_Alpha8)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        stroker.stroke(painter, np.array([[[20, 100], [100, -60], [180, 100]]], dtype=np.float64))
+        painter.end()
+
+        reference = transparent_image(200, 120, QImage.Format_Alpha8)
+        painter = QPainter(reference)
+        painter.setRenderHint(QPainter.Antialiasing)
+        path = QPainterPath(QPointF(20, 100))
+        path.quadTo(100, -60, 180, 100)
+        pen = QPen(QColor(0, 0, 0), 12)
+        pen.setCapStyle(Qt.RoundCap)
+        painter.strokePath(path, pen)
+        painter.end()
+
+        # 参考描边内部 (3×3邻域完全覆盖) 的像素都被覆盖，相邻短段边缘的抗锯齿接缝不低于3/4；
+        # 参考描边3×3邻域以外没有像素
+        alpha = alpha8_array(image).astype(int)
+        padded = np.pad(alpha8_array(reference), 1)
+        neighbours = np.stack([padded[dy:dy + 120, dx:dx + 200]
+                               for dy in range(3) for dx in range(3)])
+        inside = neighbours.min(axis=0) == 255
+        outside = neighbours.max(axis=0) == 0
+        self.assertGreater(inside.sum(), 1000)
+        self.assertGreaterEqual(alpha[inside].min(), 191)
+        self.assertEqual(alpha[outside].max(), 0)
+
+
+class TestFlowChevrons(QtTestCase):
+    """测试流动方向箭头"""
+
+    def test_flow_chevrons(self):
+        """测试方向箭头: 沿弧长等距、朝向曲线起点，从图集中贴出对应角度"""
+        import numpy as np
+        from PySide6.QtGui import QPainter
+        from flow_chevrons import ChevronFlow
+
+        # 竖直直线 (从 y=0 到 y=100)，箭头从终点向起点移动，朝向 -y
+        line = np.array([[[50, 0], [50, 50], [50, 100]]], dtype=np.float64)
+        flow = ChevronFlow(spacing=20, speed=10, rotations=8)
+        points, angles, opacities = flow.instances(line, 0.5)
+        np.testing.assert_allclose(points[:, 1], [95, 75, 55, 35, 15], atol=1e-6)
+        np.testing.assert_allclose(angles, -np.pi / 2)
+        np.testing.assert_allclose(opacities, [0.25, 1, 1, 1, 0.75])
+
+        atlas = flow.atlas_for(1.0)
+        self.assertEqual(atlas.rotation_index(angles).tolist(), [6] * 5)
+        self.assertIs(flow.atlas_for(1.0), atlas)
+
+        image = transparent_image(100, 100)
+        painter = QPainter(image)
+        flow.draw(painter, line, 0.5)
+        painter.end()
+        around = [QColor.fromRgba(image.pixel(x, y)).alpha()
+                  for x in range(45, 56) for y in range(50, 61)]
+        self.assertGreater(max(around), 100)
+        self.assertEqual(QColor.fromRgba(image.pixel(20, 55)).alpha(), 0)
+
+    def test_flow_repaint_region(self):
+        """测试流动动画只重绘箭头区域，船舶静止或不显示箭头时停止定时器"""
+        from ship_dynamics import NomotoModel
+        from ship_steering_guidance import ShipSteeringWidget
+
+        widget = ShipSteeringWidget()
+        widget.dynamics_model = NomotoModel()
+        widget.show()
+        widget.grab()
+        self.assertTrue(widget._flow_timer.isActive())
+
+        band = widget.chevron_band_rect()
+        self.assertTrue(widget.rect().contains(band))
+        self.assertLess(band.width() * band.height(), widget.width() * widget.height() / 2)
+        geometry = widget._display_geometry
+        for key in ('top_left', 'bottom_left', 'top_right', 'bottom_right'):
+            self.assertTrue(band.contains(geometry[key].toPoint()))
+
+        widget.set_steering_parameters(10, 1.0, 0)
+        self.assertFalse(widget._flow_timer.isActive())
+        widget.set_steering_parameters(10, 1.0, 12)
+        self.assertTrue(widget._flow_timer.isActive())
+        widget.flow_chevrons = None
+        widget._advance_flow()
+        self.assertFalse(widget._flow_timer.isActive())
+        widget.close()
+
+
+class TestStrokeCache(QtTestCase):
+    """测试腰线描边轮廓缓存"""
+
+    def test_stroke_cache(self):
+        """测试描边轮廓缓存: 相同腰线复用轮廓，填充结果与画笔描边逐像素一致"""
+        from PySide6.QtGui import QPainter, QPainterPath, QPen
+        from stroke_cache import StrokeCache
+
+        cache = StrokeCache(max_size=2)
+        start, control, end = QPointF(20, 10), QPointF(70, 50), QPointF(30, 90)
+        outline = cache.outline(start, control, end, 4)
+        self.assertIs(cache.outline(QPointF(20.001, 10), control, end, 4), outline)
+        self.assertIsNot(cache.outline(start, control, end, 6), outline)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+        path = QPainterPath(start)
+        path.quadTo(control, end)
+        pen = QPen(QColor("#FEFFAF"), 4)
+        pen.setCapStyle(Qt.RoundCap)
+
+        # 有画刷时drawPath还会填充曲线与弦之间的区域，draw_leg保持一致
+        for brush in (Qt.NoBrush, QColor("#CBD900")):
+            images = []
+            for use_cache in (False, True):
+                image = transparent_image(100, 100)
+                painter = QPainter(image)
+                painter.setRenderHint(QPainter.Antialiasing)
+                painter.setBrush(brush)
+                if use_cache:
+                    cache.draw_leg(painter, start, control, end, 4, pen.brush())
+                else:
+                    painter.setPen(pen)
+                    painter.drawPath(path)
+                painter.end()
+                images.append(image)
+            self.assertEqual(images[0], images[1])
+            self.assertGreater(images[1].pixelColor(47, 50).alpha(), 0)
+            self.assertEqual(images[1].pixelColor(5, 95).alpha(), 0)
+
+
+class TestScanlineComparison(QtTestCase):
+    """测试扫描线光栅化与QPainter填充的误差上限"""
+
+    def test_error_bound_against_qpainter(self):
+        """测试与QPainter的最大误差: 直腰线 ≤ 3，展平多边形 ≤ 8，曲线路径 (QPainter自身展平) ≤ 48"""
+        from fill_benchmark import run_scanline_comparison
+
+        grid = {'top_offset': [0], 'position_ratio': [0.2, 0.8],
+                'curve_offset': [-150, 0, 150], 'size': [(700, 500)]}
+        for record in run_scanline_comparison(grid, frames=1):
+            self.assertLessEqual(record['flattened_max_abs_error'], 8)
+            self.assertLessEqual(record['max_abs_error'], 3 if record['curve_offset'] == 0 else 48)
+
+
+class TestBatchRenderInput(unittest.TestCase):
+    """测试批量渲染的参数读取"""
+
+    def test_csv_columns(self):
+        """测试CSV只转换数值参数列，名称等文本列原样保留，非数值参数报告行号"""
+        import io
+        from batch_render import config_to_parameters, iter_parameters
+
+        stream = io.StringIO("name,top_offset,curve_ratio,label\nA,-100,0.5,left\nB,50,,\n")
+        rows = list(iter_parameters(stream, 'csv'))
+        self.assertEqual(rows, [{'name': 'A', 'top_offset': -100.0, 'curve_ratio': 0.5,
+                                 'label': 'left'},
+                                {'name': 'B', 'top_offset': 50.0}])
+        # 比例型偏移按默认梯形高度 (300) 计算
+        self.assertEqual(config_to_parameters(rows[0]),
+                         {'top_offset': -100.0, 'curve_offset': 150.0})
+
+        with self.assertRaisesRegex(ValueError, "第3行"):
+            list(iter_parameters(io.StringIO("top_offset\n1\nabc\n"), 'csv'))
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
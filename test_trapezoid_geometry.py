@@ -0,0 +1,613 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+弯曲梯形几何引擎测试 (无需QApplication)
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+import numpy as np
+
+from arc_length import ArcLengthCache, ArcLengthTable
+from lru_cache import LRUCache
+from bezier_batch import (evaluate_cubic, evaluate_quadratic, flatten_quadratic,
+                          quadratic_bounds)
+from trapezoid_geometry import (create_trapezoid_geometry, fill_polygons, flatten_legs,
+                                leg_control_polygons, trapezoid_bounds)
+from ship_dynamics import KNOT, NomotoModel, ShipDynamicsModel, fit_display_curve
+from scanline_raster import rasterize_trapezoids, trapezoid_coverage
+from spatial_index import TrapezoidGridIndex, points_in_trapezoids
+from track_cache import TrackCache
+from turn_table import TurnParameterTable, turn_parameters, urgency_band
+
+
+class TestTrapezoidGeometryEngine(unittest.TestCase):
+    """测试NumPy几何引擎"""
+
+    def test_engine_does_not_import_qt(self):
+        """测试几何引擎不依赖PySide6"""
+        result = subprocess.run(
+            [sys.executable, '-c',
+             "import sys, trapezoid_geometry; print('PySide6' in sys.modules)"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(result.stdout.strip(), 'False', "几何引擎不应导入PySide6")
+
+    def test_matches_core_widget_geometry(self):
+        """测试单个梯形与CoreCurvedTrapezoidWidget的计算结果一致"""
+        geometry = create_trapezoid_geometry(-200, 0.5, 200)
+
+        np.testing.assert_allclose(geometry['top_left'][0], [135, 100])
+        np.testing.assert_allclose(geometry['top_right'][0], [165, 100])
+        np.testing.assert_allclose(geometry['bottom_left'][0], [100, 400])
+        np.testing.assert_allclose(geometry['bottom_right'][0], [600, 400])
+
+        # 控制点 = 腰线中点 + 向右偏移200
+        np.testing.assert_allclose(geometry['left_control'][0], [117.5 + 200, 250])
+        np.testing.assert_allclose(geometry['right_control'][0], [382.5 + 200, 250])
+
+    def test_batch_broadcasting(self):
+        """测试批量参数广播"""
+        offsets = np.array([-200.0, 0.0, 150.0])
+        geometry = create_trapezoid_geometry(offsets, 0.3, [10.0, 20.0, 30.0])
+
+        self.assertEqual(geometry['top_left'].shape, (3, 2))
+        self.assertEqual(geometry['left_curve'].shape, (3, 21, 2))
+        self.assertEqual(geometry['top_left'].dtype, np.float64)
+
+        top_center = (geometry['top_left'][:, 0] + geometry['top_right'][:, 0]) / 2
+        np.testing.assert_allclose(top_center, 350 + offsets)
+
+    def test_curve_endpoints_and_midpoint(self):
+        """测试腰线采样的端点和中点"""
+        geometry = create_trapezoid_geometry([-200, 100], 0.5, [200, -50], num_points=20)
+
+        for leg, start_key, end_key in (('left', 'top_left', 'bottom_left'),
+                                        ('right', 'top_right', 'bottom_right')):
+            curve = geometry[f'{leg}_curve']
+            np.testing.assert_allclose(curve[:, 0], geometry[start_key])
+            np.testing.assert_allclose(curve[:, -1], geometry[end_key])
+
+            # B(0.5) = (P0 + 2P1 + P2) / 4
+            expected_mid = (geometry[start_key] + 2 * geometry[f'{leg}_control']
+                            + geometry[end_key]) / 4
+            np.testing.assert_allclose(curve[:, 10], expected_mid)
+
+    def test_leg_control_polygons(self):
+        """测试腰线控制多边形的排列"""
+        geometry = create_trapezoid_geometry([-200, 0], 0.5, 40, num_points=None)
+        polygons = leg_control_polygons(geometry)
+
+        self.assertEqual(polygons.shape, (2, 2, 3, 2))
+        np.testing.assert_allclose(polygons[:, 0, 0], geometry['top_left'])
+        np.testing.assert_allclose(polygons[:, 1, 1], geometry['right_control'])
+        np.testing.assert_allclose(polygons[:, 1, 2], geometry['bottom_right'])
+        self.assertNotIn('left_curve', geometry)
+
+
+class TestBezierBatch(unittest.TestCase):
+    """测试批量贝塞尔求值"""
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.quadratics = rng.uniform(0, 700, size=(50, 3, 2))
+        self.cubics = rng.uniform(0, 700, size=(50, 4, 2))
+
+    def test_quadratic_matches_scalar_formula(self):
+        """测试二次曲线批量结果与逐点公式一致"""
+        t_values = np.linspace(0, 1, 11)
+        samples = evaluate_quadratic(self.quadratics, t_values)
+
+        self.assertEqual(samples.shape, (50, 11, 2))
+        self.assertTrue(samples.flags['C_CONTIGUOUS'])
+        p0, p1, p2 = self.quadratics[3]
+        for i, t in enumerate(t_values):
+            expected = (1 - t) ** 2 * p0 + 2 * (1 - t) * t * p1 + t ** 2 * p2
+            np.testing.assert_allclose(samples[3, i], expected)
+
+    def test_cubic_matches_scalar_formula(self):
+        """测试三次曲线批量结果与逐点公式一致"""
+        t_values = np.linspace(0, 1, 7)
+        samples = evaluate_cubic(self.cubics, t_values)
+
+        p0, p1, p2, p3 = self.cubics[11]
+        for i, t in enumerate(t_values):
+            u = 1 - t
+            expected = u ** 3 * p0 + 3 * u ** 2 * t * p1 + 3 * u * t ** 2 * p2 + t ** 3 * p3
+            np.testing.assert_allclose(samples[11, i], expected)
+
+    def test_per_curve_t_and_output_buffer(self):
+        """测试每条曲线独立的t值和调用方提供的输出缓冲区"""
+        t_values = np.random.default_rng(3).uniform(0, 1, size=(50, 5))
+        out = np.empty((50, 5, 2))
+        result = evaluate_quadratic(self.quadratics, t_values, out=out)
+
+        self.assertIs(result, out)
+        shared = evaluate_quadratic(self.quadratics[:1], t_values[0])
+        np.testing.assert_allclose(out[0], shared[0])
+
+    def test_quadratic_bounds_are_tight(self):
+        """测试解析包围盒与密集采样的范围一致 (误差在采样步长之内)"""
+        bounds = quadratic_bounds(self.quadratics)
+        samples = evaluate_quadratic(self.quadratics, np.linspace(0, 1, 4001))
+        sampled = np.concatenate([samples.min(axis=1), samples.max(axis=1)], axis=1)
+        np.testing.assert_allclose(bounds, sampled, atol=1e-3)
+        self.assertTrue(np.all(bounds[:, :2] <= sampled[:, :2] + 1e-9))
+        self.assertTrue(np.all(bounds[:, 2:] >= sampled[:, 2:] - 1e-9))
+
+        # 控制点在弦上 (直线) 时只取端点
+        line = np.array([[[0.0, 0.0], [5.0, 10.0], [10.0, 20.0]]])
+        np.testing.assert_allclose(quadratic_bounds(line), [[0, 0, 10, 20]])
+
+        # 弯曲梯形: 腰线外凸未超出下底端点时，包围盒就是顶点范围 (不再加 |偏移| + 20)
+        geometry = create_trapezoid_geometry(0, 0.5, 60, num_points=None)
+        left, top, right, bottom = trapezoid_bounds(geometry)[0]
+        self.assertAlmostEqual(right, geometry['bottom_right'][0, 0])
+        self.assertAlmostEqual(left, geometry['bottom_left'][0, 0])
+        self.assertAlmostEqual(top, 100.0)
+        self.assertAlmostEqual(bottom, 400.0)
+
+
+class TestAdaptiveFlattening(unittest.TestCase):
+    """测试按平直度自适应展平"""
+
+    def _max_deviation(self, curve, polyline):
+        """计算密集采样点到折线的最大距离"""
+        dense = evaluate_quadratic(curve[np.newaxis], np.linspace(0, 1, 2001))[0]
+        a, b = polyline[:-1], polyline[1:]
+        ab = b - a
+        length_sq = np.maximum((ab ** 2).sum(axis=1), 1e-12)
+        t = ((dense[:, np.newaxis] - a) * ab).sum(axis=2) / length_sq
+        closest = a + np.clip(t, 0, 1)[..., np.newaxis] * ab
+        return np.linalg.norm(dense[:, np.newaxis] - closest, axis=2).min(axis=1).max()
+
+    def test_vertex_count_follows_curvature(self):
+        """测试直线只需一段，弯曲越强分段越多"""
+        geometry = create_trapezoid_geometry(-200, 0.5, [0.0, 5.0, 200.0, 2000.0],
+                                             num_points=None)
+        points, offsets = flatten_legs(geometry, tolerance=0.25)['left']
+        counts = np.diff(offsets) - 1
+
+        self.assertEqual(counts[0], 1, "直线腰线应只有一段")
+        self.assertTrue(np.all(np.diff(counts) > 0), "分段数应随偏移量增加")
+        self.assertEqual(len(points), offsets[-1])
+
+    def test_deviation_within_tolerance(self):
+        """测试展平误差不超过容差"""
+        geometry = create_trapezoid_geometry(-200, [0.2, 0.5, 0.8], [30.0, -400.0, 1500.0],
+                                             num_points=None)
+        curves = leg_control_polygons(geometry)[:, 1]
+        for tolerance in (0.1, 0.5, 2.0):
+            points, offsets = flatten_quadratic(curves, tolerance)
+            for i, curve in enumerate(curves):
+                polyline = points[offsets[i]:offsets[i + 1]]
+                np.testing.assert_allclose(polyline[0], curve[0])
+                np.testing.assert_allclose(polyline[-1], curve[2])
+                self.assertLessEqual(self._max_deviation(curve, polyline), tolerance + 1e-9)
+
+
+class TestFillPolygons(unittest.TestCase):
+    """测试解析式填充多边形"""
+
+    def test_polygon_order(self):
+        """测试多边形顶点顺序: 右腰从上到下，左腰从下到上"""
+        geometry = create_trapezoid_geometry([-200, 200], 0.5, [50, -50], num_points=None)
+        points, offsets = fill_polygons(geometry)
+
+        for i in range(2):
+            polygon = points[offsets[i]:offsets[i + 1]]
+            np.testing.assert_allclose(polygon[0], geometry['top_right'][i])
+            np.testing.assert_allclose(polygon[-1], geometry['top_left'][i])
+            bottom = np.flatnonzero(np.isclose(polygon[:, 1], geometry['bottom_right'][i, 1]))
+            np.testing.assert_allclose(polygon[bottom[0]], geometry['bottom_right'][i])
+            np.testing.assert_allclose(polygon[bottom[-1]], geometry['bottom_left'][i])
+
+    def test_area_for_every_sign(self):
+        """测试所有符号组合下的面积
+
+        两条腰线的控制点同向平移，左右弓形面积相等，
+        因此填充面积始终等于直线梯形面积 (30 + 500) / 2 × 300
+        """
+        top_offsets, curve_offsets = np.meshgrid([-200.0, 0.0, 200.0], [-80.0, 0.0, 80.0])
+        geometry = create_trapezoid_geometry(top_offsets.ravel(), 0.5, curve_offsets.ravel(),
+                                             num_points=None)
+        points, offsets = fill_polygons(geometry, tolerance=0.01)
+
+        for i in range(len(offsets) - 1):
+            x, y = points[offsets[i]:offsets[i + 1]].T
+            area = 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+            self.assertAlmostEqual(area, 79500, delta=79500 * 1e-3)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=sys.argv)
+
+
+class TestTurnParameterTable(unittest.TestCase):
+    """测试转弯参数查找表"""
+
+    def test_full_grid_matches_formula(self):
+        """测试完整网格与参考公式一致"""
+        report = TurnParameterTable().validate()
+        self.assertEqual(report['points'], 601 * 30 * 201)
+        self.assertLess(report['max_lateral_error'], 1e-9)
+        self.assertLess(report['max_curve_error'], 1e-9)
+        self.assertEqual(report['band_mismatches'], 0)
+
+    def test_slider_values_and_band_thresholds(self):
+        """测试滑块换算值查表与公式逐点一致，档位边界与原阈值相同"""
+        table = TurnParameterTable()
+        for rudder in (-300, -210, -90, -89, 0, 89, 90, 209, 210, 300):
+            for speed in (1, 10, 30):
+                for intensity in (0, 37, 200):
+                    args = (rudder / 10.0, speed, intensity / 100.0)
+                    lateral, curve, band = table.lookup(*args)
+                    self.assertAlmostEqual(lateral, turn_parameters(*args)[0], places=9)
+                    self.assertAlmostEqual(curve, turn_parameters(*args)[1], places=9)
+                    self.assertEqual(band, urgency_band(args[0]))
+        self.assertEqual([urgency_band(a) for a in (8.9, 9.0, 20.9, 21.0)], [0, 1, 1, 2])
+
+    def test_bulk_generation(self):
+        """测试批量查表按广播规则生成，并把越界输入限制在网格内"""
+        table = TurnParameterTable()
+        rudders = np.linspace(-30, 30, 61)
+        result = table.bulk(rudders[:, None], 12, np.array([0.5, 1.0, 1.5]))
+        self.assertEqual(result['curve_offset'].shape, (61, 3))
+        np.testing.assert_allclose(result['lateral_offset'],
+                                   turn_parameters(rudders[:, None], 12, np.array([0.5, 1.0, 1.5]))[0])
+
+        clipped = table.bulk(45.0, 0.0, 3.0)
+        self.assertAlmostEqual(float(clipped['lateral_offset']), 300.0)
+        self.assertEqual(int(clipped['band']), 2)
+
+
+class TestShipDynamics(unittest.TestCase):
+    """测试船舶动力学模型与航迹拟合"""
+
+    def test_nomoto_heading_matches_integration(self):
+        """测试Nomoto闭式航向与数值积分一致，并收敛到稳态转弯半径"""
+        model = NomotoModel(length=100.0, gain=2.0, time_constant=1.0)
+        track = model.predict_track(12, 15, 600, steps=6000)
+
+        speed = 12 * KNOT
+        gain, time_constant = model.coefficients(speed)
+        dt = 0.1
+        rate = heading = 0.0
+        for _ in range(6000):
+            rate += (gain * np.radians(15) - rate) / time_constant * dt
+            heading += rate * dt
+        self.assertAlmostEqual(track['heading'][0, -1], heading, delta=1e-2 * heading)
+
+        # 稳态阶段每秒转过的角度 = 船速 / 转弯半径
+        rate = np.diff(track['heading'][0, -100:]).mean() / dt
+        self.assertAlmostEqual(speed / rate, float(model.turn_radius(12, 15)), places=3)
+
+    def test_batch_prediction(self):
+        """测试多组假设一次预测，零舵角为直线，左右舵对称"""
+        model = NomotoModel()
+        track = model.predict_track(np.array([5, 10, 20])[:, None],
+                                    np.array([-20, 0, 20])[None, :], 30)
+        self.assertEqual(track['x'].shape, (9, 65))
+
+        x = track['x'].reshape(3, 3, -1)
+        np.testing.assert_allclose(x[:, 1], 0.0)
+        np.testing.assert_allclose(x[:, 0], -x[:, 2])
+        self.assertTrue(np.all(x[:, 2, -1] > 0), "右舵应向右转")
+        np.testing.assert_allclose(track['y'][1::3, -1], np.array([5, 10, 20]) * KNOT * 30)
+
+    def test_fit_recovers_quadratic(self):
+        """测试航迹本身是二次贝塞尔曲线时拟合出原控制点"""
+        t = np.linspace(0, 1, 41)
+        control = np.array([-30.0, 80.0])
+        end = np.array([60.0, 200.0])
+        points = 2 * (t * (1 - t))[:, None] * control + (t ** 2)[:, None] * end
+        track = {'x': points[None, :, 0], 'y': points[None, :, 1],
+                 'heading': np.zeros((1, 41))}
+
+        fit = fit_display_curve(track, lookahead=200.0, height=200.0)
+        self.assertAlmostEqual(fit['lateral_offset'][0], 60.0)
+        self.assertAlmostEqual(fit['control_ratio'][0], 0.4)
+        self.assertAlmostEqual(fit['bend'][0], -30.0 - 60.0 * 0.4)
+
+    def test_incomplete_model_rejected(self):
+        """测试未实现航向或转弯半径的模型在创建时报错"""
+        class HeadingOnly(ShipDynamicsModel):
+            def heading(self, speed, rudder, t, yaw_rate):
+                return np.zeros_like(t)
+
+        with self.assertRaises(TypeError):
+            HeadingOnly()
+        with self.assertRaises(TypeError):
+            ShipDynamicsModel()
+
+
+class TestTrackCache(unittest.TestCase):
+    """测试预测航迹缓存"""
+
+    def setUp(self):
+        self.model = NomotoModel()
+        self.cache = TrackCache(self.model, lookahead=200.0, margin=1.5, steps=32, max_size=4)
+
+    def test_bucket_aligned_matches_prediction(self):
+        """测试桶上的输入与直接预测一致，强度只放大横向"""
+        track = self.cache.track(10.0, 12.0, intensity=1.5)
+        expected = self.model.predict_track(10.0, 12.0, 200.0 / (10.0 * KNOT) * 1.5, 32)
+        np.testing.assert_allclose(track['x'], expected['x'] * 1.5)
+        np.testing.assert_allclose(track['y'], expected['y'])
+        np.testing.assert_allclose(track['heading'], expected['heading'])
+
+    def test_interpolation_between_buckets(self):
+        """测试桶内的输入落在相邻桶的航迹之间"""
+        low = self.cache.track(10.0, 12.0)['x'][0, -1]
+        high = self.cache.track(10.0, 13.0)['x'][0, -1]
+        middle = self.cache.track(10.0, 12.5)['x'][0, -1]
+        self.assertLess(low, middle)
+        self.assertLess(middle, high)
+        self.assertAlmostEqual(middle, (low + high) / 2)
+
+    def test_lru_counters(self):
+        """测试命中计数与超出容量时的淘汰"""
+        self.cache.track(10.0, 12.0)
+        self.assertEqual(self.cache.stats()['misses'], 4)
+        self.cache.track(10.2, 12.7)
+        self.assertEqual(self.cache.hits, 4)
+
+        self.cache.track(20.0, -5.0)
+        stats = self.cache.stats()
+        self.assertEqual(stats['size'], 4)
+        self.assertEqual(stats['evictions'], 4)
+
+        self.cache.clear()
+        self.assertEqual(self.cache.stats()['size'], 0)
+        self.assertEqual(self.cache.hit_rate, 0.0)
+
+
+class TestSpatialIndex(unittest.TestCase):
+    """测试弯曲梯形的网格空间索引"""
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.count = 200
+        self.geometry = create_trapezoid_geometry(
+            rng.uniform(-150, 150, self.count), rng.uniform(0.1, 0.9, self.count),
+            rng.uniform(-60, 60, self.count), width=rng.uniform(200, 1800, self.count),
+            height=rng.uniform(300, 1500, self.count), trapezoid_height=120,
+            top_width=20, bottom_width=100, num_points=None)
+        self.index = TrapezoidGridIndex(cell_size=50)
+        self.index.update(range(self.count), self.geometry)
+
+    def test_point_on_leg_boundary(self):
+        """测试腰线两侧紧邻的点分别在梯形内外"""
+        geometry = create_trapezoid_geometry(-80, 0.3, 40, num_points=8)
+        legs = leg_control_polygons(geometry)
+        for leg, inward in (('left_curve', 1), ('right_curve', -1)):
+            samples = geometry[leg][0, 1:-1]
+            repeated = np.repeat(legs, len(samples), axis=0)
+            inside = samples + [inward * 1e-6, 0]
+            outside = samples - [inward * 1e-6, 0]
+            self.assertTrue(points_in_trapezoids(repeated, inside).all())
+            self.assertFalse(points_in_trapezoids(repeated, outside).any())
+
+        # 上底之上、下底之下的点不在梯形内
+        center = (geometry['top_left'] + geometry['bottom_right']) / 2
+        self.assertTrue(points_in_trapezoids(legs, center)[0])
+        self.assertFalse(points_in_trapezoids(legs, geometry['top_left'] - [-1, 1e-6])[0])
+
+    def test_queries_match_brute_force(self):
+        """测试矩形查询与点选结果与逐个检查一致"""
+        bounds = trapezoid_bounds(self.geometry)
+        left, top, right, bottom = 300, 200, 700, 500
+        expected = np.flatnonzero((bounds[:, 2] >= left) & (bounds[:, 0] <= right)
+                                  & (bounds[:, 3] >= top) & (bounds[:, 1] <= bottom))
+        self.assertEqual(self.index.query_rect(left, top, right, bottom), expected.tolist())
+
+        legs = leg_control_polygons(self.geometry)
+        rng = np.random.default_rng(4)
+        hits = 0
+        for x, y in rng.uniform([0, 0], [1800, 1500], size=(300, 2)):
+            inside = points_in_trapezoids(legs, np.broadcast_to([x, y], (self.count, 2)))
+            self.assertEqual(self.index.hit_test(x, y), np.flatnonzero(inside).tolist())
+            hits += int(inside.any())
+        self.assertGreater(hits, 0)
+
+    def test_incremental_update(self):
+        """测试更新只改动变化的网格单元，移除后不再命中"""
+        changes = self.index.cell_changes
+        moved = {key: value[:1] + 0.01 for key, value in self.geometry.items()}
+        self.index.update([0], moved)
+        self.assertEqual(self.index.cell_changes, changes)
+
+        far = {key: value[:1] + 5000 for key, value in self.geometry.items()}
+        self.index.update([0], far)
+        self.assertGreater(self.index.cell_changes, changes)
+        center = (far['top_left'][0] + far['bottom_right'][0]) / 2
+        self.assertEqual(self.index.hit_test(*center), [0])
+
+        self.index.remove(0)
+        self.assertNotIn(0, self.index)
+        self.assertEqual(self.index.hit_test(*center), [])
+        self.index.update(['new'], far)
+        self.assertEqual(self.index.hit_test(*center), ['new'])
+        self.assertEqual(len(self.index), self.count)
+
+
+class TestScanlineRaster(unittest.TestCase):
+    """测试扫描线光栅化的覆盖率掩码"""
+
+    def setUp(self):
+        # 第二个梯形的上底超出缓冲区右边界，光栅化时需要截断
+        self.geometry = create_trapezoid_geometry([-30, 45], [0.3, 0.7], [12, -20],
+                                                  width=80, height=70, trapezoid_height=50,
+                                                  top_width=6, bottom_width=60, num_points=None)
+
+    def _supersampled(self, index, samples=16):
+        """逐像素超采样的参考覆盖率"""
+        offsets = (np.arange(samples) + 0.5) / samples
+        ys, xs = np.meshgrid(np.arange(70)[:, None] + offsets, np.arange(80)[:, None] + offsets,
+                             indexing='ij')
+        points = np.stack([xs.ravel(), ys.ravel()], axis=1)
+        legs = np.repeat(leg_control_polygons(self.geometry)[index:index + 1], len(points), axis=0)
+        inside = points_in_trapezoids(legs, points).reshape(70, samples, 80, samples)
+        return inside.mean(axis=(1, 3)) * 255
+
+    def test_antialiased_coverage(self):
+        """测试抗锯齿覆盖率与超采样结果一致，内部像素完全覆盖"""
+        for index in range(2):
+            single = {key: value[index:index + 1] for key, value in self.geometry.items()}
+            buffer = np.zeros((70, 80), dtype=np.uint8)
+            self.assertIs(rasterize_trapezoids(single, buffer, subsamples=16), buffer)
+
+            reference = self._supersampled(index)
+            error = np.abs(buffer - reference)
+            self.assertLess(error.max(), 20)
+            self.assertLess(error.mean(), 0.5)
+            self.assertEqual(np.count_nonzero(reference == 255),
+                             np.count_nonzero(buffer[reference == 255] == 255))
+
+    def test_exact_area(self):
+        """测试抗锯齿覆盖率按面积精确计算: 覆盖率之和等于两条腰线与上下底围成的解析面积"""
+        def cross(a, b):
+            return a[0] * b[1] - a[1] * b[0]
+
+        def segment_area(start, control, end):
+            # 二次曲线段与原点围成的有向面积: 弦的面积加控制三角形面积的2/3
+            return cross(start, end) / 2 + cross(control - start, end - start) / 3
+
+        for left, right in leg_control_polygons(self.geometry):
+            # 左腰 (上→下) → 下底 → 右腰 (下→上) → 上底
+            area = abs(segment_area(*left) + cross(left[2], right[2]) / 2 +
+                       segment_area(*right[::-1]) + cross(right[0], left[0]) / 2)
+            for subsamples in (1, 2, 4):
+                coverage = trapezoid_coverage(np.stack([left, right]), np.arange(0, 70),
+                                              np.arange(-100, 200), subsamples)
+                self.assertAlmostEqual(coverage.sum(), area, places=3)
+
+    def test_exact_pixel_coverage(self):
+        """测试直腰线 (接近水平) 时每个像素的覆盖率等于多边形与像素方格交集的面积"""
+        def clipped_area(polygon, column, row):
+            # 依次用像素方格的四条边裁剪多边形 (Sutherland–Hodgman)，再按鞋带公式求面积
+            for axis, bound, sign in ((0, column, 1), (0, column + 1, -1),
+                                      (1, row, 1), (1, row + 1, -1)):
+                clipped = []
+                for start, end in zip(polygon[-1:] + polygon[:-1], polygon):
+                    start_inside = (start[axis] - bound) * sign >= 0
+                    end_inside = (end[axis] - bound) * sign >= 0
+                    if start_inside != end_inside:
+                        t = (bound - start[axis]) / (end[axis] - start[axis])
+                        clipped.append(tuple(s + t * (e - s) for s, e in zip(start, end)))
+                    if end_inside:
+                        clipped.append(end)
+                polygon = clipped
+                if not polygon:
+                    return 0.0
+            return abs(sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1)
+                           in zip(polygon, polygon[1:] + polygon[:1]))) / 2
+
+        # 控制点在两端中点的二次曲线即直线；左腰每行横跨约3像素
+        legs = np.array([[[10, 10.3], [40, 20.3], [70, 30.3]],
+                         [[80, 10.3], [85, 20.3], [90, 30.3]]])
+        polygon = [(10, 10.3), (70, 30.3), (90, 30.3), (80, 10.3)]
+        coverage = trapezoid_coverage(legs, np.arange(8, 33), np.arange(5, 95))
+        expected = [[clipped_area(polygon, column, row) for column in range(5, 95)]
+                    for row in range(8, 33)]
+        np.testing.assert_allclose(coverage, expected, atol=1e-9)
+
+    def test_aliased_and_strided_buffer(self):
+        """测试不抗锯齿时按像素中心判断，并可写入带行填充的缓冲区视图"""
+        storage = np.zeros((70, 96), dtype=np.uint8)
+        view = storage[:, :80]
+        rasterize_trapezoids(self.geometry, view, antialias=False)
+        self.assertFalse(storage[:, 80:].any(), "不应写入行尾填充")
+        self.assertTrue(np.isin(view, (0, 255)).all())
+
+        ys, xs = np.mgrid[0:70, 0:80] + 0.5
+        points = np.stack([xs.ravel(), ys.ravel()], axis=1)
+        legs = leg_control_polygons(self.geometry)
+        inside = np.zeros(len(points), dtype=bool)
+        for index in range(2):
+            inside |= points_in_trapezoids(np.repeat(legs[index:index + 1], len(points), axis=0),
+                                           points)
+        np.testing.assert_array_equal(view == 255, inside.reshape(70, 80))
+
+        with self.assertRaises(ValueError):
+            rasterize_trapezoids(self.geometry, np.zeros((70, 80), dtype=np.float32))
+
+
+class TestArcLength(unittest.TestCase):
+    """测试弧长查找表"""
+
+    def setUp(self):
+        # 直线 (长100)、弯曲腰线、折返 (在t=2/3处速度为0) 与退化为一点的曲线
+        self.curves = np.array([[[0, 0], [30, 40], [60, 80]],
+                                [[0, 0], [120, 150], [20, 300]],
+                                [[0, 0], [200, 0], [100, 0]],
+                                [[5, 5], [5, 5], [5, 5]]], dtype=np.float64)
+        self.table = ArcLengthTable(self.curves, samples=32)
+
+    @staticmethod
+    def _polyline_length(curve, t):
+        points = evaluate_quadratic(curve[None], np.linspace(0.0, t, 20001))[0]
+        return np.hypot(*np.diff(points, axis=0).T).sum()
+
+    def test_total_length(self):
+        """测试总弧长与密集折线长度一致，直线和折返曲线与解析值一致"""
+        self.assertAlmostEqual(self.table.total[0], 100.0)
+        self.assertAlmostEqual(self.table.total[1], self._polyline_length(self.curves[1], 1.0),
+                               places=3)
+        self.assertAlmostEqual(self.table.total[2], 500 / 3, places=2)
+        self.assertEqual(self.table.total[3], 0.0)
+        self.assertTrue((np.diff(self.table.lengths, axis=1) >= 0).all())
+
+    def test_inverse_lookup(self):
+        """测试反查的t值处弧长与目标一致，支持每条曲线各自的查询值"""
+        fractions = np.linspace(0.0, 1.0, 7)
+        t = self.table.t_at_fraction(fractions)
+        self.assertEqual(t.shape, (4, 7))
+        np.testing.assert_allclose(t[0], fractions, atol=1e-9)
+        for index in (1, 2):
+            for fraction, value in zip(fractions, t[index]):
+                self.assertAlmostEqual(self._polyline_length(self.curves[index], value),
+                                       fraction * self.table.total[index], delta=0.01)
+
+        lengths = np.array([[10.0], [100.0], [400.0], [1.0]])
+        points = self.table.points_at_length(lengths)
+        np.testing.assert_allclose(points[0, 0], [6, 8], atol=1e-9)
+        np.testing.assert_allclose(points[2, 0], self.curves[2, 2], atol=1e-9)
+        np.testing.assert_allclose(points[3, 0], [5, 5])
+
+    def test_cache(self):
+        """测试相同控制点复用同一个表，量化步长内的抖动命中缓存"""
+        cache = ArcLengthCache(samples=16, max_size=1)
+        first = cache.table(self.curves)
+        self.assertIs(cache.table(self.curves + 1e-5), first)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        cache.table(self.curves[:2])
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNot(cache.table(self.curves), first)
+        self.assertEqual(cache.stats()['size'], 1)
+
+
+class TestLRUCache(unittest.TestCase):
+    """测试缓存基类的淘汰顺序与计数器"""
+
+    def test_eviction_order(self):
+        """测试命中的条目变为最近使用，超出容量时淘汰最久未使用的"""
+        cache = LRUCache(max_size=2)
+        self.assertIsNone(cache._get('a'))
+        cache._put('a', 1)
+        cache._put('b', 2)
+        self.assertEqual(cache._get('a'), 1)
+        cache._put('c', 3)
+
+        self.assertIsNone(cache._get('b'))
+        self.assertEqual((cache._get('a'), cache._get('c')), (1, 3))
+        self.assertEqual(cache.stats(), {'size': 2, 'hits': 3, 'misses': 2,
+                                         'evictions': 1, 'hit_rate': 0.6})
+
+        cache.clear()
+        self.assertEqual(cache.stats(), {'size': 0, 'hits': 0, 'misses': 0,
+                                         'evictions': 0, 'hit_rate': 0.0})
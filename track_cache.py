@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+预测航迹缓存 (不依赖Qt)
+按量化后的 (船速, 舵角) 桶缓存预测航迹折线，LRU淘汰；查询时在相邻四个桶之间
+双线性插值，输入在桶内连续变化时结果也连续变化。未命中的桶一次批量预测
+"""
+
+import numpy as np
+
+from lru_cache import LRUCache
+from ship_dynamics import KNOT
+
+
+class TrackCache(LRUCache):
+    """预测航迹的LRU缓存
+
+    每条航迹按前进距离 lookahead 计算预测时长 (lookahead / 船速 × margin)，
+    因此不同船速的第k个采样点对应相同的距离比例，相邻桶之间可以逐点插值。
+    转弯强度只在横向上线性放大航迹，插值后精确缩放即可，不作为缓存键。
+    命中和未命中按桶计数。
+    """
+
+    def __init__(self, model, lookahead=200.0, margin=1.5, steps=48,
+                 speed_step=1.0, rudder_step=1.0, max_size=512):
+        """
+        Args:
+            model: ship_dynamics.ShipDynamicsModel
+            lookahead: 航迹覆盖的前进距离 (米)
+            margin: 预测时长余量 (转弯时前进距离小于航程)
+            steps: 每条航迹的时间步数
+            speed_step: 船速桶宽 (节)
+            rudder_step: 舵角桶宽 (度)
+            max_size: 最多缓存的航迹数量
+        """
+        super().__init__(max_size)
+        self.model = model
+        self.lookahead = lookahead
+        self.margin = margin
+        self.steps = steps
+        self.speed_step = speed_step
+        self.rudder_step = rudder_step
+
+    def _bucket_tracks(self, keys):
+        """取出若干桶的航迹 (形状 (len(keys), steps+1, 3): x, y, 航向)，未命中的桶批量预测"""
+        missing = [key for key in dict.fromkeys(keys) if key not in self._entries]
+        self.misses += len(missing)
+        self.hits += len(keys) - len(missing)
+
+        if missing:
+            speeds = np.array([key[0] for key in missing]) * self.speed_step
+            rudders = np.array([key[1] for key in missing]) * self.rudder_step
+            horizon = self.lookahead / (speeds * KNOT) * self.margin
+            track = self.model.predict_track(speeds, rudders, horizon, self.steps)
+            samples = np.stack([track['x'], track['y'], track['heading']], axis=-1)
+            for key, sample in zip(missing, samples):
+                self._entries[key] = sample
+
+        result = np.empty((len(keys), self.steps + 1, 3))
+        for index, key in enumerate(keys):
+            self._entries.move_to_end(key)
+            result[index] = self._entries[key]
+
+        self._evict()
+        return result
+
+    def track(self, speed, rudder, intensity=1.0):
+        """插值得到的预测航迹 (与 predict_track 的结果格式相同，N=1)
+
+        Args:
+            speed: 船速 (节)，低于一个桶宽时按一个桶宽计算
+            rudder: 舵角 (度)
+            intensity: 横向放大倍数 (转弯强度)
+        """
+        speed_position = max(speed / self.speed_step, 1.0)
+        rudder_position = rudder / self.rudder_step
+        speed_bucket = int(np.floor(speed_position))
+        rudder_bucket = int(np.floor(rudder_position))
+        speed_weight = speed_position - speed_bucket
+        rudder_weight = rudder_position - rudder_bucket
+
+        corners = self._bucket_tracks([
+            (speed_bucket, rudder_bucket), (speed_bucket, rudder_bucket + 1),
+            (speed_bucket + 1, rudder_bucket), (speed_bucket + 1, rudder_bucket + 1)])
+        weights = np.array([(1 - speed_weight) * (1 - rudder_weight),
+                            (1 - speed_weight) * rudder_weight,
+                            speed_weight * (1 - rudder_weight),
+                            speed_weight * rudder_weight])
+        sample = np.tensordot(weights, corners, axes=1)
+
+        return {
+            'x': sample[None, :, 0] * intensity,
+            'y': sample[None, :, 1],
+            'heading': sample[None, :, 2]
+        }
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+弯曲梯形几何引擎
+使用NumPy一次性计算N个弯曲梯形的顶点、控制点和腰线采样点
+不依赖PySide6，可在无QApplication的服务和批处理任务中使用
+"""
+
+import numpy as np
+
+from bezier_batch import evaluate_quadratic, flatten_quadratic, quadratic_bounds, uniform_t
+
+
+# 默认尺寸参数 (与CoreCurvedTrapezoidWidget一致)
+DEFAULT_DIMENSIONS = {
+    'width': 700,
+    'height': 500,
+    'trapezoid_height': 300,
+    'top_width': 30,
+    'bottom_width': 500
+}
+
+# 四个顶点的键名 (与各Widget的create_trapezoid_geometry返回值一致)
+VERTEX_KEYS = ('top_left', 'top_right', 'bottom_left', 'bottom_right')
+
+# 腰线名称及其起点/终点 (从上底到下底)
+LEG_ENDPOINTS = {
+    'left': ('top_left', 'bottom_left'),
+    'right': ('top_right', 'bottom_right')
+}
+
+
+def create_control_points(start, end, position_ratio, curve_offset):
+    """计算腰线的二次贝塞尔控制点
+
+    控制点 = 起点与终点连线上 position_ratio 处的点，再横向平移 curve_offset
+
+    Args:
+        start: (N, 2) 起点数组
+        end: (N, 2) 终点数组
+        position_ratio: 标量或 (N,) 控制点位置比例
+        curve_offset: 标量或 (N,) 横向偏移量 (像素，正值向右)
+
+    Returns:
+        np.ndarray: (N, 2) 控制点数组
+    """
+    start = np.asarray(start, dtype=np.float64)
+    end = np.asarray(end, dtype=np.float64)
+    ratio = np.asarray(position_ratio, dtype=np.float64)[..., np.newaxis]
+
+    control = start + (end - start) * ratio
+    control[..., 0] += curve_offset
+    return control
+
+
+def sample_quadratic(start, control, end, num_points=20):
+    """按固定步长采样二次贝塞尔曲线
+
+    Args:
+        start, control, end: (N, 2) 曲线的三个控制点
+        num_points: 分段数，返回 num_points + 1 个采样点
+
+    Returns:
+        np.ndarray: (N, num_points + 1, 2) 采样点
+    """
+    curves = np.stack([start, control, end], axis=-2)
+    return evaluate_quadratic(curves, uniform_t(num_points))
+
+
+def create_trapezoid_geometry(top_offset, position_ratio=0.5, curve_offset=0.0,
+                              width=DEFAULT_DIMENSIONS['width'],
+                              height=DEFAULT_DIMENSIONS['height'],
+                              trapezoid_height=DEFAULT_DIMENSIONS['trapezoid_height'],
+                              top_width=DEFAULT_DIMENSIONS['top_width'],
+                              bottom_width=DEFAULT_DIMENSIONS['bottom_width'],
+                              num_points=20):
+    """批量创建弯曲梯形几何
+
+    所有参数均可为标量或可相互广播的一维数组，结果统一为N个梯形。
+    坐标约定与CoreCurvedTrapezoidWidget相同：下底在画布中居中，
+    上底中心平移 top_offset (负值向左)，控制点向右偏移 curve_offset。
+
+    Args:
+        top_offset: 上底平移量 (像素)
+        position_ratio: 控制点位置比例 (0.0-1.0)
+        curve_offset: 横向偏移量 (像素)
+        width, height: 画布尺寸
+        trapezoid_height, top_width, bottom_width: 梯形尺寸
+        num_points: 每条腰线的采样分段数，为None时不采样
+
+    Returns:
+        dict: 各键均为float64数组
+            'top_left' / 'top_right' / 'bottom_left' / 'bottom_right': (N, 2) 顶点
+            'left_control' / 'right_control': (N, 2) 控制点
+            'left_curve' / 'right_curve': (N, num_points + 1, 2) 腰线采样点 (从上到下)
+    """
+    (top_offset, position_ratio, curve_offset, width, height,
+     trapezoid_height, top_width, bottom_width) = (
+        np.atleast_1d(value).astype(np.float64) for value in np.broadcast_arrays(
+            top_offset, position_ratio, curve_offset, width, height,
+            trapezoid_height, top_width, bottom_width))
+
+    # 计算基础位置
+    center_x = width / 2
+    top_y = (height - trapezoid_height) / 2
+    bottom_y = top_y + trapezoid_height
+
+    # 核心参数1: 上底平移量
+    top_center_x = center_x + top_offset
+
+    geometry = {
+        'top_left': np.stack([top_center_x - top_width / 2, top_y], axis=-1),
+        'top_right': np.stack([top_center_x + top_width / 2, top_y], axis=-1),
+        'bottom_left': np.stack([center_x - bottom_width / 2, bottom_y], axis=-1),
+        'bottom_right': np.stack([center_x + bottom_width / 2, bottom_y], axis=-1)
+    }
+
+    # 核心参数2和3: 控制点
+    for leg, (start_key, end_key) in LEG_ENDPOINTS.items():
+        geometry[f'{leg}_control'] = create_control_points(
+            geometry[start_key], geometry[end_key], position_ratio, curve_offset)
+
+    if num_points is not None:
+        for leg, (start_key, end_key) in LEG_ENDPOINTS.items():
+            geometry[f'{leg}_curve'] = sample_quadratic(
+                geometry[start_key], geometry[f'{leg}_control'], geometry[end_key],
+                num_points)
+
+    return geometry
+
+
+def leg_control_polygons(geometry):
+    """将几何字典整理为腰线控制多边形数组
+
+    Returns:
+        np.ndarray: (N, 2, 3, 2) 第二维为[左腰, 右腰]，第三维为[起点, 控制点, 终点]
+    """
+    return np.stack([
+        np.stack([geometry[start_key], geometry[f'{leg}_control'], geometry[end_key]],
+                 axis=1)
+        for leg, (start_key, end_key) in LEG_ENDPOINTS.items()
+    ], axis=1)
+
+
+def leg_bounds(legs):
+    """由腰线控制多边形计算梯形的精确包围盒 (两条腰线包围盒的并集，含四个顶点)
+
+    Args:
+        legs: (N, 2, 3, 2) leg_control_polygons 的结果
+
+    Returns:
+        np.ndarray: (N, 4) [min_x, min_y, max_x, max_y]
+    """
+    bounds = quadratic_bounds(legs)
+    return np.concatenate([bounds[:, :, :2].min(axis=1), bounds[:, :, 2:].max(axis=1)], axis=1)
+
+
+def trapezoid_bounds(geometry):
+    """弯曲梯形的精确包围盒
+
+    Returns:
+        np.ndarray: (N, 4) [min_x, min_y, max_x, max_y]
+    """
+    return leg_bounds(leg_control_polygons(geometry))
+
+
+def flatten_legs(geometry, tolerance=0.25):
+    """按像素容差自适应展平所有腰线
+
+    Args:
+        geometry: create_trapezoid_geometry 返回的几何字典
+        tolerance: 允许的最大偏差 (像素)
+
+    Returns:
+        dict: {'left': (points, offsets), 'right': (points, offsets)}，
+              格式同 bezier_batch.flatten_quadratic
+    """
+    polygons = leg_control_polygons(geometry)
+    return {
+        leg: flatten_quadratic(polygons[:, index], tolerance)
+        for index, leg in enumerate(LEG_ENDPOINTS)
+    }
+
+
+def fill_polygons(geometry, tolerance=0.25):
+    """直接构建弯曲梯形的填充多边形，无需路径布尔运算
+
+    填充区域由上底、右腰、下底、左腰围成，顺序为：
+    右腰从上到下 → (下底) → 左腰从下到上 → (上底闭合)。
+    腰线在y方向单调 (position_ratio 在0-1之间)，因此任意 top_offset /
+    curve_offset 符号组合下，该多边形按奇偶规则填充即为正确区域。
+
+    Args:
+        geometry: create_trapezoid_geometry 返回的几何字典
+        tolerance: 腰线展平容差 (像素)
+
+    Returns:
+        tuple: (points, offsets)
+            points: (总点数, 2) 所有多边形顶点连续存放
+            offsets: (N + 1,) 第i个多边形为 points[offsets[i]:offsets[i + 1]]
+    """
+    legs = flatten_legs(geometry, tolerance)
+    right_points, right_offsets = legs['right']
+    left_points, left_offsets = legs['left']
+    right_counts = np.diff(right_offsets)
+    left_counts = np.diff(left_offsets)
+
+    offsets = np.zeros(len(right_counts) + 1, dtype=np.int64)
+    np.cumsum(right_counts + left_counts, out=offsets[1:])
+    points = np.empty((offsets[-1], 2), dtype=np.float64)
+
+    # 右腰按原顺序写入每个多边形的前半段
+    right_target = (np.repeat(offsets[:-1] - right_offsets[:-1], right_counts)
+                    + np.arange(len(right_points)))
+    points[right_target] = right_points
+
+    # 左腰倒序写入后半段 (从下底回到上底)
+    left_index = np.repeat(np.arange(len(left_counts)), left_counts)
+    left_local = np.arange(len(left_points)) - left_offsets[:-1][left_index]
+    left_target = (offsets[:-1][left_index] + right_counts[left_index]
+                   + left_counts[left_index] - 1 - left_local)
+    points[left_target] = left_points
+
+    return points, offsets
+
+
+def geometry_count(geometry):
+    """返回几何字典中的梯形数量"""
+    return len(geometry['top_left'])
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+转弯参数计算与查找表 (不依赖Qt)
+船舶参数 (舵角、船速、转弯强度) → (横向偏移, 弯曲偏移, 紧急程度档位)。
+公式可分离为 舵角因子 × 船速因子 × 强度因子，因此查找表只需为三个量化输入
+各保存一维因子数组，查表是三次下标访问加乘法，同一张表也支持NumPy批量生成和全网格校验
+"""
+
+import numpy as np
+
+
+# 最大横向偏移 (像素) 与弯曲偏移比例
+MAX_LATERAL_OFFSET = 150
+CURVE_SCALE = 50
+
+# 紧急程度 (|舵角| / 30°) 的档位阈值: 轻微 < 0.3 ≤ 中等 < 0.7 ≤ 急转
+URGENCY_THRESHOLDS = (0.3, 0.7)
+
+# 控件的量化网格: (最小值, 最大值, 步长)
+RUDDER_GRID = (-30.0, 30.0, 0.1)    # 舵角 (°)
+SPEED_GRID = (1.0, 30.0, 1.0)       # 船速 (节)
+INTENSITY_GRID = (0.0, 2.0, 0.01)   # 转弯强度
+
+
+def urgency_band(rudder_angle):
+    """舵角对应的紧急程度档位: 0=轻微, 1=中等, 2=急转 (标量或数组)"""
+    urgency = abs(rudder_angle) / 30.0  # 0.0 到 1.0
+    if np.ndim(urgency):
+        return np.searchsorted(URGENCY_THRESHOLDS, urgency, side='right')
+    return sum(urgency >= threshold for threshold in URGENCY_THRESHOLDS)
+
+
+def turn_parameters(rudder_angle, ship_speed, turn_intensity):
+    """根据船舶参数计算转弯参数 (参考公式，支持NumPy广播)
+
+    物理原理：
+    - 舵角越大，转向意图越强
+    - 船速越快，转弯半径越大，转向越困难
+    - 高速时相同舵角产生的弯曲效果应该更小
+
+    Returns:
+        (lateral_offset, curve_offset)
+    """
+    # 舵角影响 (-30° 到 +30° 映射到 -1.0 到 +1.0)
+    angle_factor = rudder_angle / 30.0
+
+    # 船速影响 (速度越快，转弯越困难，偏移量应该降低)
+    # 使用反比关系：速度越快，转向能力越弱
+    speed_factor = 10.0 / ship_speed  # 反比关系，速度快时因子小
+
+    # 最终偏移计算 (转弯强度线性缩放两个偏移)
+    lateral_offset = angle_factor * MAX_LATERAL_OFFSET * turn_intensity
+    curve_offset = abs(angle_factor) * speed_factor * turn_intensity * CURVE_SCALE
+    return lateral_offset, curve_offset
+
+
+def _grid_values(grid):
+    """网格点数组 (舍入到12位小数，使 9.0、0.37 等值与滑块换算结果逐位相同)"""
+    start, stop, step = grid
+    return np.round(start + np.arange(int(round((stop - start) / step)) + 1) * step, 12)
+
+
+class TurnParameterTable:
+    """量化输入的转弯参数查找表
+
+    输入先吸附到最近的网格点 (并限制在网格范围内)，因此对滑块产生的输入与公式
+    完全一致；传感器给出的非网格值按网格分辨率取近似。
+    标量查询的结果再按原始输入记忆，重复的输入 (拖动滑块来回、定值传感器) 只需一次字典访问。
+    """
+
+    def __init__(self, rudder_grid=RUDDER_GRID, speed_grid=SPEED_GRID,
+                 intensity_grid=INTENSITY_GRID, memo_size=65536):
+        self.memo_size = memo_size
+        self._memo = {}
+        self.rudder_grid = rudder_grid
+        self.speed_grid = speed_grid
+        self.intensity_grid = intensity_grid
+
+        self.rudder_values = _grid_values(rudder_grid)
+        self.speed_values = _grid_values(speed_grid)
+        self.intensity_values = _grid_values(intensity_grid)
+
+        # 一维因子表: 横向偏移 = 舵角项 × 强度；弯曲偏移 = |舵角项| × 船速项 × 强度
+        self.lateral_factors = self.rudder_values / 30.0 * MAX_LATERAL_OFFSET
+        self.curve_factors = np.abs(self.rudder_values) / 30.0 * CURVE_SCALE
+        self.speed_factors = 10.0 / self.speed_values
+        self.bands = urgency_band(self.rudder_values)
+
+        # 标量查表使用Python列表，避免逐次访问NumPy数组的开销
+        self._lateral = self.lateral_factors.tolist()
+        self._curve = self.curve_factors.tolist()
+        self._speed = self.speed_factors.tolist()
+        self._intensity = self.intensity_values.tolist()
+        self._bands = self.bands.tolist()
+
+    @staticmethod
+    def _index(value, grid, size):
+        start, _, step = grid
+        index = int(round((value - start) / step))
+        return min(max(index, 0), size - 1)
+
+    def indices(self, rudder_angle, ship_speed, turn_intensity):
+        """三个输入在各自网格中的下标"""
+        return (self._index(rudder_angle, self.rudder_grid, len(self._lateral)),
+                self._index(ship_speed, self.speed_grid, len(self._speed)),
+                self._index(turn_intensity, self.intensity_grid, len(self._intensity)))
+
+    def lookup(self, rudder_angle, ship_speed, turn_intensity):
+        """查表
+
+        Returns:
+            (lateral_offset, curve_offset, band)
+        """
+        key = (rudder_angle, ship_speed, turn_intensity)
+        result = self._memo.get(key)
+        if result is None:
+            if len(self._memo) >= self.memo_size:
+                self._memo.clear()
+            result = self._memo[key] = self._lookup_grid(rudder_angle, ship_speed, turn_intensity)
+        return result
+
+    def _lookup_grid(self, rudder_angle, ship_speed, turn_intensity):
+        r, s, i = self.indices(rudder_angle, ship_speed, turn_intensity)
+        intensity = self._intensity[i]
+        return (self._lateral[r] * intensity,
+                self._curve[r] * self._speed[s] * intensity,
+                self._bands[r])
+
+    def _bulk_indices(self, values, grid, size):
+        start, _, step = grid
+        index = np.rint((np.asarray(values, dtype=float) - start) / step).astype(np.intp)
+        return np.clip(index, 0, size - 1)
+
+    def bulk(self, rudder_angles, ship_speeds, turn_intensities):
+        """批量查表 (三个输入按NumPy规则广播)，供模拟器一次生成整段航迹的参数
+
+        Returns:
+            dict: 'lateral_offset' / 'curve_offset' (float64) 与 'band' (整数) 数组
+        """
+        r = self._bulk_indices(rudder_angles, self.rudder_grid, len(self.rudder_values))
+        s = self._bulk_indices(ship_speeds, self.speed_grid, len(self.speed_values))
+        i = self._bulk_indices(turn_intensities, self.intensity_grid, len(self.intensity_values))
+        intensity = self.intensity_values[i]
+        return {
+            'lateral_offset': self.lateral_factors[r] * intensity,
+            'curve_offset': self.curve_factors[r] * self.speed_factors[s] * intensity,
+            'band': self.bands[r]
+        }
+
+    def validate(self):
+        """在完整网格上与参考公式逐点比较
+
+        逐个船速切片计算，内存占用与 舵角数 × 强度数 成正比
+
+        Returns:
+            dict: 'points' 比较的网格点数，'max_lateral_error' / 'max_curve_error'
+                  最大绝对误差，'band_mismatches' 档位不一致的点数
+        """
+        rudders = self.rudder_values[:, None]
+        intensities = self.intensity_values[None, :]
+        max_lateral = max_curve = 0.0
+        band_mismatches = 0
+
+        expected_bands = urgency_band(rudders)
+        for speed in self.speed_values:
+            table = self.bulk(rudders, speed, intensities)
+            lateral, curve = turn_parameters(rudders, speed, intensities)
+            max_lateral = max(max_lateral, float(np.max(np.abs(table['lateral_offset'] - lateral))))
+            max_curve = max(max_curve, float(np.max(np.abs(table['curve_offset'] - curve))))
+            band_mismatches += int(np.count_nonzero(table['band'] != expected_bands))
+
+        return {
+            'points': self.rudder_values.size * self.speed_values.size * self.intensity_values.size,
+            'max_lateral_error': max_lateral,
+            'max_curve_error': max_curve,
+            'band_mismatches': band_mismatches
+        }
+
+
+# 共享的默认查找表
+DEFAULT_TURN_TABLE = TurnParameterTable()